@@ -0,0 +1,280 @@
+import argparse
+import dataclasses
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:     # Windows
+    resource = None
+
+from basic import generator, model_dataclasses
+from basic.model_dataclasses import Person, Bicycle, Laptop
+
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+LOCALES = ["en_US", "hu_HU"]
+MODES = ["loop", "bulk"]
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+# ennyivel lehet lassabb a baseline-nál, mielőtt regressziónak számít
+TOLERANCE = 0.15
+
+
+#  MÉRÉS
+def _peak_rss_mb() -> float | None:
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linuxon KiB, macOS-en byte
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+    except (ImportError, AttributeError):
+        return None
+
+
+def _run_case(case: dict) -> dict:
+    """Egy mérés; mindig friss processzben fut, így a peak RSS csak ehhez tartozik."""
+    n, bulk = case["n"], case["mode"] == "bulk"
+
+    if case["func"] == "generate_people":
+        # bemelegítés: a név pool-ok felépítése ne a mért időbe essen
+        generator.generate_people(1, locale=case["locale"], unique=case["unique"], bulk=bulk, seed=0)
+        start = time.perf_counter()
+        generator.generate_people(n, locale=case["locale"], unique=case["unique"], bulk=bulk, seed=0)
+        elapsed = time.perf_counter() - start
+    else:
+        # tulajdonosok a mérésen kívül, tárgyanként ~10 ember
+        people = generator.generate_people(max(n // 10, 1), bulk=True, seed=0)
+        func = getattr(generator, case["func"])
+        func(1, people, bulk=bulk, seed=0)
+        start = time.perf_counter()
+        func(n, people, bulk=bulk, seed=0)
+        elapsed = time.perf_counter() - start
+
+    return {**case,
+            "seconds": round(elapsed, 4),
+            "rows_per_s": round(n / elapsed, 1),
+            "peak_rss_mb": _peak_rss_mb()}
+
+
+def build_cases(max_n: int, locales: list[str], modes: list[str]) -> list[dict]:
+    cases = []
+    for n in (s for s in SIZES if s <= max_n):
+        for mode in modes:
+            for locale in locales:
+                for unique in (False, True):
+                    cases.append({"func": "generate_people", "n": n, "mode": mode,
+                                  "locale": locale, "unique": unique})
+            for func in ("generate_bicycles", "generate_laptops"):
+                cases.append({"func": func, "n": n, "mode": mode, "locale": None, "unique": None})
+    return cases
+
+
+def run(cases: list[dict]) -> list[dict]:
+    results = []
+    for case in cases:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            result = executor.submit(_run_case, case).result()
+        results.append(result)
+        rss = f"{result['peak_rss_mb']:.0f} MB" if result["peak_rss_mb"] is not None else "-"
+        print(f"{case['func']:18} {case['mode']:4} n={case['n']:>10,} {str(case['locale']):6} "
+              f"unique={str(case['unique']):5} {result['rows_per_s']:>14,.0f} sor/s  {rss:>8}")
+    return results
+
+
+#  MEMÓRIA / PÉLDÁNY
+def _dict_based(cls: type) -> type:
+    """Ugyanazok a mezők __slots__ nélkül (összehasonlításhoz)."""
+    return dataclasses.make_dataclass(cls.__name__ + "Dict",
+                                      [(f.name, f.type, f) for f in dataclasses.fields(cls)])
+
+
+def _bytes_per_instance(factory, n: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(i) for i in range(n)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # a lista saját mérete nem a példányoké
+    return (after - before - sys.getsizeof(objects)) / n
+
+
+def measure_memory(n: int = 100_000) -> list[dict]:
+    """Példányonkénti memória a __slots__-os és a __dict__-es modellekkel.
+    A mezőértékek minden példányban ugyanazok, így csak a példányok mérete számít."""
+    args = {
+        Person: dict(id="P-000001", name="Teszt Elek", age=30, male=True),
+        Bicycle: dict(id="B-000001", brand="Cube", model="Acid-100", year=2020, owner_id="P-000001"),
+        Laptop: dict(id="L-000001", brand="Dell", model="XPS-1000", year=2022, ram=16, vram=8,
+                        owner_id="P-000001"),
+    }
+    results = []
+    for cls, values in args.items():
+        plain = _dict_based(cls)
+        slotted = _bytes_per_instance(lambda i: cls(**values), n)
+        dict_based = _bytes_per_instance(lambda i: plain(**values), n)
+        results.append({"class": cls.__name__, "slots_bytes": round(slotted, 1),
+                        "dict_bytes": round(dict_based, 1),
+                        "saving": round(1 - slotted / dict_based, 3)})
+        print(f"{cls.__name__:8} slots: {slotted:6.0f} B   __dict__: {dict_based:6.0f} B   "
+              f"({1 - slotted / dict_based:.0%} kevesebb)")
+    return results
+
+
+#  GC SZÜNETEK (erős vs. gyenge owner hivatkozás)
+def _gc_case(args: tuple) -> dict:
+    n_items, weak = args
+    model_dataclasses.set_weak_owners(weak)
+    pauses, started = [], [0.0]
+
+    def on_gc(phase: str, info: dict) -> None:
+        if phase == "start":
+            started[0] = time.perf_counter()
+        else:
+            pauses.append(time.perf_counter() - started[0])
+
+    gc.callbacks.append(on_gc)
+    start = time.perf_counter()
+    people = generator.generate_people(max(n_items // 10, 1), bulk=True, seed=0)
+    generator.generate_laptops(n_items, people, bulk=True, seed=0)
+    elapsed = time.perf_counter() - start
+    gc.callbacks.remove(on_gc)
+
+    # egy teljes gyűjtés a betöltött gráfon
+    full_start = time.perf_counter()
+    unreachable = gc.collect()
+    full = time.perf_counter() - full_start
+
+    return {"weak_owners": weak, "items": n_items,
+            "seconds": round(elapsed, 3),
+            "rows_per_s": round(n_items / elapsed, 1),
+            "gc_runs": len(pauses),
+            "gc_pause_total_s": round(sum(pauses), 3),
+            "gc_pause_max_ms": round(max(pauses, default=0) * 1000, 2),
+            "full_collect_ms": round(full * 1000, 2),
+            "unreachable": unreachable,
+            "peak_rss_mb": _peak_rss_mb()}
+
+
+def measure_gc(n_items: int = 5_000_000) -> list[dict]:
+    """Tömeges betöltés (n_items laptop) erős és gyenge owner hivatkozásokkal, külön processzekben."""
+    results = []
+    for weak in (False, True):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            r = executor.submit(_gc_case, (n_items, weak)).result()
+        results.append(r)
+        print(f"weak_owners={str(weak):5} {r['rows_per_s']:>12,.0f} sor/s  GC: {r['gc_runs']} futás, "
+              f"összesen {r['gc_pause_total_s']:.2f} s, max {r['gc_pause_max_ms']:.0f} ms, "
+              f"teljes gyűjtés {r['full_collect_ms']:.0f} ms")
+    return results
+
+
+#  KONSTRUKTOROK (dataclass __init__ vs. megbízható létrehozás)
+def measure_constructors(n: int = 1_000_000) -> list[dict]:
+    """n példány ugyanazokból a mező-tuple-ökből: a dataclass konstruktorral (owner_id kulcsszóval,
+    ahogy az olvasók eddig hívták) és a model_dataclasses.from_rows megbízható útjával."""
+    rows = {
+        Bicycle: [(f"B-{i:07d}", "Cube", "Acid-100", 2020, f"P-{i % 100_000:06d}") for i in range(n)],
+        Laptop: [(f"L-{i:07d}", "Dell", "XPS-1000", 2022, 16, 8, f"P-{i % 100_000:06d}") for i in range(n)],
+    }
+    results = []
+    for cls, data in rows.items():
+        timings = {}
+        for label, build in (("dataclass", lambda: [cls(*r[:-1], owner_id=r[-1]) for r in data]),
+                             ("trusted", lambda: model_dataclasses.from_rows(cls, data))):
+            start = time.perf_counter()
+            objects = build()
+            timings[label] = time.perf_counter() - start
+            del objects
+        results.append({"class": cls.__name__, "n": n,
+                        "dataclass_rows_per_s": round(n / timings["dataclass"], 1),
+                        "trusted_rows_per_s": round(n / timings["trusted"], 1),
+                        "speedup": round(timings["dataclass"] / timings["trusted"], 2)})
+        print(f"{cls.__name__:8} dataclass: {n / timings['dataclass']:>12,.0f} sor/s   "
+              f"megbízható: {n / timings['trusted']:>12,.0f} sor/s   "
+              f"({timings['dataclass'] / timings['trusted']:.2f}x)")
+    return results
+
+
+#  BASELINE ÖSSZEHASONLÍTÁS
+def _key(r: dict) -> tuple:
+    return r["func"], r["n"], r["mode"], r["locale"], r["unique"]
+
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float = TOLERANCE) -> list[dict]:
+    """A baseline-hoz képest tolerance-nél nagyobb rows/s visszaesések."""
+    base = {_key(b): b for b in baseline}
+    regressions = []
+    for r in results:
+        b = base.get(_key(r))
+        if b and r["rows_per_s"] < b["rows_per_s"] * (1 - tolerance):
+            regressions.append({**r, "baseline_rows_per_s": b["rows_per_s"],
+                                "change": round(r["rows_per_s"] / b["rows_per_s"] - 1, 3)})
+    return regressions
+
+
+def _write_json(path: str, results: list[dict]) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"created": datetime.now().isoformat(timespec="seconds"),
+                   "python": platform.python_version(),
+                   "machine": platform.machine(),
+                   "results": results}, file, indent=2)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="generator.py benchmark")
+    parser.add_argument("--max-n", type=int, default=1_000_000)
+    parser.add_argument("--locales", nargs="+", default=LOCALES)
+    parser.add_argument("--modes", nargs="+", default=MODES, choices=MODES)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--memory", action="store_true", help="csak a példányonkénti memória mérése")
+    parser.add_argument("--gc", type=int, nargs="?", const=5_000_000, metavar="ITEMS",
+                        help="csak a GC szünetek mérése (alapból 5M laptop)")
+    parser.add_argument("--ctor", type=int, nargs="?", const=1_000_000, metavar="ROWS",
+                        help="csak a konstruktorok mérése (alapból 1M sor)")
+    args = parser.parse_args(argv)
+
+    if args.memory:
+        measure_memory()
+        return 0
+    if args.gc:
+        measure_gc(args.gc)
+        return 0
+    if args.ctor:
+        measure_constructors(args.ctor)
+        return 0
+
+    results = run(build_cases(args.max_n, args.locales, args.modes))
+    _write_json(args.output, results)
+    print("Eredmények:", args.output)
+
+    if args.save_baseline:
+        _write_json(args.baseline, results)
+        print("Baseline mentve:", args.baseline)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("Nincs baseline, összehasonlítás kihagyva (--save-baseline)")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as file:
+        regressions = compare(results, json.load(file)["results"], args.tolerance)
+    for r in regressions:
+        print(f"REGRESSZIÓ: {r['func']} {r['mode']} n={r['n']:,} {r['locale']} unique={r['unique']}: "
+              f"{r['rows_per_s']:,.0f} vs {r['baseline_rows_per_s']:,.0f} sor/s ({r['change']:+.1%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+from collections.abc import Iterable, Iterator
+import os
+from basic import model_dataclasses
+from basic.schema import FIELDS
+
+# Delta rekordok művelete: U = új vagy módosult (upsert), D = törölt
+UPSERT = "U"
+DELETE = "D"
+
+_UNSET = object()
+
+
+#  VÁLTOZÁS-HALMAZ
+class ChangeSet:
+    """Az utolsó mentés óta új, módosult és törölt entitások típusonként.
+
+    Kézzel: add() / modify() / delete(). track_changes(changes) után a modellek maguk
+    jelentik az új (konstruktor, generátor), módosult (mező írása) és törölt
+    (IndexedCollection.remove, OwnerIndex.detach / remove_people) példányokat; a
+    beolvasott példányok nem számítanak újnak. A handlerek write_changes() függvényei
+    csak ezeket írják ki, utána az adott típus változásai törlődnek."""
+
+    def __init__(self) -> None:
+        self.new: dict[type, dict[str, object]] = {}
+        self.modified: dict[type, dict[str, object]] = {}
+        self.deleted: dict[type, dict[str, object]] = {}
+
+    @staticmethod
+    def _bucket(store: dict, entity_type: type) -> dict:
+        bucket = store.get(entity_type)
+        if bucket is None:
+            bucket = store[entity_type] = {}
+        return bucket
+
+    def add(self, entity: object) -> None:
+        entity_type = type(entity)
+        self.deleted.get(entity_type, {}).pop(entity.id, None)
+        self._bucket(self.new, entity_type)[entity.id] = entity
+
+    def modify(self, entity: object) -> None:
+        entity_type = type(entity)
+        if entity.id not in self.new.get(entity_type, ()):
+            self._bucket(self.modified, entity_type)[entity.id] = entity
+
+    def delete(self, entity: object) -> None:
+        entity_type = type(entity)
+        self.modified.get(entity_type, {}).pop(entity.id, None)
+        # mentés előtt létrehozott és törölt entitásból nem kell semmit kiírni
+        if self.new.get(entity_type, {}).pop(entity.id, None) is None:
+            self._bucket(self.deleted, entity_type)[entity.id] = entity
+
+    def records(self, entity_type: type) -> Iterator[tuple[str, object]]:
+        """(művelet, entitás) párok: előbb az upsertek, aztán a törlések."""
+        for store, op in ((self.new, UPSERT), (self.modified, UPSERT), (self.deleted, DELETE)):
+            for entity in store.get(entity_type, {}).values():
+                yield op, entity
+
+    def upserts(self, entity_type: type) -> list:
+        return [*self.new.get(entity_type, {}).values(), *self.modified.get(entity_type, {}).values()]
+
+    def deletes(self, entity_type: type) -> list:
+        return list(self.deleted.get(entity_type, {}).values())
+
+    def clear(self, entity_type: type | None = None) -> None:
+        for store in (self.new, self.modified, self.deleted):
+            if entity_type is None:
+                store.clear()
+            else:
+                store.pop(entity_type, None)
+
+    def __len__(self) -> int:
+        return sum(len(b) for store in (self.new, self.modified, self.deleted) for b in store.values())
+
+    def __repr__(self) -> str:
+        counts = {t.__name__: (len(self.new.get(t, ())), len(self.modified.get(t, ())), len(self.deleted.get(t, ())))
+                  for t in FIELDS}
+        return f"ChangeSet(új / módosult / törölt: {counts})"
+
+
+#  AUTOMATIKUS KÖVETÉS
+_changes: ChangeSet | None = None
+# bekapcsoláskor elmentett eredeti __setattr__ osztályonként (None: az osztálynak nem volt sajátja)
+_original_setattr: dict[type, object] = {}
+
+
+def _tracking_setattr(self, name: str, value: object) -> None:
+    setattr_ = _original_setattr.get(type(self)) or object.__setattr__
+    if name not in FIELDS[type(self)]:
+        setattr_(self, name, value)
+        return
+    # még nem beállított mező: a konstruktor fut, ez nem módosítás
+    old = getattr(self, name, _UNSET)
+    setattr_(self, name, value)
+    if old is not _UNSET and old != value and _changes is not None:
+        _changes.modify(self)
+
+
+def track_changes(changes: ChangeSet | None) -> None:
+    """Változás-követés be (a megadott ChangeSet-be) vagy ki (None).
+
+    Bekapcsolva a modellek __setattr__-je le van cserélve, és a konstruktorok / generátorok /
+    törlések a ChangeSet-be jelentenek. Kikapcsoláskor az eredeti __setattr__ visszakerül,
+    így kikapcsolva nincs többletköltség és nem marad globális módosítás."""
+    global _changes
+    _changes = changes
+    model_dataclasses.set_tracker(changes)
+    for cls in FIELDS:
+        if changes is not None:
+            if cls not in _original_setattr:
+                _original_setattr[cls] = cls.__dict__.get("__setattr__")
+                cls.__setattr__ = _tracking_setattr
+        elif cls in _original_setattr:
+            original = _original_setattr.pop(cls)
+            if original is None:
+                del cls.__setattr__
+            else:
+                cls.__setattr__ = original
+
+
+#  DELTA FÁJLOK
+def delta_name(file_name: str, extension: str | None = None) -> str:
+    """people_csv_list.csv -> people_csv_list.delta.csv"""
+    root, ext = os.path.splitext(file_name)
+    return f"{root}.delta{extension or ext}"
+
+
+def drop_delta(full_path: str) -> None:
+    """Teljes mentés után a régi delta fájl már érvénytelen."""
+    if os.path.exists(full_path):
+        os.remove(full_path)
+
+
+def apply_delta(entities: list, records: Iterable[tuple[str, str, object]]) -> list:
+    """Alap lista + (művelet, id, entitás | None) delta rekordok; id-nként a legutolsó rekord dönt.
+    Az eredeti sorrend megmarad, az új entitások a végére kerülnek."""
+    result = []
+    for chunk in iter_delta([entities], records):
+        if chunk is entities:
+            return entities
+        result.extend(chunk)
+    return result
+
+
+def iter_delta(chunks: Iterable[list], records: Iterable[tuple[str, str, object]]) -> Iterator[list]:
+    """Mint az apply_delta, de darabonként: csak a (kicsi) delta van egyszerre a memóriában,
+    az alap adat listák folyamaként jöhet. Delta nélkül a darabok változatlanul mennek tovább."""
+    latest = {}
+    for op, entity_id, entity in records:
+        latest[entity_id] = (op, entity)
+    if not latest:
+        yield from chunks
+        return
+
+    for chunk in chunks:
+        result = []
+        for e in chunk:
+            record = latest.pop(e.id, None)
+            if record is None:
+                result.append(e)
+            elif record[0] == UPSERT:
+                result.append(record[1])
+        if result:
+            yield result
+    tail = [e for op, e in latest.values() if op == UPSERT]
+    if tail:
+        yield tail
+
+
+# ------------------- Tesztelés -------------------
+if __name__ == "__main__":
+    from basic import generator, changes as shared
+    from basic.model_dataclasses import Person
+
+    people = generator.generate_people(5, bulk=True, seed=1)
+    changes = shared.ChangeSet()
+    shared.track_changes(changes)
+
+    people[0].age += 1
+    people[1].name = people[1].name
+    extra = Person("P-000006", "Új Ember", 30)
+    changes.delete(people[2])
+    print(changes)
+
+    records = [(op, e.id, e if op == UPSERT else None) for op, e in changes.records(Person)]
+    print([p.id for p in apply_delta(people, records)])
+    shared.track_changes(None)
+    print("__setattr__ visszaállítva:", "__setattr__" not in Person.__dict__)
@@ -0,0 +1,315 @@
+from collections.abc import Iterable, Iterator
+import re
+import sys
+import numpy as np
+
+from basic.model_dataclasses import Person, Bicycle, Laptop, from_columns
+
+
+# Mezőtípusok:
+#   id:   "P-000123" alakú azonosítók -> előtag + int64 szám (ha nem illik a mintára: str tömb)
+#   dict: szótárkódolt szöveg -> int32 kód + a különböző értékek egy UTF-8 pufferben
+#   int:  int32 tömb (age, year, ram, vram)
+#   bool: bool tömb
+#   ref:  tulajdonos id szótárkódolva (int32 kód); a tulajdonos sora az owners táblából jön
+SCHEMAS: dict[type, tuple[tuple[str, str], ...]] = {
+    Person: (("id", "id"), ("name", "dict"), ("age", "int"), ("male", "bool")),
+    Bicycle: (("id", "id"), ("brand", "dict"), ("model", "dict"), ("year", "int"), ("owner_id", "ref")),
+    Laptop: (("id", "id"), ("brand", "dict"), ("model", "dict"), ("year", "int"),
+             ("ram", "int"), ("vram", "int"), ("owner_id", "ref")),
+}
+
+_ID_PATTERN = re.compile(r"^(.*?)(\d+)$")
+
+
+#  OSZLOPOK
+class IdColumn:
+    """Azonosítók: közös előtag + (legalább width jegyre nullázott) szám esetén csak int64 tömb."""
+
+    __slots__ = ("prefix", "width", "numbers", "strings")
+
+    def __init__(self, ids: list[str]) -> None:
+        self.prefix, self.width, self.numbers, self.strings = "", 0, None, None
+        first = _ID_PATTERN.match(ids[0]) if ids else None
+        if first:
+            prefix, width = first.group(1), len(first.group(2))
+            try:
+                numbers = [int(i[len(prefix):]) for i in ids]
+            except ValueError:
+                numbers = None
+            # csak ha oda-vissza alakítva pontosan ugyanazt kapjuk (P-999999 után P-1000000 is jó)
+            if numbers is not None and all(i == f"{prefix}{x:0{width}d}" for i, x in zip(ids, numbers)):
+                self.prefix, self.width = prefix, width
+                self.numbers = np.array(numbers, dtype=np.int64)
+                return
+        self.strings = np.array(ids, dtype=object)
+
+    def __len__(self) -> int:
+        return len(self.numbers if self.numbers is not None else self.strings)
+
+    def __getitem__(self, i: int) -> str:
+        if self.numbers is not None:
+            return f"{self.prefix}{self.numbers[i]:0{self.width}d}"
+        return self.strings[i]
+
+    def decode(self) -> list[str]:
+        if self.numbers is not None:
+            p, w = self.prefix, self.width
+            return [f"{p}{x:0{w}d}" for x in self.numbers.tolist()]
+        return self.strings.tolist()
+
+    def eq(self, value: str | None) -> np.ndarray:
+        """Bool maszk: id == value; számos tárolásnál a számokat hasonlítjuk össze."""
+        if self.numbers is None:
+            return self.strings == value
+        match = _ID_PATTERN.match(value) if isinstance(value, str) else None
+        # csak a pontosan ugyanígy formázott id lehet benne (más előtag / nullázás: egyik sem)
+        if match is None or value != f"{self.prefix}{int(match.group(2)):0{self.width}d}":
+            return np.zeros(len(self), dtype=bool)
+        return self.numbers == int(match.group(2))
+
+    def take(self, index: np.ndarray) -> "IdColumn":
+        column = IdColumn.__new__(IdColumn)
+        column.prefix, column.width = self.prefix, self.width
+        column.numbers = self.numbers[index] if self.numbers is not None else None
+        column.strings = self.strings[index] if self.strings is not None else None
+        return column
+
+    @property
+    def nbytes(self) -> int:
+        if self.numbers is not None:
+            return self.numbers.nbytes
+        return self.strings.nbytes + sum(sys.getsizeof(s) for s in self.strings)
+
+
+class DictColumn:
+    """Szótárkódolt szövegoszlop: int32 kódok (-1: None) + a különböző értékek
+    egyetlen UTF-8 pufferbe csomagolva (sok különböző értéknél, pl. model, ez a nagy nyereség)."""
+
+    __slots__ = ("codes", "_buffer", "_offsets", "_lookup")
+
+    def __init__(self, values: Iterable[str | None]) -> None:
+        lookup: dict = {}
+        codes = [-1 if v is None else lookup.setdefault(v, len(lookup)) for v in values]
+        self.codes = np.array(codes, dtype=np.int32)
+        encoded = [v.encode("utf-8") for v in lookup]
+        self._buffer = b"".join(encoded)
+        self._offsets = np.zeros(len(encoded) + 1, dtype=np.int32 if len(self._buffer) < 2 ** 31 else np.int64)
+        np.cumsum([len(e) for e in encoded], out=self._offsets[1:])
+        # az érték -> kód szótárt csak kereséskor építjük újra
+        self._lookup = None
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, i: int) -> str | None:
+        return self.value(int(self.codes[i]))
+
+    def value(self, code: int) -> str | None:
+        if code < 0:
+            return None
+        return self._buffer[self._offsets[code]:self._offsets[code + 1]].decode("utf-8")
+
+    @property
+    def values(self) -> list[str]:
+        """A különböző értékek, kód szerinti sorrendben."""
+        buffer, offsets = self._buffer, self._offsets.tolist()
+        return [buffer[a:b].decode("utf-8") for a, b in zip(offsets, offsets[1:])]
+
+    def code(self, value: str | None) -> int:
+        """Az érték kódja, vagy -1 ha nem szerepel."""
+        if self._lookup is None:
+            self._lookup = {v: i for i, v in enumerate(self.values)}
+        return self._lookup.get(value, -1)
+
+    def decode(self) -> list[str | None]:
+        values = self.values
+        return [values[c] if c >= 0 else None for c in self.codes.tolist()]
+
+    def take(self, index: np.ndarray) -> "DictColumn":
+        column = DictColumn.__new__(DictColumn)
+        column.codes = self.codes[index]
+        column._buffer, column._offsets, column._lookup = self._buffer, self._offsets, self._lookup
+        return column
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + len(self._buffer) + self._offsets.nbytes
+
+
+#  TÁBLA
+class RowView:
+    """Egy sor könnyű nézete: a mezőket csak olvasáskor dekódolja."""
+
+    __slots__ = ("_table", "_i")
+
+    def __init__(self, table: "EntityTable", i: int) -> None:
+        self._table = table
+        self._i = i
+
+    def __getattr__(self, name: str):
+        table = self._table
+        if name == "owner":
+            return table.owner_row(self._i)
+        column = table.columns.get(name)
+        if column is None:
+            raise AttributeError(name)
+        value = column[self._i]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{n}={getattr(self, n)!r}" for n in self._table.columns)
+        return f"{self._table.entity_type.__name__}View({fields})"
+
+
+class EntityTable:
+    """Oszlopos tár Person / Bicycle / Laptop sorokhoz: mezőnként egy tömb."""
+
+    def __init__(self, entity_type: type, columns: dict, owners: "EntityTable | None" = None) -> None:
+        self.entity_type = entity_type
+        self.columns = columns
+        self.owners = owners
+        self._owner_pos: np.ndarray | None = None
+
+    #  létrehozás
+    @classmethod
+    def from_entities(cls, entities: Iterable, entity_type: type | None = None,
+                      owners: "EntityTable | None" = None,
+                      fields: Iterable[str] | None = None) -> "EntityTable":
+        """fields: csak ezeket a mezőket kódoljuk (alapból mindet)."""
+        entities = list(entities)
+        if entity_type is None:
+            if not entities:
+                raise ValueError("entity_type is required for an empty entity list")
+            entity_type = type(entities[0])
+        fields = set(fields) if fields is not None else None
+        columns = {}
+        for name, kind in SCHEMAS[entity_type]:
+            if fields is not None and name not in fields:
+                continue
+            values = [getattr(e, name) for e in entities]
+            columns[name] = cls._encode(kind, values)
+        return cls(entity_type, columns, owners)
+
+    @classmethod
+    def from_columns(cls, entity_type: type, data: dict, owners: "EntityTable | None" = None) -> "EntityTable":
+        """A generator *_columns kimenetéből, objektumok nélkül."""
+        return cls(entity_type, {name: cls._encode(kind, data[name]) for name, kind in SCHEMAS[entity_type]}, owners)
+
+    @staticmethod
+    def _encode(kind: str, values):
+        if kind == "id":
+            return IdColumn(list(values))
+        if kind in ("dict", "ref"):
+            return DictColumn(values.tolist() if isinstance(values, np.ndarray) else values)
+        if kind == "int":
+            return np.asarray(values, dtype=np.int32)
+        return np.asarray(values, dtype=bool)
+
+    #  alap műveletek
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __getitem__(self, i: int) -> RowView:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return RowView(self, i)
+
+    def __iter__(self) -> Iterator[RowView]:
+        return (RowView(self, i) for i in range(len(self)))
+
+    def array(self, name: str) -> np.ndarray:
+        """Vektoros műveletekhez: int/bool oszlop, illetve szöveges oszlopnál a kódok."""
+        column = self.columns[name]
+        return column.codes if isinstance(column, DictColumn) else column
+
+    def eq(self, name: str, value) -> np.ndarray:
+        """Bool maszk: name == value, egyetlen vektoros összehasonlítással."""
+        column = self.columns[name]
+        if isinstance(column, DictColumn):
+            code = column.code(value)
+            return column.codes == code if code >= 0 or value is None else np.zeros(len(self), dtype=bool)
+        if isinstance(column, IdColumn):
+            return column.eq(value)
+        return column == value
+
+    def take(self, index: np.ndarray) -> "EntityTable":
+        """Részhalmaz maszk vagy indexek alapján."""
+        index = np.flatnonzero(index) if index.dtype == bool else index
+        columns = {name: (c.take(index) if isinstance(c, (IdColumn, DictColumn)) else c[index])
+                   for name, c in self.columns.items()}
+        return EntityTable(self.entity_type, columns, self.owners)
+
+    #  tulajdonos
+    def owner_index(self) -> np.ndarray:
+        """Soronként a tulajdonos sora az owners táblában (-1 ha nincs ilyen)."""
+        if "owner_id" not in self.columns:
+            raise ValueError(f"{self.entity_type.__name__} table has no owner_id column")
+        if self.owners is None:
+            raise ValueError(f"{self.entity_type.__name__} table has no owners table")
+        if self._owner_pos is None:
+            owner_ids = self.columns["owner_id"]
+            positions = {pid: i for i, pid in enumerate(self.owners.columns["id"].decode())}
+            by_code = np.array([positions.get(v, -1) for v in owner_ids.values], dtype=np.int32)
+            self._owner_pos = by_code[owner_ids.codes] if len(by_code) else by_code
+        return self._owner_pos
+
+    def owner_row(self, i: int) -> RowView | None:
+        if self.owners is None or "owner_id" not in self.columns:
+            return None
+        pos = int(self.owner_index()[i])
+        return RowView(self.owners, pos) if pos >= 0 else None
+
+    #  vissza dataclass-okká
+    def to_entities(self, owners: Iterable[Person] | None = None) -> list:
+        """Dataclass példányok; ha owners adott, a kapcsolatok is beállnak (owner_id alapján,
+        az owners tábla nem kell hozzá). fields=-szel vetített táblából nem megy: a hiányzó
+        mezőknek nincs értéke."""
+        names = [name for name, _ in SCHEMAS[self.entity_type]]
+        missing = [n for n in names if n not in self.columns]
+        if missing:
+            raise ValueError(f"Projected {self.entity_type.__name__} table has no {missing} columns")
+        decoded = [c.decode() if isinstance(c, (IdColumn, DictColumn)) else c.tolist()
+                   for c in (self.columns[n] for n in names)]
+        entities = from_columns(self.entity_type, *decoded)
+
+        if owners is not None and "owner_id" in self.columns:
+            by_id = {p.id: p for p in owners}
+            for entity in entities:
+                owner = by_id.get(entity.owner_id)
+                if owner is not None:
+                    entity.owner = owner
+                    if isinstance(entity, Bicycle):
+                        owner.add_bicycle(entity)
+                    else:
+                        owner.add_laptop(entity)
+        return entities
+
+    @property
+    def nbytes(self) -> int:
+        return sum(c.nbytes for c in self.columns.values())
+
+
+# ------------------- Tesztelés -------------------
+if __name__ == "__main__":
+    import tracemalloc
+    from basic import generator
+
+    people_table = EntityTable.from_columns(Person, generator.generate_people_columns(20_000, seed=1))
+    laptop_table = EntityTable.from_columns(Laptop, generator.generate_laptops_columns(200_000, 20_000, seed=1),
+                                            owners=people_table)
+
+    # ugyanez dataclass objektumokként
+    tracemalloc.start()
+    people = people_table.to_entities()
+    laptops = laptop_table.to_entities(people)
+    objects = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    table = people_table.nbytes + laptop_table.nbytes
+    print(f"Objektumok: {objects / 1e6:.1f} MB, tábla: {table / 1e6:.1f} MB ({objects / table:.1f}x)")
+
+    dell = laptop_table.take(laptop_table.eq("brand", "Dell") & (laptop_table.array("ram") >= 32))
+    print(len(dell), dell[0], dell[0].owner.name)
+    print(EntityTable.from_entities(laptops, owners=people_table).to_entities()[0] == laptops[0])
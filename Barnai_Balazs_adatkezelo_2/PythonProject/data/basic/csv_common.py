@@ -0,0 +1,130 @@
+import csv
+import os
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from itertools import chain
+from operator import itemgetter
+from basic import csv_parallel
+from basic.changes import apply_delta, delta_name, drop_delta, iter_delta
+from basic.registry import register
+from basic.schema import codec
+
+# A csv.list és a csv.dict közös része: fejléces fájlok, a mezők helye a fejlécből jön.
+# A handlerek csak a fájlnevekben, a kódolásban és a delta fájl formátumában térnek el,
+# ezért a delta olvasót (read_delta(path, file_name, delimiter, entity_type)) ők adják át.
+
+# streaming olvasásnál egyszerre ennyi sor van a memóriában
+CHUNK_SIZE = 50_000
+# írásnál a fájl puffere (bájt): kevesebb, nagyobb write hívás
+WRITE_BUFFER = 1 << 20
+
+DeltaReader = Callable[[str, str, str, type], list[tuple]]
+
+
+def _no_delta(path: str, file_name: str, delimiter: str, entity_type: type) -> list[tuple]:
+    return []
+
+
+#  ÍRÁS
+def write_entities(entity_type: type,
+                   entities: Iterable,
+                   path: str,
+                   file_name: str,
+                   delimiter: str = ";",
+                   buffer_size: int = WRITE_BUFFER,
+                   no_quoting: bool = False,
+                   encoding: str | None = None) -> None:
+    """Fejléc + sorok. no_quoting=True: idézést nem igénylő adatnál a sorok str.join-nal,
+    csv.writer nélkül mennek ki (ha mégis kellene idézés, az a darab a csv.writer-rel,
+    lásd RowCodec.write_csv)."""
+    row_codec = codec(entity_type)
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, file_name), "w", newline="", encoding=encoding, buffering=buffer_size) as file:
+        csv.writer(file, delimiter=delimiter).writerow(row_codec.fields)
+        row_codec.write_csv(file, entities, delimiter, no_quoting)
+    # teljes mentés: a korábbi változások már benne vannak
+    drop_delta(os.path.join(path, delta_name(file_name)))
+
+
+#  STREAMING OLVASÁS
+def iter_entities(entity_type: type,
+                  path: str,
+                  file_name: str,
+                  delimiter: str = ";",
+                  chunk_size: int | None = None,
+                  columns: Sequence[str] | None = None,
+                  encoding: str | None = None,
+                  read_delta: DeltaReader = _no_delta) -> Iterator:
+    """Soronként (chunk_size=None) vagy legfeljebb chunk_size elemű listákban; egyszerre
+    csak egy darab van a memóriában. A delta fájl is érvényesül, a registry-be nem kerülnek.
+    columns=("name", "age"): csak ezek a mezők konvertálódnak, entitás helyett könnyű
+    rekordok (schema.record_type) jönnek. Az oszlopokat a fejléc neveiből keressük meg."""
+    delta = read_delta(path, file_name, delimiter, entity_type)
+    size = chunk_size or CHUNK_SIZE
+    full_path = os.path.join(path, file_name)
+    if columns is not None and delta:
+        # a delta id szerint dönt: teljes entitásokra alkalmazzuk, utána vetítünk
+        chunks = map(codec(entity_type).projector(columns),
+                     iter_delta(read_chunks(entity_type, full_path, delimiter, size, None, encoding), delta))
+    else:
+        chunks = iter_delta(read_chunks(entity_type, full_path, delimiter, size, columns, encoding), delta)
+    return chunks if chunk_size else chain.from_iterable(chunks)
+
+
+def read_chunks(entity_type: type,
+                full_path: str,
+                delimiter: str,
+                size: int,
+                columns: Sequence[str] | None = None,
+                encoding: str | None = None) -> Iterator[list]:
+    """A fájl (delta nélkül) legfeljebb size elemű listákban."""
+    with open(full_path, newline="", encoding=encoding) as file:
+        rows = csv.reader(file, delimiter=delimiter)
+        header = next(rows, None)
+        if header is None:
+            return
+        # a mezők helye a fejlécből jön, nem fix pozíciókból
+        row_codec = codec(entity_type)
+        yield from row_codec.chunks(rows, size, row_codec.decoder(header, columns))
+
+
+def read_entities(entity_type: type,
+                  path: str,
+                  file_name: str,
+                  delimiter: str = ";",
+                  columns: Sequence[str] | None = None,
+                  encoding: str | None = None,
+                  read_delta: DeltaReader = _no_delta) -> list:
+    items = list(iter_entities(entity_type, path, file_name, delimiter, None, columns, encoding, read_delta))
+    # a rekordok nem entitások, a registry-be csak a teljes példányok kerülnek
+    return items if columns is not None else register(items)
+
+
+def read_columns(entity_type: type,
+                 path: str,
+                 file_name: str,
+                 columns: Sequence[str] | None = None,
+                 delimiter: str = ";",
+                 encoding: str | None = None,
+                 read_delta: DeltaReader = _no_delta) -> dict[str, list]:
+    """Oszlopos eredmény: mezőnév -> lista (pl. query.Query-nek), csak a kért mezők dekódolva."""
+    columns = tuple(columns or codec(entity_type).fields)
+    result = {name: [] for name in columns}
+    for chunk in iter_entities(entity_type, path, file_name, delimiter, CHUNK_SIZE, columns, encoding, read_delta):
+        for i, name in enumerate(columns):
+            result[name].extend(map(itemgetter(i), chunk))
+    return result
+
+
+#  PÁRHUZAMOS OLVASÁS
+def read_parallel(entity_type: type,
+                  path: str,
+                  file_name: str,
+                  delimiter: str = ";",
+                  workers: int | None = None,
+                  encoding: str | None = None,
+                  read_delta: DeltaReader = _no_delta) -> list:
+    """Nagy fájlok beolvasása több processzben (sorhatáron vágott bájttartományok,
+    lásd csv_parallel); a sorrend és az eredmény ugyanaz, mint a read_entities-é."""
+    entities = csv_parallel.read_parallel(entity_type, os.path.join(path, file_name), delimiter, workers,
+                                          encoding=encoding)
+    return register(apply_delta(entities, read_delta(path, file_name, delimiter, entity_type)))
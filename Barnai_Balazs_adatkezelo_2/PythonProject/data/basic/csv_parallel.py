@@ -0,0 +1,205 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from operator import itemgetter
+import csv
+import gc
+import io
+import locale
+import os
+
+from basic.model_dataclasses import from_columns
+from basic.schema import SCHEMAS, TRUE_STRINGS
+
+
+# egy worker legalább ennyi bájtot kapjon, kisebb fájlt nem érdemes szétosztani
+MIN_RANGE_BYTES = 4 * 1024 * 1024
+_BLOCK = 1024 * 1024
+# a szöveges oszlopok egyetlen stringként mennek vissza a workerből (join / split),
+# így nem kell soronként pickle-ölni; ha a jel előfordul az adatban, marad a lista
+_SEPARATOR = "\x1f"
+
+
+#  FELOSZTÁS
+def _quote_parity(file, start: int, end: int, quote: bytes) -> int:
+    """Az idézőjelek számának paritása a [start, end) bájttartományban."""
+    file.seek(start)
+    parity, remaining = 0, end - start
+    while remaining > 0:
+        block = file.read(min(_BLOCK, remaining))
+        if not block:
+            break
+        parity ^= block.count(quote) & 1
+        remaining -= len(block)
+    return parity
+
+
+def _next_boundary(file, offset: int, parity: int, quote: bytes | None) -> int:
+    """Az offset utáni első sorvége, ami nem idézőjeles mezőn belül van -> a következő sor eleje.
+    Páros számú idézőjel után vagyunk mezőn kívül (a "" escape is kettőnek számít)."""
+    file.seek(offset)
+    pos = offset
+    while True:
+        block = file.read(_BLOCK)
+        if not block:
+            return pos
+        i = 0
+        while True:
+            j = block.find(b"\n", i)
+            if j < 0:
+                if quote:
+                    parity ^= block.count(quote, i) & 1
+                break
+            if quote:
+                parity ^= block.count(quote, i, j) & 1
+            if not parity:
+                return pos + j + 1
+            i = j + 1
+        pos += len(block)
+
+
+def split_ranges(full_path: str, parts: int, quotechar: str | None = '"') -> list[tuple[int, int]]:
+    """A fájl (fejléc utáni része) legfeljebb parts darab [start, end) bájttartományra,
+    sorhatáron és idézőjeles mezőn kívül vágva. Az első tartomány a fejléc után kezdődik."""
+    quote = quotechar.encode() if quotechar else None
+    size = os.path.getsize(full_path)
+    with open(full_path, "rb") as file:
+        start = _next_boundary(file, 0, 0, quote)
+        step = (size - start) // max(parts, 1)
+        bounds = [start]
+        parity_pos, parity = start, 0
+        for k in range(1, parts):
+            offset = max(start + k * step, bounds[-1])
+            if quote:
+                parity ^= _quote_parity(file, parity_pos, offset, quote)
+                parity_pos = offset
+            bounds.append(_next_boundary(file, offset, parity, quote))
+        bounds.append(size)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+#  WORKER
+@contextmanager
+def _gc_paused():
+    """Sok millió frissen létrehozott (ciklusmentes) objektumnál a GC újra és újra
+    végigjárná őket; a beolvasás idejére kikapcsoljuk (csak ha eddig be volt kapcsolva)."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _parse_range(task: tuple) -> tuple[int, list]:
+    """Egy bájttartomány beolvasása -> (sorok száma, oszlopok mező-sorrendben).
+    Az int / bool oszlopok array-ként, a szövegesek egyetlen összefűzött stringként jönnek vissza."""
+    full_path, start, end, delimiter, quotechar, encoding, positions, kinds = task
+    with open(full_path, "rb") as file:
+        file.seek(start)
+        text = file.read(end - start).decode(encoding)
+    reader = csv.reader(io.StringIO(text, newline=""), delimiter=delimiter,
+                        quotechar=quotechar or '"', quoting=csv.QUOTE_MINIMAL if quotechar else csv.QUOTE_NONE)
+    with _gc_paused():
+        rows = list(reader)
+        columns = []
+        for pos, kind in zip(positions, kinds):
+            values = map(itemgetter(pos), rows)
+            if kind is int:
+                columns.append(array("q", map(int, values)))
+            elif kind is bool:
+                columns.append(array("b", [v.lower() in TRUE_STRINGS for v in values]))
+            else:
+                values = list(values)
+                joined = _SEPARATOR.join(values)
+                columns.append(joined if joined.count(_SEPARATOR) == len(values) - 1 else values)
+    return len(rows), columns
+
+
+def _unpack(payload, kind: type) -> list:
+    if isinstance(payload, str):
+        return payload.split(_SEPARATOR)
+    if kind is bool:
+        return [bool(v) for v in payload]
+    return payload if isinstance(payload, list) else payload.tolist()
+
+
+#  OLVASÁS
+def read_header(full_path: str, delimiter: str = ";", encoding: str | None = None) -> list[str]:
+    with open(full_path, newline="", encoding=encoding) as file:
+        return next(csv.reader(file, delimiter=delimiter), [])
+
+
+def read_parallel(entity_type: type,
+                  full_path: str,
+                  delimiter: str = ";",
+                  workers: int | None = None,
+                  encoding: str | None = None,
+                  quotechar: str | None = '"',
+                  columns: bool = False) -> list | dict[str, list]:
+    """Fejléces CSV beolvasása több processzben: a fájl sorhatáron (és idézőjeles mezőn kívül)
+    vágott bájttartományait külön workerek dolgozzák fel, az eredmény a fájl sorrendjében jön.
+
+    A mezőket a fejléc nevei alapján keresi meg, így a csv.list és a csv.dict fájljaira is jó.
+    columns=True: objektumok helyett name -> lista oszlopok (pl. Query-nek), ez skálázódik a
+    legjobban; objektumoknál a példányok létrehozása a fő processzben történik."""
+    encoding = encoding or locale.getpreferredencoding(False)
+    schema = SCHEMAS[entity_type]
+    header = read_header(full_path, delimiter, encoding)
+    missing = [name for name, _ in schema if name not in header]
+    if missing:
+        raise ValueError(f"Missing columns in {full_path}: {missing}")
+    positions = [header.index(name) for name, _ in schema]
+    kinds = [kind for _, kind in schema]
+
+    workers = workers or os.cpu_count() or 1
+    n_ranges = max(1, min(workers, os.path.getsize(full_path) // MIN_RANGE_BYTES))
+    tasks = [(full_path, start, end, delimiter, quotechar, encoding, positions, kinds)
+             for start, end in split_ranges(full_path, n_ranges, quotechar)]
+    if workers == 1 or len(tasks) <= 1:
+        return _collect(entity_type, map(_parse_range, tasks), kinds, columns)
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+        # a map sorrendtartó: a tartományok a fájl sorrendjében jönnek vissza
+        return _collect(entity_type, executor.map(_parse_range, tasks), kinds, columns)
+
+
+def _collect(entity_type: type, parts, kinds: list[type], columns: bool) -> list | dict[str, list]:
+    names = [name for name, _ in SCHEMAS[entity_type]]
+    if columns:
+        merged = {name: [] for name in names}
+        for n, payloads in parts:
+            if n:
+                for name, payload, kind in zip(names, payloads, kinds):
+                    merged[name].extend(_unpack(payload, kind))
+        return merged
+    entities = []
+    for n, payloads in parts:
+        if n:
+            with _gc_paused():
+                entities.extend(from_columns(entity_type, *map(_unpack, payloads, kinds)))
+    return entities
+
+
+# ------------------- Tesztelés -------------------
+if __name__ == "__main__":
+    import tempfile
+    import time
+    from basic import generator
+    from basic.model_dataclasses import Laptop
+
+    people = generator.generate_people(10_000, bulk=True, seed=1)
+    laptops = generator.generate_laptops(300_000, people, bulk=True, seed=1)
+    laptops[0].model = 'Idéző "jel"\nés sortörés;pontosvessző'
+    path = os.path.join(tempfile.mkdtemp(), "laptops.csv")
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(["owner_id", "id", "brand", "model", "year", "ram", "vram"])
+        writer.writerows((l.owner_id, l.id, l.brand, l.model, l.year, l.ram, l.vram) for l in laptops)
+
+    print(split_ranges(path, 4))
+    for w in (1, os.cpu_count()):
+        start = time.perf_counter()
+        result = read_parallel(Laptop, path, workers=w, encoding="utf-8")
+        print(f"{w} worker: {time.perf_counter() - start:.2f} s", result == laptops,
+              repr(result[0].model))
@@ -1,99 +1,455 @@
-from faker import Faker
-from basic.model_dataclasses import Person, Bicycle, Laptop
-import random
-
-
-def generate_people(n: int, male_ratio: float = 0.5,
-                    locale: str = "en_US",
-                    unique: bool = False,
-                    min_age: int = 0,
-                    max_age: int = 100) -> list[Person]:
-
-    assert n > 0
-    assert 0 <= male_ratio <= 1
-    assert 0 <= min_age <= max_age <= 100
-
-    people = []
-    fake = Faker(locale)
-    fake = fake if not unique else fake.unique
-
-    for i in range(n):
-        male = random.random() < male_ratio
-        person = Person(
-            id=f"P-{str(i + 1).zfill(6)}",
-            name=fake.name_male() if male else fake.name_female(),
-            age=random.randint(min_age, max_age),
-            male=male
-        )
-        # Kapcsolatok inicializálása
-        person.bicycles = []
-        person.laptops = []
-        people.append(person)
-
-    return people
-
-
-def generate_bicycles(n: int, people: list[Person]) -> list[Bicycle]:
-    """Kerékpárok generálása és hozzárendelése emberekhez (1:N kapcsolat)."""
-    assert n > 0 and len(people) > 0
-
-    bicycles = []
-    fake = Faker()
-    bicycle_brands = ["Trek", "Specialized", "Giant", "Cannondale", "Scott", "Bianchi", "Merida", "Cube"]
-
-    for i in range(n):
-        owner = random.choice(people)
-        bicycle = Bicycle(
-            id=f"B-{str(i + 1).zfill(6)}",
-            brand=random.choice(bicycle_brands),
-            model=fake.word().capitalize() + "-" + str(random.randint(100, 999)),
-            year=random.randint(2000, 2025),
-            owner_id=owner.id,
-        )
-        # kapcsolat mindkét irányba
-        bicycle.owner = owner
-        owner.bicycles.append(bicycle)
-        bicycles.append(bicycle)
-
-    return bicycles
-
-
-def generate_laptops(n: int, people: list[Person]) -> list[Laptop]:
-    """Laptopok generálása és hozzárendelése emberekhez (1:N kapcsolat)."""
-    assert n > 0 and len(people) > 0
-
-    laptops = []
-    fake = Faker()
-    laptop_brands = ["Dell", "HP", "Lenovo", "Apple", "Asus", "Acer", "MSI", "Razer"]
-
-    for i in range(n):
-        owner = random.choice(people)
-        laptop = Laptop(
-            id=f"L-{str(i + 1).zfill(6)}",
-            brand=random.choice(laptop_brands),
-            model=fake.word().capitalize() + "-" + str(random.randint(100, 9999)),
-            year=random.randint(2015, 2025),
-            ram=random.choice([4, 8, 16, 32, 64, 128]),
-            vram=random.choice([2, 4, 6, 8, 12, 16]),
-            owner_id=owner.id,     # fájlkezeléshez szükséges
-        )
-        # kapcsolat mindkét irányba
-        laptop.owner = owner
-        owner.laptops.append(laptop)
-        laptops.append(laptop)
-
-    return laptops
-
-
-# ------------------- Tesztelés -------------------
-if __name__ == "__main__":
-    people = generate_people(50, male_ratio=0.5, min_age=18, max_age=60)
-    bicycles = generate_bicycles(30, people)
-    laptops = generate_laptops(30, people)
-
-    print("\n=== KAPCSOLATOK ===")
-    for p in people:
-        print(f"{p.name}:")
-        print("  Biciklik:", [b.model for b in p.bicycles])
-        print("  Laptopok:", [l.model for l in p.laptops])
-        print()
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from basic import ownership as own, pools
+from basic.registry import register
+from basic.model_dataclasses import Person, Bicycle, Laptop, created, from_columns
+import numpy as np
+import math
+import os
+import random
+
+
+BICYCLE_BRANDS = ["Trek", "Specialized", "Giant", "Cannondale", "Scott", "Bianchi", "Merida", "Cube"]
+LAPTOP_BRANDS = ["Dell", "HP", "Lenovo", "Apple", "Asus", "Acer", "MSI", "Razer"]
+LAPTOP_RAM = [4, 8, 16, 32, 64, 128]
+LAPTOP_VRAM = [2, 4, 6, 8, 12, 16]
+
+# Párhuzamos generálásnál egy shard mérete (a kimenet nem függ a workerek számától)
+SHARD_SIZE = 100_000
+
+
+def _make_ids(prefix: str, n: int, start: int = 1) -> list[str]:
+    return [f"{prefix}-{i:06d}" for i in range(start, start + n)]
+
+
+#  EGYEDI NEVEK
+# A k. sor neve a (keresztnév, vezetéknév) térben a (k * step + space // 2) mod space pozíció.
+# Mivel step relatív prím a tér méretéhez, ez bijekció: nincs ütközés és
+# nincs újrapróbálkozás. A név csak a globális sorszámtól függ, így shardok
+# és chunkok között is egyedi marad. Ha elfogy a tér, " 2", " 3", ... utótag jön.
+@lru_cache(maxsize=None)
+def _unique_space(locale: str, male: bool) -> tuple:
+    males, females, lasts, last_first = pools.name_parts(locale)
+    firsts = males if male else females
+    space = len(firsts) * len(lasts)
+    step = int(space * 0.6180339887) | 1
+    while math.gcd(step, space) != 1:
+        step += 1
+    return firsts, lasts, space, step, last_first
+
+
+def _format_name(first: str, last: str, rnd: int, last_first: bool) -> str:
+    name = f"{last} {first}" if last_first else f"{first} {last}"
+    return name if rnd == 0 else f"{name} {rnd + 1}"
+
+
+def _unique_name(k: int, male: bool, locale: str) -> str:
+    firsts, lasts, space, step, last_first = _unique_space(locale, male)
+    j = (k * step + space // 2) % space
+    return _format_name(firsts[j // len(lasts)], lasts[j % len(lasts)], k // space, last_first)
+
+
+def _unique_names(male: np.ndarray, start: int, locale: str) -> np.ndarray:
+    """_unique_name vektorosan: a start-tól sorszámozott sorok nevei."""
+    k = np.arange(start - 1, start - 1 + len(male), dtype=np.int64)
+    names = np.empty(len(male), dtype=object)
+    for mask, is_male in ((male, True), (~male, False)):
+        firsts, lasts, space, step, last_first = _unique_space(locale, is_male)
+        kk = k[mask]
+        j = (kk * step + space // 2) % space
+        names[mask] = [_format_name(f, l, r, last_first) for f, l, r in
+                       zip(firsts[j // len(lasts)].tolist(), lasts[j % len(lasts)].tolist(),
+                           (kk // space).tolist())]
+    return names
+
+
+#  BULK (NumPy) OSZLOPOK
+def generate_people_columns(n: int, male_ratio: float = 0.5,
+                            locale: str = "en_US",
+                            unique: bool = False,
+                            min_age: int = 0,
+                            max_age: int = 100,
+                            seed: int | None = None,
+                            start: int = 1) -> dict[str, list | np.ndarray]:
+    """Emberek oszloponként (id, name, age, male), Person objektumok nélkül."""
+    assert n > 0
+    assert 0 <= male_ratio <= 1
+    assert 0 <= min_age <= max_age <= 100
+
+    rng = np.random.default_rng(seed)
+    male = rng.random(n) < male_ratio
+    age = rng.integers(min_age, max_age + 1, size=n)
+    n_male = int(male.sum())
+
+    if unique:
+        names = _unique_names(male, start, locale)
+    else:
+        names = np.empty(n, dtype=object)
+        names[male] = pools.sample(pools.male_names(locale), n_male, rng)
+        names[~male] = pools.sample(pools.female_names(locale), n - n_male, rng)
+
+    return {"id": _make_ids("P", n, start), "name": names, "age": age, "male": male}
+
+
+def _model_names(rng: np.random.Generator, n: int, low: int, high: int) -> list[str]:
+    words = pools.sample(pools.model_words(), n, rng)
+    numbers = rng.integers(low, high + 1, size=n)
+    return [f"{w}-{x}" for w, x in zip(words.tolist(), numbers.tolist())]
+
+
+def _owners(n: int, owner_ids: list[str] | int, rng: np.random.Generator,
+            ownership: str, zipf_s: float, start: int) -> tuple[np.ndarray, list[str]]:
+    n_owners = owner_ids if isinstance(owner_ids, int) else len(owner_ids)
+    assert n > 0 and n_owners > 0
+    owner_index = own.owner_indices(n, n_owners, rng, ownership, zipf_s, start)
+    if isinstance(owner_ids, int):
+        return owner_index, [f"P-{i + 1:06d}" for i in owner_index.tolist()]
+    return owner_index, [owner_ids[i] for i in owner_index.tolist()]
+
+
+def generate_bicycles_columns(n: int, owner_ids: list[str] | int,
+                              seed: int | None = None,
+                              start: int = 1,
+                              ownership: str = "uniform",
+                              zipf_s: float = own.ZIPF_S) -> dict[str, list | np.ndarray]:
+    """Kerékpárok oszloponként; az owner_index a owner_ids listába mutat.
+    Ha owner_ids egy szám, a tulajdonosok a generált P-000001.. id-k."""
+    rng = np.random.default_rng(seed)
+    owner_index, owner_id = _owners(n, owner_ids, rng, ownership, zipf_s, start)
+    return {
+        "id": _make_ids("B", n, start),
+        "brand": np.array(BICYCLE_BRANDS, dtype=object)[rng.integers(0, len(BICYCLE_BRANDS), size=n)],
+        "model": _model_names(rng, n, 100, 999),
+        "year": rng.integers(2000, 2026, size=n),
+        "owner_index": owner_index,
+        "owner_id": owner_id,
+    }
+
+
+def generate_laptops_columns(n: int, owner_ids: list[str] | int,
+                             seed: int | None = None,
+                             start: int = 1,
+                             ownership: str = "uniform",
+                             zipf_s: float = own.ZIPF_S) -> dict[str, list | np.ndarray]:
+    """Laptopok oszloponként; az owner_index a owner_ids listába mutat.
+    Ha owner_ids egy szám, a tulajdonosok a generált P-000001.. id-k."""
+    rng = np.random.default_rng(seed)
+    owner_index, owner_id = _owners(n, owner_ids, rng, ownership, zipf_s, start)
+    return {
+        "id": _make_ids("L", n, start),
+        "brand": np.array(LAPTOP_BRANDS, dtype=object)[rng.integers(0, len(LAPTOP_BRANDS), size=n)],
+        "model": _model_names(rng, n, 100, 9999),
+        "year": rng.integers(2015, 2026, size=n),
+        "ram": np.array(LAPTOP_RAM)[rng.integers(0, len(LAPTOP_RAM), size=n)],
+        "vram": np.array(LAPTOP_VRAM)[rng.integers(0, len(LAPTOP_VRAM), size=n)],
+        "owner_index": owner_index,
+        "owner_id": owner_id,
+    }
+
+
+#  OBJEKTUM GENERÁLÁS
+def generate_people(n: int, male_ratio: float = 0.5,
+                    locale: str = "en_US",
+                    unique: bool = False,
+                    min_age: int = 0,
+                    max_age: int = 100,
+                    bulk: bool = False,
+                    seed: int | None = None) -> list[Person]:
+
+    if bulk:
+        cols = generate_people_columns(n, male_ratio, locale, unique, min_age, max_age, seed)
+        return register(_people_from_columns(cols), Person)
+
+    assert n > 0
+    assert 0 <= male_ratio <= 1
+    assert 0 <= min_age <= max_age <= 100
+
+    people = []
+    # seed nélkül a globális random (random.seed-del is ismételhető), seed-del saját generátor
+    rnd = random if seed is None else random.Random(seed)
+    # Faker helyett az előre húzott pool-okból választunk
+    male_pool, female_pool = pools.male_names(locale), pools.female_names(locale)
+
+    for i in range(n):
+        male = rnd.random() < male_ratio
+        if unique:
+            name = _unique_name(i, male, locale)
+        else:
+            pool = male_pool if male else female_pool
+            name = pool[rnd.randrange(len(pool))]
+        person = Person(
+            id=f"P-{str(i + 1).zfill(6)}",
+            name=name,
+            age=rnd.randint(min_age, max_age),
+            male=male
+        )
+        people.append(person)
+
+    return register(people, Person)
+
+
+def generate_bicycles(n: int, people: list[Person],
+                      bulk: bool = False,
+                      seed: int | None = None,
+                      ownership: str = "uniform",
+                      zipf_s: float = own.ZIPF_S) -> list[Bicycle]:
+    """Kerékpárok generálása és hozzárendelése emberekhez (1:N kapcsolat)."""
+    assert n > 0 and len(people) > 0
+
+    if bulk:
+        cols = generate_bicycles_columns(n, [p.id for p in people], seed, ownership=ownership, zipf_s=zipf_s)
+        return _bicycles_from_columns(cols, people)
+
+    bicycles = []
+    words = pools.model_words()
+    rnd = random if seed is None else random.Random(seed)
+
+    for i in range(n):
+        if ownership == "uniform":
+            owner = rnd.choice(people)
+        else:
+            owner = people[own.owner_index(i, len(people), ownership, zipf_s, rnd)]
+        bicycle = Bicycle(
+            id=f"B-{str(i + 1).zfill(6)}",
+            brand=rnd.choice(BICYCLE_BRANDS),
+            model=words[rnd.randrange(len(words))] + "-" + str(rnd.randint(100, 999)),
+            year=rnd.randint(2000, 2025),
+            owner_id=owner.id,
+        )
+        # kapcsolat mindkét irányba
+        bicycle.owner = owner
+        owner.bicycles.append(bicycle)
+        bicycles.append(bicycle)
+
+    return register(bicycles, Bicycle)
+
+
+def generate_laptops(n: int, people: list[Person],
+                     bulk: bool = False,
+                     seed: int | None = None,
+                     ownership: str = "uniform",
+                     zipf_s: float = own.ZIPF_S) -> list[Laptop]:
+    """Laptopok generálása és hozzárendelése emberekhez (1:N kapcsolat)."""
+    assert n > 0 and len(people) > 0
+
+    if bulk:
+        cols = generate_laptops_columns(n, [p.id for p in people], seed, ownership=ownership, zipf_s=zipf_s)
+        return _laptops_from_columns(cols, people)
+
+    laptops = []
+    words = pools.model_words()
+    rnd = random if seed is None else random.Random(seed)
+
+    for i in range(n):
+        if ownership == "uniform":
+            owner = rnd.choice(people)
+        else:
+            owner = people[own.owner_index(i, len(people), ownership, zipf_s, rnd)]
+        laptop = Laptop(
+            id=f"L-{str(i + 1).zfill(6)}",
+            brand=rnd.choice(LAPTOP_BRANDS),
+            model=words[rnd.randrange(len(words))] + "-" + str(rnd.randint(100, 9999)),
+            year=rnd.randint(2015, 2025),
+            ram=rnd.choice(LAPTOP_RAM),
+            vram=rnd.choice(LAPTOP_VRAM),
+            owner_id=owner.id,     # fájlkezeléshez szükséges
+        )
+        # kapcsolat mindkét irányba
+        laptop.owner = owner
+        owner.laptops.append(laptop)
+        laptops.append(laptop)
+
+    return register(laptops, Laptop)
+
+
+#  OSZLOPOK -> OBJEKTUMOK
+def _people_from_columns(cols: dict) -> list[Person]:
+    # a generált oszlopok típushelyesek: megbízható konstruktor, __init__ nélkül
+    # (az új példányokat így a created() jelenti a változás-követésnek)
+    return created(from_columns(Person, cols["id"], cols["name"].tolist(), cols["age"].tolist(),
+                                cols["male"].tolist()))
+
+
+def _bicycles_from_columns(cols: dict, people: list[Person]) -> list[Bicycle]:
+    bicycles = created(from_columns(Bicycle, cols["id"], cols["brand"].tolist(), cols["model"],
+                                    cols["year"].tolist(), cols["owner_id"]))
+    for bicycle, idx in zip(bicycles, cols["owner_index"].tolist()):
+        owner = people[idx]
+        bicycle.owner = owner
+        owner.bicycles.append(bicycle)
+    return register(bicycles, Bicycle)
+
+
+def _laptops_from_columns(cols: dict, people: list[Person]) -> list[Laptop]:
+    laptops = created(from_columns(Laptop, cols["id"], cols["brand"].tolist(), cols["model"], cols["year"].tolist(),
+                                   cols["ram"].tolist(), cols["vram"].tolist(), cols["owner_id"]))
+    for laptop, idx in zip(laptops, cols["owner_index"].tolist()):
+        owner = people[idx]
+        laptop.owner = owner
+        owner.laptops.append(laptop)
+    return register(laptops, Laptop)
+
+
+#  PÁRHUZAMOS (SHARDOLT) GENERÁLÁS
+def shard_plan(n: int, seed: int, shard_size: int) -> list[tuple[int, int, int]]:
+    """(start, méret, seed) hármasok; a felosztás csak n-től és shard_size-tól függ."""
+    count = (n + shard_size - 1) // shard_size
+    seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(count)]
+    return [(k * shard_size + 1, min(shard_size, n - k * shard_size), seeds[k]) for k in range(count)]
+
+
+def _merge_columns(parts: list[dict]) -> dict:
+    merged = {}
+    for key in parts[0]:
+        if isinstance(parts[0][key], np.ndarray):
+            merged[key] = np.concatenate([p[key] for p in parts])
+        else:
+            merged[key] = [x for p in parts for x in p[key]]
+    return merged
+
+
+_shard_owner_ids: list[str] = []
+
+
+def _init_owner_ids(owner_ids: list[str]) -> None:
+    # workerenként egyszer kapja meg a tulajdonosok listáját, nem shardonként
+    global _shard_owner_ids
+    _shard_owner_ids = owner_ids
+
+
+def _people_shard(args: tuple) -> dict:
+    start, size, seed, male_ratio, locale, unique, min_age, max_age = args
+    return generate_people_columns(size, male_ratio, locale, unique, min_age, max_age, seed, start)
+
+
+def _bicycles_shard(args: tuple) -> dict:
+    start, size, seed, ownership, zipf_s = args
+    return generate_bicycles_columns(size, _shard_owner_ids, seed, start, ownership, zipf_s)
+
+
+def _laptops_shard(args: tuple) -> dict:
+    start, size, seed, ownership, zipf_s = args
+    return generate_laptops_columns(size, _shard_owner_ids, seed, start, ownership, zipf_s)
+
+
+def _run_shards(func, tasks: list[tuple], workers: int | None, owner_ids: list[str] | None = None) -> dict:
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) == 1:
+        _init_owner_ids(owner_ids or [])
+        return _merge_columns([func(t) for t in tasks])
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init_owner_ids,
+                             initargs=(owner_ids or [],)) as executor:
+        # a map sorrendtartó, így az id-k folytonosak maradnak
+        return _merge_columns(list(executor.map(func, tasks)))
+
+
+def generate_people_parallel(n: int, male_ratio: float = 0.5,
+                             locale: str = "en_US",
+                             unique: bool = False,
+                             min_age: int = 0,
+                             max_age: int = 100,
+                             seed: int = 0,
+                             workers: int | None = None,
+                             shard_size: int = SHARD_SIZE,
+                             columns: bool = False) -> list[Person] | dict:
+    """Emberek generálása több processzben. Azonos seed mellett a kimenet
+    független a workerek számától."""
+    assert n > 0 and shard_size > 0
+    tasks = [(start, size, s, male_ratio, locale, unique, min_age, max_age)
+             for start, size, s in shard_plan(n, seed, shard_size)]
+    cols = _run_shards(_people_shard, tasks, workers)
+    return cols if columns else register(_people_from_columns(cols), Person)
+
+
+def generate_bicycles_parallel(n: int, people: list[Person],
+                               seed: int = 0,
+                               workers: int | None = None,
+                               shard_size: int = SHARD_SIZE,
+                               ownership: str = "uniform",
+                               zipf_s: float = own.ZIPF_S) -> list[Bicycle]:
+    """Kerékpárok generálása több processzben, kapcsolatokkal együtt."""
+    assert n > 0 and len(people) > 0 and shard_size > 0
+    tasks = [(start, size, s, ownership, zipf_s) for start, size, s in shard_plan(n, seed, shard_size)]
+    cols = _run_shards(_bicycles_shard, tasks, workers, [p.id for p in people])
+    return _bicycles_from_columns(cols, people)
+
+
+def generate_laptops_parallel(n: int, people: list[Person],
+                              seed: int = 0,
+                              workers: int | None = None,
+                              shard_size: int = SHARD_SIZE,
+                              ownership: str = "uniform",
+                              zipf_s: float = own.ZIPF_S) -> list[Laptop]:
+    """Laptopok generálása több processzben, kapcsolatokkal együtt."""
+    assert n > 0 and len(people) > 0 and shard_size > 0
+    tasks = [(start, size, s, ownership, zipf_s) for start, size, s in shard_plan(n, seed, shard_size)]
+    cols = _run_shards(_laptops_shard, tasks, workers, [p.id for p in people])
+    return _laptops_from_columns(cols, people)
+
+
+#  STREAMING (LUSTA) GENERÁLÁS
+def iter_people(n: int, male_ratio: float = 0.5,
+                locale: str = "en_US",
+                unique: bool = False,
+                min_age: int = 0,
+                max_age: int = 100,
+                seed: int = 0,
+                chunk_size: int = SHARD_SIZE) -> Iterator[Person]:
+    """Emberek egyenként, egyszerre csak egy chunk van a memóriában (a registry-be nem kerülnek).
+    Azonos seed és chunk_size mellett ugyanazt adja, mint a generate_people_parallel."""
+    assert n > 0 and chunk_size > 0
+    for start, size, s in shard_plan(n, seed, chunk_size):
+        yield from _people_from_columns(
+            generate_people_columns(size, male_ratio, locale, unique, min_age, max_age, s, start))
+
+
+def iter_bicycles(n: int, owner_ids: list[str] | int,
+                  seed: int = 0,
+                  chunk_size: int = SHARD_SIZE,
+                  ownership: str = "uniform",
+                  zipf_s: float = own.ZIPF_S) -> Iterator[Bicycle]:
+    """Kerékpárok egyenként; csak owner_id-t kapnak, Person objektumot nem."""
+    assert n > 0 and chunk_size > 0
+    for start, size, s in shard_plan(n, seed, chunk_size):
+        cols = generate_bicycles_columns(size, owner_ids, s, start, ownership, zipf_s)
+        yield from created(from_columns(Bicycle, cols["id"], cols["brand"].tolist(), cols["model"],
+                                        cols["year"].tolist(), cols["owner_id"]))
+
+
+def iter_laptops(n: int, owner_ids: list[str] | int,
+                 seed: int = 0,
+                 chunk_size: int = SHARD_SIZE,
+                 ownership: str = "uniform",
+                 zipf_s: float = own.ZIPF_S) -> Iterator[Laptop]:
+    """Laptopok egyenként; csak owner_id-t kapnak, Person objektumot nem."""
+    assert n > 0 and chunk_size > 0
+    for start, size, s in shard_plan(n, seed, chunk_size):
+        cols = generate_laptops_columns(size, owner_ids, s, start, ownership, zipf_s)
+        yield from created(from_columns(Laptop, cols["id"], cols["brand"].tolist(), cols["model"],
+                                        cols["year"].tolist(), cols["ram"].tolist(), cols["vram"].tolist(),
+                                        cols["owner_id"]))
+
+
+# ------------------- Tesztelés -------------------
+if __name__ == "__main__":
+    people = generate_people(50, male_ratio=0.5, min_age=18, max_age=60)
+    bicycles = generate_bicycles(30, people)
+    laptops = generate_laptops(30, people)
+
+    print("\n=== KAPCSOLATOK ===")
+    for p in people:
+        print(f"{p.name}:")
+        print("  Biciklik:", [b.model for b in p.bicycles])
+        print("  Laptopok:", [l.model for l in p.laptops])
+        print()
+
+    # Bulk mód
+    big = generate_people(100_000, bulk=True, seed=42)
+    big_laptops = generate_laptops(200_000, big, bulk=True, seed=42)
+    print("Bulk:", len(big), "ember,", len(big_laptops), "laptop")
+
+    # Párhuzamos mód: ugyanaz a seed -> ugyanaz a kimenet bármennyi workerrel
+    par = generate_people_parallel(300_000, seed=42, workers=4)
+    print("Párhuzamos:", par[0].id, "...", par[-1].id)
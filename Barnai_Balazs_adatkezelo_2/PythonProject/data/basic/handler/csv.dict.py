@@ -1,116 +1,182 @@
-import csv
-import os
-from basic import generator
-from basic.model_dataclasses import Person, Bicycle, Laptop
-
-
-#  CSV ÍRÁS
-
-def write_people(people: list[Person],
-                 path: str,
-                 file_name: str = "people_dict.csv",
-                 delimiter: str = ";") -> None:
-    """Emberek írása CSV-be (fejléc + adatok)"""
-    os.makedirs(path, exist_ok=True)
-    with open(os.path.join(path, file_name), "w", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=["id", "name", "age", "male"], delimiter=delimiter)
-        writer.writeheader()
-        for p in people:
-            writer.writerow({
-                "id": p.id,
-                "name": p.name,
-                "age": p.age,
-                "male": p.male
-            })
-
-
-def write_bicycles(bicycles: list[Bicycle],
-                   path: str,
-                   file_name: str = "bicycles_dict.csv",
-                   delimiter: str = ";") -> None:
-    """Biciklik írása CSV-be"""
-    os.makedirs(path, exist_ok=True)
-    with open(os.path.join(path, file_name), "w", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=["id", "brand", "model", "year", "owner_id"], delimiter=delimiter)
-        writer.writeheader()
-        for b in bicycles:
-            writer.writerow({
-                "id": b.id,
-                "brand": b.brand,
-                "model": b.model,
-                "year": b.year,
-                "owner_id": b.owner_id
-            })
-
-
-def write_laptops(laptops: list[Laptop],
-                  path: str,
-                  file_name: str = "laptops_dict.csv",
-                  delimiter: str = ";") -> None:
-    """Laptopok írása CSV-be"""
-    os.makedirs(path, exist_ok=True)
-    with open(os.path.join(path, file_name), "w", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=["id", "brand", "model", "year", "ram", "vram", "owner_id"], delimiter=delimiter)
-        writer.writeheader()
-        for l in laptops:
-            writer.writerow({
-                "id": l.id,
-                "brand": l.brand,
-                "model": l.model,
-                "year": l.year,
-                "ram": l.ram,
-                "vram": l.vram,
-                "owner_id": l.owner_id
-            })
-
-
-# OLVASÁS
-def read_people(path: str, file_name: str = "people_dict.csv", delimiter: str = ";") -> list[Person]:
-    with open(os.path.join(path, file_name), encoding="utf-8") as file:
-        reader = csv.DictReader(file, delimiter=delimiter)
-        return [Person(row["id"], row["name"], int(row["age"]), row["male"] == "True") for row in reader]
-
-
-def read_bicycles(path: str, file_name: str = "bicycles_dict.csv", delimiter: str = ";") -> list[Bicycle]:
-    with open(os.path.join(path, file_name), encoding="utf-8") as file:
-        reader = csv.DictReader(file, delimiter=delimiter)
-        return [Bicycle(row["id"], row["brand"], row["model"], int(row["year"]), row["owner_id"]) for row in reader]
-
-
-def read_laptops(path: str, file_name: str = "laptops_dict.csv", delimiter: str = ";") -> list[Laptop]:
-    with open(os.path.join(path, file_name), encoding="utf-8") as file:
-        reader = csv.DictReader(file, delimiter=delimiter)
-        return [Laptop(row["id"], row["brand"], row["model"], int(row["year"]),
-                       int(row["ram"]), int(row["vram"]), row["owner_id"]) for row in reader]
-
-
-#  TESZT FUTTATÁS
-if __name__ == "__main__":
-    save_path = "C:/hallgato"
-    os.makedirs(save_path, exist_ok=True)
-
-    # Adatgenerálás
-    people = generator.generate_people(50)
-    bicycles = generator.generate_bicycles(30, people)
-    laptops = generator.generate_laptops(30, people)
-
-    # Mentés CSV-be
-    write_people(people, save_path)
-    write_bicycles(bicycles, save_path)
-    write_laptops(laptops, save_path)
-
-    # Visszaolvasás
-    people_read = read_people(save_path)
-    bicycles_read = read_bicycles(save_path)
-    laptops_read = read_laptops(save_path)
-
-    #  Kapcsolatok kiírása
-    print("\n=== PEOPLE & THEIR ITEMS ===")
-    for person in people_read:
-        # hozzárendelt biciklik és laptopok (owner_id alapján)
-        person_bikes = [b.model for b in bicycles_read if b.owner_id == person.id]
-        person_laptops = [l.model for l in laptops_read if l.owner_id == person.id]
-
-        print(f"{person.name}:")
-        print("  Biciklik:", person_bikes if person_bikes else "[]")
-        print("  Laptopok:", person_laptops if person_laptops else "[]")
+import csv
+import os
+from collections.abc import Iterable, Iterator, Sequence
+from basic import csv_common, generator
+from basic.changes import ChangeSet, UPSERT, delta_name
+from basic.csv_common import WRITE_BUFFER
+from basic.model_dataclasses import Person, Bicycle, Laptop
+from basic.schema import codec
+
+# típus -> alap fájlnév (a delta fájlokhoz)
+_FILE_NAMES = {Person: "people_dict.csv", Bicycle: "bicycles_dict.csv", Laptop: "laptops_dict.csv"}
+_ENCODING = "utf-8"
+
+
+#  CSV ÍRÁS
+
+def write_people(people: Iterable[Person],
+                 path: str,
+                 file_name: str = "people_dict.csv",
+                 delimiter: str = ";",
+                 buffer_size: int = WRITE_BUFFER,
+                 no_quoting: bool = False) -> None:
+    csv_common.write_entities(Person, people, path, file_name, delimiter, buffer_size, no_quoting, _ENCODING)
+
+
+def write_bicycles(bicycles: Iterable[Bicycle],
+                   path: str,
+                   file_name: str = "bicycles_dict.csv",
+                   delimiter: str = ";",
+                   buffer_size: int = WRITE_BUFFER,
+                   no_quoting: bool = False) -> None:
+    csv_common.write_entities(Bicycle, bicycles, path, file_name, delimiter, buffer_size, no_quoting, _ENCODING)
+
+
+def write_laptops(laptops: Iterable[Laptop],
+                  path: str,
+                  file_name: str = "laptops_dict.csv",
+                  delimiter: str = ";",
+                  buffer_size: int = WRITE_BUFFER,
+                  no_quoting: bool = False) -> None:
+    csv_common.write_entities(Laptop, laptops, path, file_name, delimiter, buffer_size, no_quoting, _ENCODING)
+
+
+# OLVASÁS
+def iter_people(path: str,
+                file_name: str = "people_dict.csv",
+                delimiter: str = ";",
+                chunk_size: int | None = None,
+                columns: Sequence[str] | None = None) -> Iterator:
+    """Streaming olvasás, lásd csv_common.iter_entities."""
+    return _iter_entities(Person, path, file_name, delimiter, chunk_size, columns)
+
+
+def iter_bicycles(path: str,
+                  file_name: str = "bicycles_dict.csv",
+                  delimiter: str = ";",
+                  chunk_size: int | None = None,
+                  columns: Sequence[str] | None = None) -> Iterator:
+    return _iter_entities(Bicycle, path, file_name, delimiter, chunk_size, columns)
+
+
+def iter_laptops(path: str,
+                 file_name: str = "laptops_dict.csv",
+                 delimiter: str = ";",
+                 chunk_size: int | None = None,
+                 columns: Sequence[str] | None = None) -> Iterator:
+    return _iter_entities(Laptop, path, file_name, delimiter, chunk_size, columns)
+
+
+def read_people(path: str, file_name: str = "people_dict.csv", delimiter: str = ";",
+                columns: Sequence[str] | None = None) -> list:
+    return csv_common.read_entities(Person, path, file_name, delimiter, columns, _ENCODING, _read_delta)
+
+
+def read_bicycles(path: str, file_name: str = "bicycles_dict.csv", delimiter: str = ";",
+                  columns: Sequence[str] | None = None) -> list:
+    return csv_common.read_entities(Bicycle, path, file_name, delimiter, columns, _ENCODING, _read_delta)
+
+
+def read_laptops(path: str, file_name: str = "laptops_dict.csv", delimiter: str = ";",
+                 columns: Sequence[str] | None = None) -> list:
+    return csv_common.read_entities(Laptop, path, file_name, delimiter, columns, _ENCODING, _read_delta)
+
+
+def _iter_entities(entity_type: type,
+                   path: str,
+                   file_name: str,
+                   delimiter: str,
+                   chunk_size: int | None,
+                   columns: Sequence[str] | None) -> Iterator:
+    return csv_common.iter_entities(entity_type, path, file_name, delimiter, chunk_size, columns,
+                                    _ENCODING, _read_delta)
+
+
+def read_columns(entity_type: type,
+                 path: str,
+                 columns: Sequence[str] | None = None,
+                 file_name: str | None = None,
+                 delimiter: str = ";") -> dict[str, list]:
+    return csv_common.read_columns(entity_type, path, file_name or _FILE_NAMES[entity_type], columns,
+                                   delimiter, _ENCODING, _read_delta)
+
+
+#  PÁRHUZAMOS OLVASÁS
+def read_parallel(entity_type: type,
+                  path: str,
+                  file_name: str | None = None,
+                  delimiter: str = ";",
+                  workers: int | None = None) -> list:
+    return csv_common.read_parallel(entity_type, path, file_name or _FILE_NAMES[entity_type], delimiter,
+                                    workers, _ENCODING, _read_delta)
+
+
+# VÁLTOZÁSOK (DELTA)
+def write_changes(changes: ChangeSet,
+                  path: str,
+                  delimiter: str = ";",
+                  file_names: dict[type, str] | None = None) -> int:
+    """Csak a változott sorok hozzáfűzése a <fájl>.delta.csv fájlokhoz ("op" oszlop:
+    U = új / módosult, D = törölt). A read_* alkalmazza őket, a teljes write_* után törlődnek."""
+    os.makedirs(path, exist_ok=True)
+    written = 0
+    for entity_type, default_name in _FILE_NAMES.items():
+        records = list(changes.records(entity_type))
+        if not records:
+            continue
+        full_path = os.path.join(path, delta_name((file_names or {}).get(entity_type, default_name)))
+        row_codec = codec(entity_type)
+        new_file = not os.path.exists(full_path)
+        # törlésnél csak az id: a többi mező üres, mint a DictWriter hiányzó kulcsainál
+        blank = ("",) * (len(row_codec.fields) - 1)
+        to_tuple = row_codec.to_tuple
+        with open(full_path, "a", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file, delimiter=delimiter)
+            if new_file:
+                writer.writerow(["op", *row_codec.fields])
+            writer.writerows((op, *to_tuple(e)) if op == UPSERT else (op, e.id, *blank) for op, e in records)
+        written += len(records)
+        changes.clear(entity_type)
+    return written
+
+
+def _read_delta(path: str, file_name: str, delimiter: str, entity_type: type) -> list[tuple]:
+    full_path = os.path.join(path, delta_name(file_name))
+    if not os.path.exists(full_path):
+        return []
+    parse = codec(entity_type).from_dict
+    with open(full_path, newline="", encoding="utf-8") as file:
+        return [(row["op"], row["id"], parse(row) if row["op"] == UPSERT else None)
+                for row in csv.DictReader(file, delimiter=delimiter)]
+
+
+#  TESZT FUTTATÁS
+if __name__ == "__main__":
+    save_path = "C:/hallgato"
+    os.makedirs(save_path, exist_ok=True)
+
+    # Adatgenerálás
+    people = generator.generate_people(50)
+    bicycles = generator.generate_bicycles(30, people)
+    laptops = generator.generate_laptops(30, people)
+
+    # Mentés CSV-be
+    write_people(people, save_path)
+    write_bicycles(bicycles, save_path)
+    write_laptops(laptops, save_path)
+
+    # Visszaolvasás
+    people_read = read_people(save_path)
+    bicycles_read = read_bicycles(save_path)
+    laptops_read = read_laptops(save_path)
+
+    #  Kapcsolatok kiírása
+    print("\n=== PEOPLE & THEIR ITEMS ===")
+    for person in people_read:
+        # hozzárendelt biciklik és laptopok (owner_id alapján)
+        person_bikes = [b.model for b in bicycles_read if b.owner_id == person.id]
+        person_laptops = [l.model for l in laptops_read if l.owner_id == person.id]
+
+        print(f"{person.name}:")
+        print("  Biciklik:", person_bikes if person_bikes else "[]")
+        print("  Laptopok:", person_laptops if person_laptops else "[]")
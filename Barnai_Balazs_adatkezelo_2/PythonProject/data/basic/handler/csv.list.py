@@ -1,153 +1,220 @@
-import csv
-import os
-from typing import Type
-from basic import generator
-from basic.model_dataclasses import Person, Bicycle, Laptop
-
-
-#  KAPCSOLATOK
-def link_people_with_items(people: list[Person],
-                           bicycles: list[Bicycle],
-                           laptops: list[Laptop]) -> None:
-
-    people_by_id = {p.id: p for p in people}
-
-    for b in bicycles:
-        owner = people_by_id.get(b.owner_id)
-        if owner:
-            b.owner = owner
-            owner.bicycles.append(b)
-
-    for l in laptops:
-        owner = people_by_id.get(l.owner_id)
-        if owner:
-            l.owner = owner
-            owner.laptops.append(l)
-
-
-#  PERSON
-def write_people(people: list[Person],
-                 path: str,
-                 file_name: str = "people_csv_list.csv",
-                 delimiter: str = ";") -> None:
-    os.makedirs(path, exist_ok=True)
-    with open(os.path.join(path, file_name), "w", newline="") as file:
-        writer = csv.writer(file, delimiter=delimiter)
-        #  fejlécsor
-        writer.writerow(["id", "name", "age", "male"])
-        for person in people:
-            writer.writerow([person.id, person.name, person.age, person.male])
-
-
-def read_people(path: str,
-                file_name: str = "people_csv_list.csv",
-                delimiter: str = ";") -> list[Person]:
-    with open(os.path.join(path, file_name), newline="") as file:
-        rows = csv.reader(file, delimiter=delimiter)
-        next(rows)  #  fejléc átugrása
-        return [Person(r[0], r[1], int(r[2]), r[3].lower() in ("true", "1", "yes", "t")) for r in rows]
-
-
-#  BICYCLE
-def write_bicycles(bicycles: list[Bicycle],
-                   path: str,
-                   file_name: str = "bicycles_csv_list.csv",
-                   delimiter: str = ";") -> None:
-    os.makedirs(path, exist_ok=True)
-    with open(os.path.join(path, file_name), "w", newline="") as file:
-        writer = csv.writer(file, delimiter=delimiter)
-        #  fejléc
-        writer.writerow(["id", "brand", "model", "year", "owner_id"])
-        for b in bicycles:
-            writer.writerow([b.id, b.brand, b.model, b.year, b.owner_id])
-
-
-def read_bicycles(path: str,
-                  file_name: str = "bicycles_csv_list.csv",
-                  delimiter: str = ";") -> list[Bicycle]:
-    with open(os.path.join(path, file_name), newline="") as file:
-        rows = csv.reader(file, delimiter=delimiter)
-        next(rows)  #  fejléc átugrása
-        return [Bicycle(r[0], r[1], r[2], int(r[3]), r[4]) for r in rows]
-
-
-#  LAPTOP
-def write_laptops(laptops: list[Laptop],
-                  path: str,
-                  file_name: str = "laptops_csv_list.csv",
-                  delimiter: str = ";") -> None:
-    os.makedirs(path, exist_ok=True)
-    with open(os.path.join(path, file_name), "w", newline="") as file:
-        writer = csv.writer(file, delimiter=delimiter)
-        #  fejléc
-        writer.writerow(["id", "brand", "model", "year", "ram", "vram", "owner_id"])
-        for l in laptops:
-            writer.writerow([l.id, l.brand, l.model, l.year, l.ram, l.vram, l.owner_id])
-
-
-def read_laptops(path: str,
-                 file_name: str = "laptops_csv_list.csv",
-                 delimiter: str = ";") -> list[Laptop]:
-    with open(os.path.join(path, file_name), newline="") as file:
-        rows = csv.reader(file, delimiter=delimiter)
-        next(rows)  #  fejléc átugrása
-        return [Laptop(r[0], r[1], r[2], int(r[3]), int(r[4]), int(r[5]), r[6]) for r in rows]
-
-
-#  KÖZVETÍTŐ FÜGGVÉNYEK
-def write(entities: list[object],
-          path: str,
-          file_name: str | None = None,
-          delimiter: str = ";") -> None:
-    if not entities:
-        raise ValueError("Empty entity list")
-
-    entity_type = type(entities[0])
-    if entity_type is Person:
-        write_people(entities, path, file_name or "people_csv_list.csv", delimiter)
-    elif entity_type is Bicycle:
-        write_bicycles(entities, path, file_name or "bicycles_csv_list.csv", delimiter)
-    elif entity_type is Laptop:
-        write_laptops(entities, path, file_name or "laptops_csv_list.csv", delimiter)
-    else:
-        raise TypeError(f"Unknown entity type: {entity_type}")
-
-
-def read(entity_type: Type[object],
-         path: str,
-         file_name: str | None = None,
-         delimiter: str = ";") -> list[object]:
-    if entity_type is Person:
-        return read_people(path, file_name or "people_csv_list.csv", delimiter)
-    elif entity_type is Bicycle:
-        return read_bicycles(path, file_name or "bicycles_csv_list.csv", delimiter)
-    elif entity_type is Laptop:
-        return read_laptops(path, file_name or "laptops_csv_list.csv", delimiter)
-    else:
-        raise TypeError(f"Unknown entity type: {entity_type}")
-
-
-#  TESZT FUTTATÁS
-if __name__ == "__main__":
-    save_path = "C:/hallgato"
-
-    people = generator.generate_people(50)
-    bicycles = generator.generate_bicycles(30, people)
-    laptops = generator.generate_laptops(30, people)
-
-    link_people_with_items(people, bicycles, laptops)
-
-    write(people, save_path)
-    write(bicycles, save_path)
-    write(laptops, save_path)
-
-    people_read = read(Person, save_path)
-    bicycles_read = read(Bicycle, save_path)
-    laptops_read = read(Laptop, save_path)
-    link_people_with_items(people_read, bicycles_read, laptops_read)
-
-    print("\n=== PEOPLE & THEIR ITEMS ===")
-    for p in people_read:
-        print(f"{p.name}:")
-        print("  Biciklik:", [b.model for b in p.bicycles])
-        print("  Laptopok:", [l.model for l in p.laptops])
+import csv
+import os
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import chain
+from typing import Type
+from basic import csv_common, generator
+from basic.changes import ChangeSet, UPSERT, delta_name
+from basic.csv_common import WRITE_BUFFER
+from basic.linking import link
+from basic.model_dataclasses import Person, Bicycle, Laptop
+from basic.schema import codec
+
+
+# típus -> alap fájlnév (a delta fájlokhoz)
+_FILE_NAMES = {Person: "people_csv_list.csv", Bicycle: "bicycles_csv_list.csv", Laptop: "laptops_csv_list.csv"}
+# a fájlok a platform alapértelmezett kódolásával íródnak
+_ENCODING = None
+
+
+#  PERSON
+def write_people(people: Iterable[Person],
+                 path: str,
+                 file_name: str = "people_csv_list.csv",
+                 delimiter: str = ";",
+                 buffer_size: int = WRITE_BUFFER,
+                 no_quoting: bool = False) -> None:
+    csv_common.write_entities(Person, people, path, file_name, delimiter, buffer_size, no_quoting, _ENCODING)
+
+
+def iter_people(path: str,
+                file_name: str = "people_csv_list.csv",
+                delimiter: str = ";",
+                chunk_size: int | None = None,
+                columns: Sequence[str] | None = None) -> Iterator:
+    """Streaming olvasás, lásd csv_common.iter_entities."""
+    return _iter_entities(Person, path, file_name, delimiter, chunk_size, columns)
+
+
+def read_people(path: str,
+                file_name: str = "people_csv_list.csv",
+                delimiter: str = ";",
+                columns: Sequence[str] | None = None) -> list:
+    return csv_common.read_entities(Person, path, file_name, delimiter, columns, _ENCODING, _read_delta)
+
+
+#  BICYCLE
+def write_bicycles(bicycles: Iterable[Bicycle],
+                   path: str,
+                   file_name: str = "bicycles_csv_list.csv",
+                   delimiter: str = ";",
+                   buffer_size: int = WRITE_BUFFER,
+                   no_quoting: bool = False) -> None:
+    csv_common.write_entities(Bicycle, bicycles, path, file_name, delimiter, buffer_size, no_quoting, _ENCODING)
+
+
+def iter_bicycles(path: str,
+                  file_name: str = "bicycles_csv_list.csv",
+                  delimiter: str = ";",
+                  chunk_size: int | None = None,
+                  columns: Sequence[str] | None = None) -> Iterator:
+    return _iter_entities(Bicycle, path, file_name, delimiter, chunk_size, columns)
+
+
+def read_bicycles(path: str,
+                  file_name: str = "bicycles_csv_list.csv",
+                  delimiter: str = ";",
+                  columns: Sequence[str] | None = None) -> list:
+    return csv_common.read_entities(Bicycle, path, file_name, delimiter, columns, _ENCODING, _read_delta)
+
+
+#  LAPTOP
+def write_laptops(laptops: Iterable[Laptop],
+                  path: str,
+                  file_name: str = "laptops_csv_list.csv",
+                  delimiter: str = ";",
+                  buffer_size: int = WRITE_BUFFER,
+                  no_quoting: bool = False) -> None:
+    csv_common.write_entities(Laptop, laptops, path, file_name, delimiter, buffer_size, no_quoting, _ENCODING)
+
+
+def iter_laptops(path: str,
+                 file_name: str = "laptops_csv_list.csv",
+                 delimiter: str = ";",
+                 chunk_size: int | None = None,
+                 columns: Sequence[str] | None = None) -> Iterator:
+    return _iter_entities(Laptop, path, file_name, delimiter, chunk_size, columns)
+
+
+def read_laptops(path: str,
+                 file_name: str = "laptops_csv_list.csv",
+                 delimiter: str = ";",
+                 columns: Sequence[str] | None = None) -> list:
+    return csv_common.read_entities(Laptop, path, file_name, delimiter, columns, _ENCODING, _read_delta)
+
+
+def _iter_entities(entity_type: type,
+                   path: str,
+                   file_name: str,
+                   delimiter: str,
+                   chunk_size: int | None,
+                   columns: Sequence[str] | None) -> Iterator:
+    return csv_common.iter_entities(entity_type, path, file_name, delimiter, chunk_size, columns,
+                                    _ENCODING, _read_delta)
+
+
+#  OSZLOPOS ÉS PÁRHUZAMOS OLVASÁS
+def read_columns(entity_type: type,
+                 path: str,
+                 columns: Sequence[str] | None = None,
+                 file_name: str | None = None,
+                 delimiter: str = ";") -> dict[str, list]:
+    return csv_common.read_columns(entity_type, path, file_name or _FILE_NAMES[entity_type], columns,
+                                   delimiter, _ENCODING, _read_delta)
+
+
+def read_parallel(entity_type: type,
+                  path: str,
+                  file_name: str | None = None,
+                  delimiter: str = ";",
+                  workers: int | None = None) -> list:
+    return csv_common.read_parallel(entity_type, path, file_name or _FILE_NAMES[entity_type], delimiter,
+                                    workers, _ENCODING, _read_delta)
+
+
+#  VÁLTOZÁSOK (DELTA)
+def write_changes(changes: ChangeSet,
+                  path: str,
+                  delimiter: str = ";",
+                  file_names: dict[type, str] | None = None) -> int:
+    """Csak az utolsó mentés óta változott sorok hozzáfűzése a <fájl>.delta.csv fájlokhoz
+    (első oszlop: U = új / módosult, D = törölt). A read_* alkalmazza őket, a teljes
+    write_* után törlődnek. Visszaadja a kiírt sorok számát."""
+    os.makedirs(path, exist_ok=True)
+    written = 0
+    for entity_type, default_name in _FILE_NAMES.items():
+        records = list(changes.records(entity_type))
+        if not records:
+            continue
+        to_tuple = codec(entity_type).to_tuple
+        file_name = delta_name((file_names or {}).get(entity_type, default_name))
+        with open(os.path.join(path, file_name), "a", newline="") as file:
+            writer = csv.writer(file, delimiter=delimiter)
+            writer.writerows([op, *to_tuple(e)] if op == UPSERT else [op, e.id] for op, e in records)
+        written += len(records)
+        changes.clear(entity_type)
+    return written
+
+
+def _read_delta(path: str, file_name: str, delimiter: str, entity_type: type) -> list[tuple]:
+    full_path = os.path.join(path, delta_name(file_name))
+    if not os.path.exists(full_path):
+        return []
+    parse = codec(entity_type).from_row
+    with open(full_path, newline="") as file:
+        return [(r[0], r[1], parse(r[1:]) if r[0] == UPSERT else None)
+                for r in csv.reader(file, delimiter=delimiter)]
+
+
+#  KÖZVETÍTŐ FÜGGVÉNYEK
+def write(entities: Iterable[object],
+          path: str,
+          file_name: str | None = None,
+          delimiter: str = ";",
+          no_quoting: bool = False) -> None:
+    entities = iter(entities)
+    first = next(entities, None)
+    if first is None:
+        raise ValueError("Empty entity list")
+    # az első elemet visszafűzzük, így generátor is átadható
+    entities = chain([first], entities)
+
+    entity_type = type(first)
+    if entity_type is Person:
+        write_people(entities, path, file_name or "people_csv_list.csv", delimiter, no_quoting=no_quoting)
+    elif entity_type is Bicycle:
+        write_bicycles(entities, path, file_name or "bicycles_csv_list.csv", delimiter, no_quoting=no_quoting)
+    elif entity_type is Laptop:
+        write_laptops(entities, path, file_name or "laptops_csv_list.csv", delimiter, no_quoting=no_quoting)
+    else:
+        raise TypeError(f"Unknown entity type: {entity_type}")
+
+
+def read(entity_type: Type[object],
+         path: str,
+         file_name: str | None = None,
+         delimiter: str = ";") -> list[object]:
+    if entity_type is Person:
+        return read_people(path, file_name or "people_csv_list.csv", delimiter)
+    elif entity_type is Bicycle:
+        return read_bicycles(path, file_name or "bicycles_csv_list.csv", delimiter)
+    elif entity_type is Laptop:
+        return read_laptops(path, file_name or "laptops_csv_list.csv", delimiter)
+    else:
+        raise TypeError(f"Unknown entity type: {entity_type}")
+
+
+#  TESZT FUTTATÁS
+if __name__ == "__main__":
+    save_path = "C:/hallgato"
+
+    people = generator.generate_people(50)
+    bicycles = generator.generate_bicycles(30, people)
+    laptops = generator.generate_laptops(30, people)
+
+    link(people, bicycles, laptops)
+
+    write(people, save_path)
+    write(bicycles, save_path)
+    write(laptops, save_path)
+
+    people_read = read(Person, save_path)
+    bicycles_read = read(Bicycle, save_path)
+    laptops_read = read(Laptop, save_path)
+    print("Kapcsolatok:", link(people_read, bicycles_read, laptops_read))
+
+    print("\n=== PEOPLE & THEIR ITEMS ===")
+    for p in people_read:
+        print(f"{p.name}:")
+        print("  Biciklik:", [b.model for b in p.bicycles])
+        print("  Laptopok:", [l.model for l in p.laptops])
@@ -1,55 +1,77 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_pdf import PdfPages
-
-# --- 1. Excel beolvasása
-file_path = r"C:\hallgato\data_xlsx.xlsx"
-df = pd.read_excel(file_path, sheet_name="laptops")
-
-# --- 2. Átlagos RAM és VRAM gyártónként
-avg_ram = df.groupby("brand")["ram"].mean()
-avg_vram = df.groupby("brand")["vram"].mean()
-
-# --- 3. Laptop darabszám gyártónként
-count_by_brand = df["brand"].value_counts()
-
-# --- PDF fájl
-pdf_path = r"C:\hallgato\laptop_diagrams.pdf"
-
-
-with PdfPages(pdf_path) as pdf:
-
-    # --- RAM oszlopdiagram
-    plt.figure(figsize=(10, 6))
-    avg_ram.plot(kind="bar")
-    plt.title("Átlagos RAM gyártónként (GB)")
-    plt.xlabel("Gyártó")
-    plt.ylabel("Átlagos RAM (GB)")
-    plt.tight_layout()
-    pdf.savefig()
-    plt.close()
-
-    # --- VRAM SÁVDIAGRAM
-    plt.figure(figsize=(10, 6))
-    avg_vram.plot(kind="barh")
-    plt.title("Átlagos VRAM gyártónként (GB)")
-    plt.xlabel("Átlagos VRAM (GB)")
-    plt.ylabel("Gyártó")
-    plt.tight_layout()
-    pdf.savefig()
-    plt.close()
-
-    # --- Kördiagram
-    plt.figure(figsize=(8, 8))
-    plt.pie(
-        count_by_brand,
-        labels=count_by_brand.index,
-        autopct="%1.1f%%",
-        startangle=90
-    )
-    plt.title("Laptopok darabszáma gyártónként")
-    plt.tight_layout()
-    pdf.savefig()
-    plt.close()
-
-print("PDF diagramok sikeresen elkészítve:", pdf_path)
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_pdf import PdfPages
+from basic.query import Query
+
+
+#  RIPORT (memóriában lévő adatokból, Excel nélkül)
+def laptop_report(laptops) -> dict[str, list]:
+    """Gyártónként darabszám, átlagos RAM és VRAM.
+    laptops: Laptop lista, EntityTable vagy oszlopok dict-je (pl. DataFrame.to_dict("list"))."""
+    if isinstance(laptops, list):
+        query = Query(laptops, fields=("brand", "ram", "vram"))
+    else:
+        query = Query(laptops)
+    return (query.group_by("brand")
+                 .agg(count=("brand", "count"), avg_ram=("ram", "mean"), avg_vram=("vram", "mean"))
+                 .order_by("brand")
+                 .to_columns())
+
+
+def save_diagrams(report: dict[str, list], pdf_path: str) -> None:
+    with PdfPages(pdf_path) as pdf:
+
+        # --- RAM oszlopdiagram
+        plt.figure(figsize=(10, 6))
+        plt.bar(report["brand"], report["avg_ram"])
+        plt.title("Átlagos RAM gyártónként (GB)")
+        plt.xlabel("Gyártó")
+        plt.ylabel("Átlagos RAM (GB)")
+        plt.tight_layout()
+        pdf.savefig()
+        plt.close()
+
+        # --- VRAM SÁVDIAGRAM
+        plt.figure(figsize=(10, 6))
+        plt.barh(report["brand"], report["avg_vram"])
+        plt.title("Átlagos VRAM gyártónként (GB)")
+        plt.xlabel("Átlagos VRAM (GB)")
+        plt.ylabel("Gyártó")
+        plt.tight_layout()
+        pdf.savefig()
+        plt.close()
+
+        # --- Kördiagram (darabszám szerint csökkenő sorrendben, mint a value_counts)
+        by_count = sorted(range(len(report["count"])), key=lambda i: -report["count"][i])
+        plt.figure(figsize=(8, 8))
+        plt.pie(
+            [report["count"][i] for i in by_count],
+            labels=[report["brand"][i] for i in by_count],
+            autopct="%1.1f%%",
+            startangle=90
+        )
+        plt.title("Laptopok darabszáma gyártónként")
+        plt.tight_layout()
+        pdf.savefig()
+        plt.close()
+
+
+#  TESZT FUTTATÁS
+if __name__ == "__main__":
+    import sys
+    from basic import generator
+
+    # --- PDF fájl
+    pdf_path = r"C:\hallgato\laptop_diagrams.pdf"
+
+    if "--generated" in sys.argv[1:]:
+        # generált adatokból, munkafüzet nélkül (pl. nagy adatmennyiség kipróbálására)
+        people = generator.generate_people(1000, bulk=True)
+        report = laptop_report(generator.generate_laptops(100_000, people, bulk=True))
+    else:
+        # --- 1. Excel beolvasása (a kiírt munkafüzet laptops lapja)
+        import pandas as pd
+        df = pd.read_excel(r"C:\hallgato\data_xlsx.xlsx", sheet_name="laptops")
+        report = laptop_report(df[["brand", "ram", "vram"]].to_dict("list"))
+
+    save_diagrams(report, pdf_path)
+    print("PDF diagramok sikeresen elkészítve:", pdf_path)
@@ -1,211 +1,235 @@
-import json
-import os
-from typing import Type
-from basic import generator
-from basic.model_dataclasses import Person, Bicycle, Laptop
-
-
-#  KAPCSOLATOK
-def link_people_with_items(people: list[Person],
-                           bicycles: list[Bicycle],
-                           laptops: list[Laptop]) -> None:
-    """Beállítja a kapcsolatokat."""
-    people_by_id = {p.id: p for p in people}
-
-    # Biciklik hozzárendelése tulajdonoshoz
-    for b in bicycles:
-        owner = people_by_id.get(b.owner_id)
-        if owner:
-            b.owner = owner
-            owner.bicycles.append(b)
-
-    # Laptopok hozzárendelése tulajdonoshoz
-    for l in laptops:
-        owner = people_by_id.get(l.owner_id)
-        if owner:
-            l.owner = owner
-            owner.laptops.append(l)
-
-
-#  ÍRÁS / OLVASÁS
-def write_people(people: list[Person],
-                 path: str,
-                 file_name: str | None = None,
-                 extension: str | None = None,
-                 pretty: bool = True) -> None:
-    file_name = file_name or "people"
-    extension = extension or ".json"
-    full_path = os.path.join(path, file_name + extension)
-
-    os.makedirs(path, exist_ok=True)
-
-    with open(full_path, "w", encoding="utf-8") as file:
-        data = [p.__dict__.copy() for p in people]
-        for d in data:
-            d.pop("bicycles", None)
-            d.pop("laptops", None)
-        json.dump(data, file, indent=2 if pretty else None, ensure_ascii=False)
-
-
-def read_people(path: str,
-                file_name: str | None = None,
-                extension: str | None = None) -> list[Person]:
-    file_name = file_name or "people"
-    extension = extension or ".json"
-    full_path = os.path.join(path, file_name + extension)
-
-    with open(full_path, encoding="utf-8") as file:
-        objects = json.load(file)
-        return [Person(obj["id"], obj["name"], int(obj["age"]), obj["male"]) for obj in objects]
-
-
-def write_bicycles(bicycles: list[Bicycle],
-                   path: str,
-                   file_name: str | None = None,
-                   extension: str | None = None,
-                   pretty: bool = True) -> None:
-    file_name = file_name or "bicycles"
-    extension = extension or ".json"
-    full_path = os.path.join(path, file_name + extension)
-
-    os.makedirs(path, exist_ok=True)
-
-    with open(full_path, "w", encoding="utf-8") as file:
-        data = [b.__dict__.copy() for b in bicycles]
-        for d in data:
-            if not isinstance(d["owner_id"], str):
-                d["owner_id"] = d["owner"].id if d["owner"] else None
-            d.pop("owner", None)
-        json.dump(data, file, indent=2 if pretty else None, ensure_ascii=False)
-
-
-def read_bicycles(path: str,
-                  file_name: str | None = None,
-                  extension: str | None = None) -> list[Bicycle]:
-    file_name = file_name or "bicycles"
-    extension = extension or ".json"
-    full_path = os.path.join(path, file_name + extension)
-
-    with open(full_path, encoding="utf-8") as file:
-        objects = json.load(file)
-        return [
-            Bicycle(
-                obj["id"],
-                obj["brand"],
-                obj["model"],
-                int(obj["year"]),
-                obj["owner_id"]
-            ) for obj in objects
-        ]
-
-
-def write_laptops(laptops: list[Laptop],
-                  path: str,
-                  file_name: str | None = None,
-                  extension: str | None = None,
-                  pretty: bool = True) -> None:
-    file_name = file_name or "laptops"
-    extension = extension or ".json"
-    full_path = os.path.join(path, file_name + extension)
-
-    os.makedirs(path, exist_ok=True)
-
-    with open(full_path, "w", encoding="utf-8") as file:
-        data = [l.__dict__.copy() for l in laptops]
-        for d in data:
-            if not isinstance(d["owner_id"], str):
-                d["owner_id"] = d["owner"].id if d["owner"] else None
-            d.pop("owner", None)
-        json.dump(data, file, indent=2 if pretty else None, ensure_ascii=False)
-
-
-def read_laptops(path: str,
-                 file_name: str | None = None,
-                 extension: str | None = None) -> list[Laptop]:
-    file_name = file_name or "laptops"
-    extension = extension or ".json"
-    full_path = os.path.join(path, file_name + extension)
-
-    with open(full_path, encoding="utf-8") as file:
-        objects = json.load(file)
-        return [
-            Laptop(
-                obj["id"],
-                obj["brand"],
-                obj["model"],
-                int(obj["year"]),
-                int(obj["ram"]),
-                int(obj["vram"]),
-                obj["owner_id"]
-            ) for obj in objects
-        ]
-
-
-#  KÖZVETÍTŐ
-def write(entities: list[object],
-          path: str,
-          file_name: str | None = None,
-          extension: str | None = None,
-          pretty: bool = True) -> None:
-    if not entities:
-        return
-
-    extension = extension or ".json"
-    first = entities[0]
-
-    if isinstance(first, Person):
-        write_people(entities, path, file_name, extension, pretty)
-    elif isinstance(first, Bicycle):
-        write_bicycles(entities, path, file_name, extension, pretty)
-    elif isinstance(first, Laptop):
-        write_laptops(entities, path, file_name, extension, pretty)
-    else:
-        raise TypeError(f"Nem ismert típus: {type(first)}")
-
-
-def read(entity_type: Type[object],
-         path: str,
-         file_name: str | None = None,
-         extension: str | None = None) -> list[object]:
-    if entity_type == Person:
-        return read_people(path, file_name, extension)
-    elif entity_type == Bicycle:
-        return read_bicycles(path, file_name, extension)
-    elif entity_type == Laptop:
-        return read_laptops(path, file_name, extension)
-    else:
-        raise TypeError(f"Nem ismert típus: {entity_type}")
-
-
-# TESZT FUTTATÁS
-if __name__ == "__main__":
-    path = "C:/hallgato"
-
-    # Generálás
-    people = generator.generate_people(50)
-    bicycles = generator.generate_bicycles(30, people)
-    laptops = generator.generate_laptops(30, people)
-
-    # Kapcsolatok
-    link_people_with_items(people, bicycles, laptops)
-
-    # Mentés
-    write(people, path)
-    write(bicycles, path)
-    write(laptops, path)
-
-    # Olvasás
-    people_read = read(Person, path)
-    bicycles_read = read(Bicycle, path)
-    laptops_read = read(Laptop, path)
-
-    # Kapcsolatok
-    link_people_with_items(people_read, bicycles_read, laptops_read)
-
-    # Ellenőrzés
-    print("\n=== PEOPLE AND THEIR ITEMS ===")
-    for p in people_read:
-        print(f"{p.name} ({p.id})")
-        print("  Bicycles:", [b.model for b in p.bicycles])
-        print("  Laptops:", [l.model for l in p.laptops])
-        print()
+import json
+import os
+from collections.abc import Iterable, Iterator
+from itertools import chain
+from typing import Type
+from basic import generator
+from basic.changes import ChangeSet, UPSERT, apply_delta, drop_delta
+from basic.linking import link
+from basic.model_dataclasses import Person, Bicycle, Laptop
+from basic.registry import register
+from basic.schema import codec
+
+
+#  STREAMING JSON ÍRÁS
+def _dump_list(records: Iterable[dict], file, pretty: bool = True) -> None:
+    """JSON tömb kiírása elemenként (ugyanaz a kimenet, mint a json.dump-é),
+    így a teljes lista sosem áll elő a memóriában."""
+    first = True
+    for record in records:
+        if pretty:
+            text = json.dumps(record, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+            file.write(("[\n  " if first else ",\n  ") + text)
+        else:
+            file.write(("[" if first else ", ") + json.dumps(record, ensure_ascii=False))
+        first = False
+    file.write("[]" if first else ("\n]" if pretty else "]"))
+
+
+def _item_records(items: Iterable[Bicycle | Laptop], entity_type: type) -> Iterator[dict]:
+    to_dict = codec(entity_type, "json").to_dict
+    for item in items:
+        d = to_dict(item)
+        if d["owner_id"] is None:
+            owner = getattr(item, "owner", None)
+            d["owner_id"] = owner.id if owner else None
+        yield d
+
+
+
+#  ÍRÁS / OLVASÁS
+def write_people(people: Iterable[Person],
+                 path: str,
+                 file_name: str | None = None,
+                 extension: str | None = None,
+                 pretty: bool = True) -> None:
+    file_name = file_name or "people"
+    extension = extension or ".json"
+    full_path = os.path.join(path, file_name + extension)
+
+    os.makedirs(path, exist_ok=True)
+
+    with open(full_path, "w", encoding="utf-8") as file:
+        _dump_list(map(codec(Person, "json").to_dict, people), file, pretty)
+    # teljes mentés: a korábbi változások már benne vannak
+    drop_delta(_delta_path(path, file_name))
+
+
+def read_people(path: str,
+                file_name: str | None = None,
+                extension: str | None = None) -> list[Person]:
+    file_name = file_name or "people"
+    extension = extension or ".json"
+    full_path = os.path.join(path, file_name + extension)
+
+    with open(full_path, encoding="utf-8") as file:
+        people = codec(Person, "json").from_dicts(json.load(file))
+    return register(apply_delta(people, _read_delta(path, file_name, Person)))
+
+
+def write_bicycles(bicycles: Iterable[Bicycle],
+                   path: str,
+                   file_name: str | None = None,
+                   extension: str | None = None,
+                   pretty: bool = True) -> None:
+    file_name = file_name or "bicycles"
+    extension = extension or ".json"
+    full_path = os.path.join(path, file_name + extension)
+
+    os.makedirs(path, exist_ok=True)
+
+    with open(full_path, "w", encoding="utf-8") as file:
+        _dump_list(_item_records(bicycles, Bicycle), file, pretty)
+    drop_delta(_delta_path(path, file_name))
+
+
+def read_bicycles(path: str,
+                  file_name: str | None = None,
+                  extension: str | None = None) -> list[Bicycle]:
+    file_name = file_name or "bicycles"
+    extension = extension or ".json"
+    full_path = os.path.join(path, file_name + extension)
+
+    with open(full_path, encoding="utf-8") as file:
+        bicycles = codec(Bicycle, "json").from_dicts(json.load(file))
+    return register(apply_delta(bicycles, _read_delta(path, file_name, Bicycle)))
+
+
+def write_laptops(laptops: Iterable[Laptop],
+                  path: str,
+                  file_name: str | None = None,
+                  extension: str | None = None,
+                  pretty: bool = True) -> None:
+    file_name = file_name or "laptops"
+    extension = extension or ".json"
+    full_path = os.path.join(path, file_name + extension)
+
+    os.makedirs(path, exist_ok=True)
+
+    with open(full_path, "w", encoding="utf-8") as file:
+        _dump_list(_item_records(laptops, Laptop), file, pretty)
+    drop_delta(_delta_path(path, file_name))
+
+
+def read_laptops(path: str,
+                 file_name: str | None = None,
+                 extension: str | None = None) -> list[Laptop]:
+    file_name = file_name or "laptops"
+    extension = extension or ".json"
+    full_path = os.path.join(path, file_name + extension)
+
+    with open(full_path, encoding="utf-8") as file:
+        laptops = codec(Laptop, "json").from_dicts(json.load(file))
+    return register(apply_delta(laptops, _read_delta(path, file_name, Laptop)))
+
+
+#  VÁLTOZÁSOK (DELTA, JSON Lines)
+_FILE_NAMES = {Person: "people", Bicycle: "bicycles", Laptop: "laptops"}
+
+
+def _delta_path(path: str, file_name: str) -> str:
+    return os.path.join(path, file_name + ".delta.jsonl")
+
+
+def write_changes(changes: ChangeSet,
+                  path: str,
+                  file_names: dict[type, str] | None = None) -> int:
+    """Csak a változott rekordok hozzáfűzése a <fájl>.delta.jsonl fájlokhoz, soronként egy
+    JSON objektum "op" kulccsal (U = új / módosult, D = törölt). A read_* alkalmazza őket,
+    a teljes write_* után törlődnek."""
+    os.makedirs(path, exist_ok=True)
+    written = 0
+    for entity_type, default_name in _FILE_NAMES.items():
+        records = list(changes.records(entity_type))
+        if not records:
+            continue
+        to_dict = codec(entity_type, "json").to_dict
+        with open(_delta_path(path, (file_names or {}).get(entity_type, default_name)), "a", encoding="utf-8") as file:
+            for op, e in records:
+                record = to_dict(e) if op == UPSERT else {"id": e.id}
+                file.write(json.dumps({"op": op, **record}, ensure_ascii=False) + "\n")
+        written += len(records)
+        changes.clear(entity_type)
+    return written
+
+
+def _read_delta(path: str, file_name: str, entity_type: type) -> list[tuple]:
+    full_path = _delta_path(path, file_name)
+    if not os.path.exists(full_path):
+        return []
+    parse = codec(entity_type, "json").from_dict
+    with open(full_path, encoding="utf-8") as file:
+        records = [json.loads(line) for line in file if line.strip()]
+    return [(r["op"], r["id"], parse(r) if r["op"] == UPSERT else None) for r in records]
+
+
+#  KÖZVETÍTŐ
+def write(entities: Iterable[object],
+          path: str,
+          file_name: str | None = None,
+          extension: str | None = None,
+          pretty: bool = True) -> None:
+    entities = iter(entities)
+    first = next(entities, None)
+    if first is None:
+        return
+    entities = chain([first], entities)
+
+    extension = extension or ".json"
+
+    if isinstance(first, Person):
+        write_people(entities, path, file_name, extension, pretty)
+    elif isinstance(first, Bicycle):
+        write_bicycles(entities, path, file_name, extension, pretty)
+    elif isinstance(first, Laptop):
+        write_laptops(entities, path, file_name, extension, pretty)
+    else:
+        raise TypeError(f"Nem ismert típus: {type(first)}")
+
+
+def read(entity_type: Type[object],
+         path: str,
+         file_name: str | None = None,
+         extension: str | None = None) -> list[object]:
+    if entity_type == Person:
+        return read_people(path, file_name, extension)
+    elif entity_type == Bicycle:
+        return read_bicycles(path, file_name, extension)
+    elif entity_type == Laptop:
+        return read_laptops(path, file_name, extension)
+    else:
+        raise TypeError(f"Nem ismert típus: {entity_type}")
+
+
+# TESZT FUTTATÁS
+if __name__ == "__main__":
+    path = "C:/hallgato"
+
+    # Generálás
+    people = generator.generate_people(50)
+    bicycles = generator.generate_bicycles(30, people)
+    laptops = generator.generate_laptops(30, people)
+
+    # Kapcsolatok
+    link(people, bicycles, laptops)
+
+    # Mentés
+    write(people, path)
+    write(bicycles, path)
+    write(laptops, path)
+
+    # Olvasás
+    people_read = read(Person, path)
+    bicycles_read = read(Bicycle, path)
+    laptops_read = read(Laptop, path)
+
+    # Kapcsolatok
+    print("Kapcsolatok:", link(people_read, bicycles_read, laptops_read))
+
+    # Ellenőrzés
+    print("\n=== PEOPLE AND THEIR ITEMS ===")
+    for p in people_read:
+        print(f"{p.name} ({p.id})")
+        print("  Bicycles:", [b.model for b in p.bicycles])
+        print("  Laptops:", [l.model for l in p.laptops])
+        print()
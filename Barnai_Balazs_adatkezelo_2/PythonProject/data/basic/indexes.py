@@ -0,0 +1,246 @@
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable, Iterator
+from dataclasses import fields
+from operator import attrgetter
+from typing import Generic, TypeVar
+from basic.model_dataclasses import Bicycle, deleted
+
+T = TypeVar("T")
+_MISSING = object()
+
+# Alapértelmezett indexek: egyenlőségre hash, tartományra rendezett
+HASH_FIELDS = ("brand", "owner_id")
+SORTED_FIELDS = ("year", "ram", "vram")
+
+
+#  INDEXEK
+class HashIndex:
+    """Érték -> {id: példány} vödrök, O(1) egyenlőség-kereséssel."""
+
+    __slots__ = ("field", "_buckets")
+
+    def __init__(self, field: str) -> None:
+        self.field = field
+        self._buckets: dict[object, dict[str, object]] = {}
+
+    def add(self, entity: object) -> None:
+        value = getattr(entity, self.field)
+        bucket = self._buckets.get(value)
+        if bucket is None:
+            bucket = self._buckets[value] = {}
+            self._new_value(value)
+        bucket[entity.id] = entity
+
+    def remove(self, entity: object, value: object = _MISSING) -> None:
+        """value: a régi érték, ha a mező már megváltozott."""
+        value = getattr(entity, self.field) if value is _MISSING else value
+        bucket = self._buckets.get(value)
+        if bucket is not None:
+            bucket.pop(entity.id, None)
+            if not bucket:
+                del self._buckets[value]
+                self._drop_value(value)
+
+    def _new_value(self, value: object) -> None:
+        pass
+
+    def _drop_value(self, value: object) -> None:
+        pass
+
+    def eq(self, value: object) -> list[dict]:
+        bucket = self._buckets.get(value)
+        return [bucket] if bucket else []
+
+    def values(self) -> list:
+        return list(self._buckets)
+
+
+class SortedIndex(HashIndex):
+    """Mint a HashIndex, plusz a különböző értékek rendezett listája:
+    tartomány-keresés bisect-tel. A year/ram/vram mezőknek kevés különböző
+    értéke van, így a beszúrás is gyakorlatilag O(1)."""
+
+    __slots__ = ("_keys",)
+
+    def __init__(self, field: str) -> None:
+        super().__init__(field)
+        self._keys: list = []
+
+    def _new_value(self, value: object) -> None:
+        insort(self._keys, value)
+
+    def _drop_value(self, value: object) -> None:
+        del self._keys[bisect_left(self._keys, value)]
+
+    def range(self, low: object = None, high: object = None) -> list[dict]:
+        """low <= érték <= high vödrei (None: nyitott határ)."""
+        keys = self._keys
+        i = 0 if low is None else bisect_left(keys, low)
+        j = len(keys) if high is None else bisect_right(keys, high)
+        return [self._buckets[k] for k in keys[i:j]]
+
+    def values(self) -> list:
+        return list(self._keys)
+
+
+#  INDEXELT GYŰJTEMÉNY
+class IndexedCollection(Generic[T]):
+    """Person / Bicycle / Laptop példányok indexekkel, pl.
+    laptops.query(brand="Dell", year=2022, ram=(32, None))
+
+    A feltétel értéke skalár (egyenlőség) vagy (low, high) pár (zárt tartomány,
+    None: nyitott határ). Indexelt mezők változtatása update()/reown()-nal; közvetlen
+    értékadás (laptop.ram = ..., linking.link) után a régi vödörben maradt példányt
+    a query kiszűri, de az új értékre csak update() után talál rá."""
+
+    def __init__(self, entity_type: type[T],
+                 entities: Iterable[T] = (),
+                 hash_fields: Iterable[str] = HASH_FIELDS,
+                 sorted_fields: Iterable[str] = SORTED_FIELDS) -> None:
+        names = {f.name for f in fields(entity_type)}
+        self.entity_type = entity_type
+        self._items: dict[str, T] = {}
+        self.indexes: dict[str, HashIndex] = {}
+        for name in hash_fields:
+            if name in names:
+                self.indexes[name] = HashIndex(name)
+        for name in sorted_fields:
+            if name in names:
+                self.indexes[name] = SortedIndex(name)
+        self.extend(entities)
+
+    #  karbantartás
+    def add(self, entity: T) -> None:
+        if entity.id in self._items:
+            # csere ugyanazzal az id-val: nem törlés
+            self._discard(self._items[entity.id])
+        self._items[entity.id] = entity
+        for index in self.indexes.values():
+            index.add(entity)
+
+    def extend(self, entities: Iterable[T]) -> None:
+        for entity in entities:
+            self.add(entity)
+
+    def remove(self, entity: T) -> None:
+        """Törlés (a változás-követés is törlésként látja, lásd changes.track_changes)."""
+        deleted([self._discard(entity)])
+
+    def _discard(self, entity: T) -> T:
+        entity = self._items.pop(entity.id)
+        for index in self.indexes.values():
+            index.remove(entity)
+        return entity
+
+    def update(self, entity: T, **changes) -> None:
+        """Mezők módosítása úgy, hogy az érintett indexek is frissüljenek."""
+        for name, value in changes.items():
+            index = self.indexes.get(name)
+            old = getattr(entity, name)
+            if index is not None and entity.id in self._items:
+                index.remove(entity, old)
+                setattr(entity, name, value)
+                index.add(entity)
+            else:
+                setattr(entity, name, value)
+
+    def reown(self, item: T, owner: object) -> None:
+        """Tárgy átadása új tulajdonosnak: kapcsolat mindkét irányba + owner_id index."""
+        old = item.owner
+        relation = "bicycles" if isinstance(item, Bicycle) else "laptops"
+        if old is not None:
+            getattr(old, relation).discard(item)
+        self.update(item, owner_id=owner.id if owner is not None else None)
+        item.owner = owner
+        if owner is not None:
+            getattr(owner, relation).append(item)
+
+    #  lekérdezés
+    def _buckets(self, name: str, condition: object) -> list[dict] | None:
+        index = self.indexes.get(name)
+        if index is None:
+            return None
+        if isinstance(condition, tuple):
+            if not isinstance(index, SortedIndex):
+                raise ValueError(f"No sorted index on {name}")
+            return index.range(*condition)
+        return index.eq(condition)
+
+    def query(self, **conditions) -> list[T]:
+        """Az összes feltételnek megfelelő példányok (beszúrási sorrendben, tartománynál érték szerint).
+        A legkisebb indexelt találathalmazból indulunk, a feltételeket (a kiválasztottat
+        is, mert a vödör elavult lehet) feltételenként egy-egy szűréssel nézzük (ez olcsóbb,
+        mint a vödrök id-halmazainak metszése: egy slots-os mező olvasása gyorsabb egy dict keresésnél)."""
+        driver, driver_size = None, 0
+        for name, condition in conditions.items():
+            buckets = self._buckets(name, condition)
+            if buckets is not None:
+                size = sum(len(b) for b in buckets)
+                if driver is None or size < driver_size:
+                    driver, driver_size = (name, buckets), size
+
+        if driver is None:
+            candidates = list(self._items.values())
+        else:
+            candidates = [e for bucket in driver[1] for e in bucket.values()]
+        for name, condition in conditions.items():
+            candidates = _filter(candidates, name, condition)
+        return candidates
+
+    def count(self, **conditions) -> int:
+        # a vödrök mérete nem elég: ugyanúgy szűrünk, mint a query
+        return len(self.query(**conditions))
+
+    def get(self, entity_id: str) -> T | None:
+        return self._items.get(entity_id)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items.values())
+
+    def __contains__(self, entity: object) -> bool:
+        return getattr(entity, "id", entity) in self._items
+
+
+def _filter(entities: list, name: str, condition: object) -> list:
+    get = attrgetter(name)
+    if not isinstance(condition, tuple):
+        return [e for e in entities if get(e) == condition]
+    low, high = condition
+    if low is None:
+        return [e for e in entities if get(e) <= high]
+    if high is None:
+        return [e for e in entities if get(e) >= low]
+    return [e for e in entities if low <= get(e) <= high]
+
+
+# ------------------- Tesztelés -------------------
+if __name__ == "__main__":
+    import time
+    from basic import generator
+    from basic.model_dataclasses import Laptop
+
+    people = generator.generate_people(100_000, bulk=True, seed=1)
+    laptops = generator.generate_laptops(1_000_000, people, bulk=True, seed=1)
+
+    start = time.perf_counter()
+    collection = IndexedCollection(Laptop, laptops)
+    print(f"Indexek felépítése: {time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    scan = [l for l in laptops if l.brand == "Dell" and l.year == 2022 and l.ram >= 32]
+    print(f"Teljes bejárás: {len(scan)} találat, {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    found = collection.query(brand="Dell", year=2022, ram=(32, None))
+    print(f"Index: {len(found)} találat, {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    owned = collection.query(owner_id=people[0].id)
+    print(f"Index (owner_id): {len(owned)} találat, {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    laptop = found[0]
+    collection.reown(laptop, people[0])
+    print(laptop in people[0].laptops, laptop in collection.query(owner_id=people[0].id))
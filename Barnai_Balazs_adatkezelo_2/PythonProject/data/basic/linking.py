@@ -0,0 +1,383 @@
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby, islice
+from operator import attrgetter, lt
+import os
+import weakref
+import numpy as np
+
+from basic import model_dataclasses
+from basic.model_dataclasses import NoOwner, Person, Bicycle, Laptop, deleted
+
+
+# Tárgytípus -> a Person kapcsolat-mezője
+RELATIONS = {Bicycle: "bicycles", Laptop: "laptops"}
+METHODS = ("auto", "hash", "merge", "parallel")
+# "auto" módban ennyi tárgy felett (és ha van több CPU) a párhuzamos út fut
+PARALLEL_MIN_ITEMS = 1_000_000
+CHUNK_SIZE = 250_000
+
+# pozíció-kódok a párhuzamos útban: nincs owner_id / van, de nincs ilyen ember
+_NO_OWNER = -1
+_ORPHAN = -2
+
+_OWNER_ID = attrgetter("owner_id")
+
+
+#  KAPCSOLÁS
+def link(people: Sequence[Person],
+         bicycles: Iterable[Bicycle] | None = None,
+         laptops: Iterable[Laptop] | None = None,
+         method: str = "auto",
+         workers: int | None = None) -> dict[str, int]:
+    """Kapcsolatok beállítása owner_id alapján, mindkét irányba (item.owner, person.bicycles / laptops).
+
+    Idempotens: a megadott tárgytípusok kapcsolatait előbb kiüríti, így többszöri hívás
+    (vagy újraolvasás után) sem marad régi / dupla elem. A None-nal hagyott típus érintetlen.
+    Az ismeretlen owner_id-jű tárgyak (árvák) és az owner_id nélküliek kifejezetten "nincs
+    tulajdonos" jelölést kapnak (NoOwner, a registry-ből sem oldódnak fel); az árvák száma:
+        {"bicycles": 30, "laptops": 28, "orphan_bicycles": 0, "orphan_laptops": 2}"""
+    result = {}
+    for entity_type, items in ((Bicycle, bicycles), (Laptop, laptops)):
+        if items is None:
+            continue
+        name = RELATIONS[entity_type]
+        result[name], result["orphan_" + name] = link_items(people, items, entity_type, method, workers)
+    return result
+
+
+def link_items(people: Sequence[Person],
+               items: Iterable[Bicycle | Laptop],
+               entity_type: type,
+               method: str = "auto",
+               workers: int | None = None) -> tuple[int, int]:
+    """Egy tárgytípus kapcsolása -> (kapcsolt, árva) darabszám.
+
+    method:
+      hash:     egy menet egy id -> Person dict-en át (alapeset)
+      merge:    people id szerint, items owner_id szerint rendezve (pl. ORDER BY owner_id),
+                dict nélkül, tulajdonosonként egyszerre; rendezetlen bemenetre ValueError
+      parallel: az owner_id -> pozíció keresés processzekben, darabokra osztva,
+                a kapcsolatok beállítása tulajdonosonként csoportosítva
+      auto:     parallel PARALLEL_MIN_ITEMS tárgy felett, különben hash"""
+    if method not in METHODS:
+        raise ValueError(f"Unknown link method: {method}")
+    attr = RELATIONS[entity_type]
+    items = items if isinstance(items, list) else list(items)
+    workers = workers or os.cpu_count() or 1
+    if method == "auto":
+        method = "parallel" if len(items) >= PARALLEL_MIN_ITEMS and workers > 1 else "hash"
+    # merge: előbb a terv (és a rendezettség ellenőrzése), hogy hibás bemenetnél semmi ne változzon
+    plan = _merge_plan(people, items) if method == "merge" else None
+
+    for p in people:
+        getattr(p, attr).clear()
+
+    weak = model_dataclasses.WEAK_OWNERS
+    if method == "hash":
+        return _hash_join(people, items, attr, weak)
+    if method == "merge":
+        return _apply_plan(items, plan, attr, weak)
+    positions = _parallel_positions(people, list(map(_OWNER_ID, items)), workers)
+    return _apply_positions(people, items, positions, attr, weak)
+
+
+def _attach(owner: Person, group: list, attr: str, weak: bool) -> None:
+    getattr(owner, attr).extend(group)
+    ref = weakref.ref(owner) if weak else owner
+    for item in group:
+        item._owner = ref
+
+
+def _detach(items: Iterable) -> None:
+    # árva / owner_id nélküli: a korábbi owner hivatkozás se maradjon meg
+    for item in items:
+        item._owner = NoOwner(item.owner_id)
+
+
+def _hash_join(people: Sequence[Person], items: list, attr: str, weak: bool) -> tuple[int, int]:
+    get = {p.id: p for p in people}.get
+    linked = orphans = 0
+    for item in items:
+        owner_id = item.owner_id
+        owner = get(owner_id) if owner_id is not None else None
+        if owner is None:
+            item._owner = NoOwner(owner_id)
+            orphans += owner_id is not None
+            continue
+        item._owner = weakref.ref(owner) if weak else owner
+        getattr(owner, attr).append(item)
+        linked += 1
+    return linked, orphans
+
+
+def _merge_plan(people: Sequence[Person], items: list) -> tuple[list, list, list[int]]:
+    """A merge első fele, módosítás nélkül: az items egymás utáni owner_id csoportjaira
+    (tulajdonosok | None, owner_id-k, csoportvégek) párhuzamos listák. Csak határokat tárolunk,
+    csoportonként se listát, se tuple-t: a sok életben maradó konténert a GC újra és újra
+    végigjárná (és velük a tárgyakat is).
+    Feltétel: people id szerint szigorúan növő (nincs ismétlődő id), items owner_id
+    szerint nem csökkenő (az owner_id nélküliek bárhol lehetnek); különben ValueError."""
+    ids = [p.id for p in people]
+    if not all(map(lt, ids, islice(ids, 1, None))):
+        raise ValueError("People are not sorted by id or contain duplicate ids")
+    owners, owner_ids, ends = [], [], []
+    persons = iter(people)
+    person = next(persons, None)
+    previous = None
+    end = 0
+    for owner_id, group in groupby(map(_OWNER_ID, items)):
+        end += len(list(group))
+        if owner_id is not None:
+            if previous is not None and owner_id < previous:
+                raise ValueError("Items are not sorted by owner_id")
+            previous = owner_id
+            while person is not None and person.id < owner_id:
+                person = next(persons, None)
+        owners.append(person if owner_id is not None and person is not None and person.id == owner_id else None)
+        owner_ids.append(owner_id)
+        ends.append(end)
+    return owners, owner_ids, ends
+
+
+def _apply_plan(items: list, plan: tuple[list, list, list[int]], attr: str, weak: bool) -> tuple[int, int]:
+    linked = orphans = 0
+    start = 0
+    for person, owner_id, end in zip(*plan):
+        group = items[start:end]
+        start = end
+        if person is None:
+            _detach(group)
+            # az owner_id nélküli csoport nem árva
+            orphans += len(group) if owner_id is not None else 0
+            continue
+        _attach(person, group, attr, weak)
+        linked += len(group)
+    return linked, orphans
+
+
+#  PÁRHUZAMOS (PARTICIONÁLT) KERESÉS
+class _PositionIndex(dict):
+    """id -> pozíció; ismeretlen id-re _ORPHAN, None-ra _NO_OWNER, így a keresés
+    egy map(index.__getitem__, ...) lehet, Python szintű ciklus nélkül."""
+
+    def __missing__(self, key: str) -> int:
+        return _ORPHAN
+
+
+_shard_index: _PositionIndex = _PositionIndex()
+
+
+def _init_index(people_ids: list[str]) -> None:
+    # workerenként egyszer épül fel az id -> pozíció dict, nem darabonként
+    global _shard_index
+    _shard_index = _PositionIndex(zip(people_ids, range(len(people_ids))))
+    _shard_index[None] = _NO_OWNER
+
+
+def _positions_shard(owner_ids: list[str | None]) -> np.ndarray:
+    return np.fromiter(map(_shard_index.__getitem__, owner_ids), dtype=np.int64, count=len(owner_ids))
+
+
+def _parallel_positions(people: Sequence[Person], owner_ids: list[str | None], workers: int) -> np.ndarray:
+    """Minden tárgyhoz a tulajdonos pozíciója a people-ben (_NO_OWNER / _ORPHAN, ha nincs)."""
+    people_ids = [p.id for p in people]
+    chunks = [owner_ids[i:i + CHUNK_SIZE] for i in range(0, len(owner_ids), CHUNK_SIZE)]
+    if workers == 1 or len(chunks) <= 1:
+        _init_index(people_ids)
+        parts = [_positions_shard(c) for c in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_index,
+                                 initargs=(people_ids,)) as executor:
+            parts = list(executor.map(_positions_shard, chunks))
+    return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+
+def _apply_positions(people: Sequence[Person], items: list, positions: np.ndarray,
+                     attr: str, weak: bool) -> tuple[int, int]:
+    """Kapcsolatok a pozíciókból, tulajdonosonként csoportosítva (stabil rendezés,
+    így a tárgyak sorrendje tulajdonoson belül ugyanaz, mint a bemenetben)."""
+    order = np.argsort(positions, kind="stable")
+    sorted_positions = positions[order]
+    orphan_end = int(np.searchsorted(sorted_positions, _ORPHAN, side="right"))
+    first = int(np.searchsorted(sorted_positions, 0))
+    # árvák (_ORPHAN) és owner_id nélküliek (_NO_OWNER) egyaránt
+    _detach(map(items.__getitem__, order[:first].tolist()))
+
+    owned = sorted_positions[first:]
+    sorted_items = list(map(items.__getitem__, order[first:].tolist()))
+    starts = np.flatnonzero(np.r_[True, owned[1:] != owned[:-1]]).tolist() if len(owned) else []
+    ends = starts[1:] + [len(owned)]
+    for pos, start, end in zip(owned[starts].tolist(), starts, ends):
+        _attach(people[pos], sorted_items[start:end], attr, weak)
+    return len(owned), orphan_end
+
+
+#  INKREMENTÁLIS KAPCSOLÁS
+def _current_owner(item: Bicycle | Laptop) -> Person | None:
+    # a tényleges hivatkozás, a registry-s lusta feloldás nélkül (feloldatlan / NoOwner: None)
+    ref = item._owner
+    if type(ref) is weakref.ref:
+        return ref()
+    return ref if isinstance(ref, Person) else None
+
+
+class OwnerIndex:
+    """Tartós id -> Person index: új / módosult tárgyak kapcsolása a teljes adathalmaz
+    újrafeldolgozása nélkül, a költség a köteg méretével arányos.
+
+        index = OwnerIndex(people)
+        index.attach(new_laptops)        # új tárgyak vagy owner_id változás után
+        index.detach(deleted_laptops)
+
+    Az ismeretlen owner_id-jű tárgyak várakoznak, és az add_people() kapcsolja be őket,
+    amikor a tulajdonos megérkezik."""
+
+    def __init__(self, people: Iterable[Person] = ()) -> None:
+        self._people: dict[str, Person] = {p.id: p for p in people}
+        # owner_id -> {(típus, tárgy id): tárgy}, és visszafelé (típus, tárgy id) -> owner_id
+        self._waiting: dict[str, dict[tuple, object]] = {}
+        self._waiting_for: dict[tuple, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._people)
+
+    def __contains__(self, person_id: str) -> bool:
+        return person_id in self._people
+
+    def get(self, person_id: str) -> Person | None:
+        return self._people.get(person_id)
+
+    @property
+    def orphans(self) -> int:
+        """Tulajdonosra váró tárgyak száma."""
+        return len(self._waiting_for)
+
+    #  tárgyak
+    def attach(self, items: Iterable[Bicycle | Laptop]) -> dict[str, int]:
+        """Tárgyak kapcsolása az owner_id-jük szerint. A már máshoz kötött tárgy átkerül
+        (a régi tulajdonos listájából kikerül), az ismeretlen owner_id-jű várakozik.
+        -> {"linked": .., "moved": .., "orphans": ..}"""
+        weak = model_dataclasses.WEAK_OWNERS
+        people = self._people
+        linked = moved = orphans = 0
+        for item in items:
+            attr = RELATIONS[type(item)]
+            self._unwait(item)
+            owner_id = item.owner_id
+            owner = people.get(owner_id) if owner_id is not None else None
+            current = _current_owner(item)
+            # más tulajdonos (vagy ugyanaz az id egy régi, lecserélt Person objektumban)
+            if current is not None and current is not owner:
+                getattr(current, attr).discard(item)
+                moved += current.id != owner_id
+            if owner_id is None:
+                item._owner = NoOwner(None)
+                continue
+            if owner is None:
+                item._owner = NoOwner(owner_id)
+                self._wait(item, owner_id)
+                orphans += 1
+                continue
+            if current is not owner:
+                item._owner = weakref.ref(owner) if weak else owner
+            getattr(owner, attr).append(item)
+            linked += 1
+        return {"linked": linked, "moved": moved, "orphans": orphans}
+
+    def detach(self, items: Iterable[Bicycle | Laptop]) -> int:
+        """Törölt tárgyak kivétele a tulajdonosuk listájából (az owner_id megmarad);
+        a változás-követés törlésként látja őket."""
+        items = list(items)
+        deleted(items)
+        detached = 0
+        for item in items:
+            self._unwait(item)
+            current = _current_owner(item)
+            if current is not None:
+                getattr(current, RELATIONS[type(item)]).discard(item)
+                item._owner = NoOwner(item.owner_id)
+                detached += 1
+        return detached
+
+    #  tulajdonosok
+    def add_people(self, people: Iterable[Person]) -> int:
+        """Új emberek az indexbe; a rájuk váró tárgyak bekapcsolódnak -> kapcsolt tárgyak száma."""
+        waiting = []
+        for p in people:
+            self._people[p.id] = p
+            items = self._waiting.get(p.id)
+            if items:
+                waiting.extend(items.values())
+        return self.attach(waiting)["linked"] if waiting else 0
+
+    def remove_people(self, people: Iterable[Person]) -> int:
+        """Emberek kivétele (törlésként jelentve); a tárgyaik árvák lesznek és várakoznak
+        -> árvává vált tárgyak száma."""
+        orphaned = 0
+        for p in people:
+            if self._people.get(p.id) is not p:
+                continue
+            del self._people[p.id]
+            deleted([p])
+            for attr in RELATIONS.values():
+                relation = getattr(p, attr)
+                for item in relation:
+                    item._owner = NoOwner(item.owner_id)
+                    self._wait(item, item.owner_id)
+                    orphaned += 1
+                relation.clear()
+        return orphaned
+
+    def _wait(self, item: object, owner_id: str) -> None:
+        key = (type(item), item.id)
+        self._waiting.setdefault(owner_id, {})[key] = item
+        self._waiting_for[key] = owner_id
+
+    def _unwait(self, item: object) -> None:
+        if not self._waiting_for:
+            return
+        key = (type(item), item.id)
+        owner_id = self._waiting_for.pop(key, None)
+        if owner_id is not None:
+            bucket = self._waiting[owner_id]
+            del bucket[key]
+            if not bucket:
+                del self._waiting[owner_id]
+
+    def __repr__(self) -> str:
+        return f"OwnerIndex({len(self._people)} ember, {self.orphans} árva tárgy)"
+
+
+# ------------------- Tesztelés -------------------
+if __name__ == "__main__":
+    import time
+    from basic import generator
+
+    people = generator.generate_people(200_000, bulk=True, seed=1)
+    laptops = list(generator.iter_laptops(2_000_000, 200_000, seed=1))
+    laptops[0].owner_id = "P-999999"
+
+    for m in ("hash", "parallel", "hash"):
+        start = time.perf_counter()
+        report = link(people, laptops=laptops, method=m)
+        print(f"{m:8} {time.perf_counter() - start:.2f} s  {report}")
+
+    by_owner = sorted(laptops, key=_OWNER_ID)
+    start = time.perf_counter()
+    report = link(sorted(people, key=attrgetter("id")), laptops=by_owner, method="merge")
+    print(f"merge    {time.perf_counter() - start:.2f} s  {report}")
+    print("kétszeri futtatás után is:", sum(len(p.laptops) for p in people))
+
+    # új köteg: csak az új laptopok kapcsolódnak, a meglévő listák maradnak
+    index = OwnerIndex(people)
+    batch = list(generator.iter_laptops(10_000, 200_000, seed=2))
+    for i, laptop in enumerate(batch):
+        object.__setattr__(laptop, "id", f"N-{i:06d}")
+    batch[0].owner_id = "P-999999"
+    start = time.perf_counter()
+    print(index.attach(batch), f"{(time.perf_counter() - start) * 1000:.1f} ms")
+    by_owner[-2].owner_id = people[0].id
+    print(index.attach([by_owner[-2]]), by_owner[-2] in people[0].laptops)
+    print(index.add_people([Person("P-999999", "Új Ember", 30)]), index)
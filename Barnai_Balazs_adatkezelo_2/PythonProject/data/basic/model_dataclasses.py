@@ -1,97 +1,258 @@
-from dataclasses import dataclass, field
-from typing import Optional, Union, TYPE_CHECKING
-from functools import total_ordering
-
-if TYPE_CHECKING:
-    from basic.model_dataclasses import Person, Bicycle, Laptop
-
-
-@total_ordering
-@dataclass(unsafe_hash=True)
-class Person:
-    id: str = field(hash=True)
-    name: str = field(compare=False)
-    age: int = field(compare=False)
-    male: bool = field(compare=False, default=True)
-
-    # Kapcsolatok
-    bicycles: list["Bicycle"] = field(default_factory=list, compare=False)
-    laptops: list["Laptop"] = field(default_factory=list, compare=False)
-
-    def __lt__(self, o: object) -> bool:
-        if not isinstance(o, Person):
-            return NotImplemented
-        return self.id < o.id
-
-    # Segédfüggvények
-    def add_bicycle(self, bicycle: "Bicycle") -> None:
-        if bicycle not in self.bicycles:
-            self.bicycles.append(bicycle)
-
-    def add_laptop(self, laptop: "Laptop") -> None:
-        if laptop not in self.laptops:
-            self.laptops.append(laptop)
-
-
-@dataclass(unsafe_hash=True)
-class Bicycle:
-    id: str = field(hash=True)
-    brand: str = field(compare=False)
-    model: str = field(compare=False)
-    year: int = field(compare=False)
-    owner: Optional[Union["Person", str]] = field(default=None, compare=False)
-    owner_id: Optional[str] = field(default=None, compare=False)
-
-    def __post_init__(self):
-
-        if isinstance(self.owner, str):
-            self.owner_id = self.owner
-            self.owner = None
-
-        elif self.owner is not None:
-            self.owner_id = self.owner.id
-            self.owner.add_bicycle(self)
-
-
-@dataclass(unsafe_hash=True)
-class Laptop:
-    id: str = field(hash=True)
-    brand: str = field(compare=False)
-    model: str = field(compare=False)
-    year: int = field(compare=False)
-    ram: int = field(compare=False)
-    vram: int = field(compare=False)
-    owner: Optional[Union["Person", str]] = field(default=None, compare=False)
-    owner_id: Optional[str] = field(default=None, compare=False)
-
-    def __post_init__(self):
-        if isinstance(self.owner, str):
-            self.owner_id = self.owner
-            self.owner = None
-        elif self.owner is not None:
-            self.owner_id = self.owner.id
-            self.owner.add_laptop(self)
-
-
-
-# ------------------- Tesztelés -------------------
-if __name__ == "__main__":
-    p1 = Person("ABC", "Aladár", 16, True)
-    print()
-    p2 = Person("DEF", "Béla", 18, False)
-
-    # Tulajdonos hozzárendelése objektummal
-    b1 = Bicycle("B001", "Cube", "Acid", 2020, owner=p1)
-    b2 = Bicycle("B002", "Trek", "Marlin", 2021, owner=p1)
-    b3 = Bicycle("B003", "Giant", "Talon", 2021, owner=p2)
-
-    l1 = Laptop("L001", "Dell", "XPS", 2022, 16, 8, owner=p1)
-    l2 = Laptop("L002", "HP", "Omen", 2023, 32, 12, owner=p2)
-
-    print(p1)
-    print("Biciklik:", [b.brand for b in p1.bicycles])
-    print("Laptopok:", [l.brand for l in p1.laptops])
-
-    print("\n" + str(p2))
-    print("Biciklik:", [b.brand for b in p2.bicycles])
-    print("Laptopok:", [l.brand for l in p2.laptops])
+from dataclasses import dataclass, field, fields, InitVar, MISSING
+from collections.abc import Iterable
+from itertools import starmap
+from typing import Optional, Union, TYPE_CHECKING
+from functools import total_ordering
+from basic.registry import keep_recent, lookup
+from basic.relations import RelationList
+import weakref
+
+if TYPE_CHECKING:
+    from basic.model_dataclasses import Person, Bicycle, Laptop
+
+
+# Ha True, a Bicycle/Laptop -> Person hivatkozás gyenge (weakref), így az objektumgráf
+# nem egy nagy referencia-kör (Person -> tárgyak -> Person). Lásd set_weak_owners().
+WEAK_OWNERS = False
+
+
+def set_weak_owners(enabled: bool) -> None:
+    """Gyenge tulajdonos-hivatkozások be/ki (csak az ezután beállított owner-ekre hat)."""
+    global WEAK_OWNERS
+    WEAK_OWNERS = enabled
+
+
+# Változás-figyelő (add / delete metódusokkal, pl. changes.ChangeSet), lásd changes.track_changes().
+# A konstruktorok és a generátorok az új, a gyűjtemények a törölt példányokat jelentik neki.
+_tracker = None
+
+
+def set_tracker(tracker) -> None:
+    global _tracker
+    _tracker = tracker
+
+
+def created(entities: list) -> list:
+    """Újonnan létrehozott (nem beolvasott) példányok jelentése; a listát adja vissza."""
+    if _tracker is not None:
+        for e in entities:
+            _tracker.add(e)
+    return entities
+
+
+def deleted(entities: Iterable) -> None:
+    """Törölt példányok jelentése."""
+    if _tracker is not None:
+        for e in entities:
+            _tracker.delete(e)
+
+
+class _Unresolved:
+    """Az _owner kezdőértéke: a tulajdonos még nincs feloldva (csak owner_id van)."""
+
+    __slots__ = ()
+
+    def __reduce__(self) -> str:
+        # pickle / copy után is ugyanaz a példány marad (is-sel vizsgáljuk)
+        return "_UNRESOLVED"
+
+    def __repr__(self) -> str:
+        return "_UNRESOLVED"
+
+
+_UNRESOLVED = _Unresolved()
+
+
+class NoOwner:
+    """Kifejezetten "nincs tulajdonos" (owner = None, vagy a linker nem találta meg),
+    az akkori owner_id-val: amíg az owner_id nem változik, a registry-ből sem oldjuk fel."""
+
+    __slots__ = ("owner_id",)
+
+    def __init__(self, owner_id: Optional[str]) -> None:
+        self.owner_id = owner_id
+
+    def __repr__(self) -> str:
+        return f"NoOwner({self.owner_id!r})"
+
+
+def _get_owner(self) -> Optional["Person"]:
+    ref = self._owner
+    owner_id = self.owner_id
+    # az eltárolt érték csak addig érvényes, amíg az owner_id ugyanaz; az owner_id
+    # átírása után az új id-ból oldunk fel (az owner_id írása így sima slot írás marad)
+    if type(ref) is NoOwner:
+        if ref.owner_id == owner_id:
+            return None
+    elif ref is not _UNRESOLVED:
+        owner = ref() if type(ref) is weakref.ref else ref
+        if owner is None or owner.id == owner_id:
+            return owner
+    # lusta feloldás: csak owner_id van (pl. beolvasás után), az első eléréskor a registry-ből,
+    # registry nélkül a legutóbb beolvasott / generált emberek közül keressük ki
+    if owner_id is None:
+        return None
+    owner = lookup(Person, owner_id)
+    if owner is not None:
+        self._owner = weakref.ref(owner) if WEAK_OWNERS else owner
+    return owner
+
+
+def _set_owner(self, owner: Optional["Person"]) -> None:
+    if owner is None:
+        self._owner = NoOwner(self.owner_id)
+        return
+    # az owner_id követi az owner-t (így a kettő nem térhet el)
+    if self.owner_id != owner.id:
+        self.owner_id = owner.id
+    self._owner = weakref.ref(owner) if WEAK_OWNERS else owner
+
+
+# slots=True: nincs példányonkénti __dict__, ami milliós nagyságrendnél a memória nagy része
+@total_ordering
+@dataclass(unsafe_hash=True, slots=True, weakref_slot=True)
+class Person:
+    id: str = field(hash=True)
+    name: str = field(compare=False)
+    age: int = field(compare=False)
+    male: bool = field(compare=False, default=True)
+
+    # Kapcsolatok (id szerint indexelt, O(1) tartalmazás / beszúrás)
+    bicycles: RelationList["Bicycle"] = field(default_factory=RelationList, compare=False)
+    laptops: RelationList["Laptop"] = field(default_factory=RelationList, compare=False)
+
+    def __post_init__(self):
+        # új példány (a beolvasók a megbízható konstruktort használják, az nem jut ide)
+        if _tracker is not None:
+            _tracker.add(self)
+
+    def __lt__(self, o: object) -> bool:
+        if not isinstance(o, Person):
+            return NotImplemented
+        return self.id < o.id
+
+    # Segédfüggvények
+    def add_bicycle(self, bicycle: "Bicycle") -> None:
+        self.bicycles.append(bicycle)
+
+    def add_laptop(self, laptop: "Laptop") -> None:
+        self.laptops.append(laptop)
+
+
+@dataclass(unsafe_hash=True, slots=True)
+class Bicycle:
+    id: str = field(hash=True)
+    brand: str = field(compare=False)
+    model: str = field(compare=False)
+    year: int = field(compare=False)
+    # az owner property (lent), a tényleges hivatkozás az _owner-ben van;
+    # ha csak owner_id adott, az owner az első eléréskor oldódik fel (registry.lookup)
+    owner: InitVar[Optional[Union["Person", str]]] = None
+    owner_id: Optional[str] = field(default=None, compare=False)
+    _owner: object = field(default=_UNRESOLVED, init=False, repr=False, compare=False)
+
+    def __post_init__(self, owner):
+        # owner_id a konstruktor része, a módosítás-követés (changes.py) ne lássa módosításnak;
+        # előre írjuk, így az owner beállítása már nem írja át
+        if isinstance(owner, str):
+            object.__setattr__(self, "owner_id", owner)
+
+        elif owner is not None:
+            object.__setattr__(self, "owner_id", owner.id)
+            self.owner = owner
+            owner.add_bicycle(self)
+        if _tracker is not None:
+            _tracker.add(self)
+
+
+@dataclass(unsafe_hash=True, slots=True)
+class Laptop:
+    id: str = field(hash=True)
+    brand: str = field(compare=False)
+    model: str = field(compare=False)
+    year: int = field(compare=False)
+    ram: int = field(compare=False)
+    vram: int = field(compare=False)
+    owner: InitVar[Optional[Union["Person", str]]] = None
+    owner_id: Optional[str] = field(default=None, compare=False)
+    _owner: object = field(default=_UNRESOLVED, init=False, repr=False, compare=False)
+
+    def __post_init__(self, owner):
+        if isinstance(owner, str):
+            object.__setattr__(self, "owner_id", owner)
+        elif owner is not None:
+            object.__setattr__(self, "owner_id", owner.id)
+            self.owner = owner
+            owner.add_laptop(self)
+        if _tracker is not None:
+            _tracker.add(self)
+
+
+Bicycle.owner = property(_get_owner, _set_owner)
+Laptop.owner = property(_get_owner, _set_owner)
+# registry nélkül a legutóbb beolvasott emberekből oldódik fel az owner
+keep_recent(Person)
+
+
+#  GYORS (MEGBÍZHATÓ) LÉTREHOZÁS
+# Olvasók és generátorok már típushelyes mezőket adnak, az owner mindig csak id (owner_id),
+# így az __init__ + __post_init__ (isinstance vizsgálatok, InitVar) kihagyható:
+# a példány __new__-val készül, a slot-ok közvetlenül kapják az értéket.
+def _trusted_constructor(cls: type):
+    params, body, namespace = [], [], {"_new": object.__new__, "_cls": cls}
+    for f in fields(cls):
+        if f.default is not MISSING:
+            namespace[f"_d_{f.name}"] = f.default
+        if f.default_factory is not MISSING:
+            namespace[f"_f_{f.name}"] = f.default_factory
+            body.append(f"o.{f.name} = _f_{f.name}()")
+        elif f.init:
+            params.append(f.name if f.default is MISSING else f"{f.name}=_d_{f.name}")
+            body.append(f"o.{f.name} = {f.name}")
+        else:
+            body.append(f"o.{f.name} = _d_{f.name}")
+    source = (f"def new_{cls.__name__.lower()}({', '.join(params)}):\n"
+              "    o = _new(_cls)\n" + "".join(f"    {line}\n" for line in body) + "    return o\n")
+    exec(source, namespace)
+    return namespace[f"new_{cls.__name__.lower()}"]
+
+
+# new_laptop(id, brand, model, year, ram, vram, owner_id=None): a mezők a dataclass sorrendjében
+new_person = _trusted_constructor(Person)
+new_bicycle = _trusted_constructor(Bicycle)
+new_laptop = _trusted_constructor(Laptop)
+
+TRUSTED = {Person: new_person, Bicycle: new_bicycle, Laptop: new_laptop}
+
+
+def from_rows(entity_type: type, rows: Iterable[tuple]) -> list:
+    """Példányok mező-sorrendű tuple-ökből, ellenőrzés nélkül."""
+    return list(starmap(TRUSTED[entity_type], rows))
+
+
+def from_columns(entity_type: type, *columns: Iterable) -> list:
+    """Példányok oszlopokból (mező-sorrendben), ellenőrzés nélkül."""
+    return list(starmap(TRUSTED[entity_type], zip(*columns)))
+
+
+# ------------------- Tesztelés -------------------
+if __name__ == "__main__":
+    p1 = Person("ABC", "Aladár", 16, True)
+    print()
+    p2 = Person("DEF", "Béla", 18, False)
+
+    # Tulajdonos hozzárendelése objektummal
+    b1 = Bicycle("B001", "Cube", "Acid", 2020, owner=p1)
+    b2 = Bicycle("B002", "Trek", "Marlin", 2021, owner=p1)
+    b3 = Bicycle("B003", "Giant", "Talon", 2021, owner=p2)
+
+    l1 = Laptop("L001", "Dell", "XPS", 2022, 16, 8, owner=p1)
+    l2 = Laptop("L002", "HP", "Omen", 2023, 32, 12, owner=p2)
+
+    print(p1)
+    print("Biciklik:", [b.brand for b in p1.bicycles])
+    print("Laptopok:", [l.brand for l in p1.laptops])
+
+    print("\n" + str(p2))
+    print("Biciklik:", [b.brand for b in p2.bicycles])
+    print("Laptopok:", [l.brand for l in p2.laptops])
@@ -0,0 +1,99 @@
+from functools import lru_cache
+import numpy as np
+import random
+
+
+# Tulajdonos-eloszlások a kerékpár / laptop generáláshoz
+#   uniform: mindenki ugyanakkora eséllyel tulajdonos
+#   zipf:    kevés embernél sok tárgy (a súly 1 / rang^s)
+#   fixed:   mindenkinek (±1) ugyanannyi tárgy jut
+DISTRIBUTIONS = ("uniform", "zipf", "fixed")
+ZIPF_S = 1.2
+
+
+class AliasTable:
+    """Walker-féle alias tábla: O(1) mintavétel tetszőleges diszkrét eloszlásból."""
+
+    def __init__(self, weights) -> None:
+        w = np.asarray(weights, dtype=float)
+        assert len(w) > 0 and w.sum() > 0
+
+        n = len(w)
+        prob = (w * n / w.sum()).tolist()
+        alias = list(range(n))
+        small = [i for i, p in enumerate(prob) if p < 1.0]
+        large = [i for i, p in enumerate(prob) if p >= 1.0]
+
+        while small and large:
+            s, l = small.pop(), large.pop()
+            alias[s] = l
+            prob[l] -= 1.0 - prob[s]
+            (small if prob[l] < 1.0 else large).append(l)
+        for i in small + large:
+            prob[i] = 1.0
+
+        self.prob = np.array(prob)
+        self.alias = np.array(alias, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.prob)
+
+    def sample(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        """n index egyetlen vektoros lépésben."""
+        i = rng.integers(0, len(self.prob), size=n)
+        return np.where(rng.random(n) < self.prob[i], i, self.alias[i])
+
+    def sample_one(self, rnd: random.Random = random) -> int:
+        """Egy index; rnd: a hívó (seed-elt) generátora, alapból a random modul."""
+        i = rnd.randrange(len(self.prob))
+        return i if rnd.random() < self.prob[i] else int(self.alias[i])
+
+
+@lru_cache(maxsize=8)
+def _rank_order(n_owners: int) -> np.ndarray:
+    # rögzített (n_owners-től függő) sorrend, így minden shard ugyanazokat
+    # az embereket tekinti "nagy tulajdonosnak"
+    return np.random.default_rng(n_owners).permutation(n_owners)
+
+
+@lru_cache(maxsize=8)
+def zipf_table(n_owners: int, s: float = ZIPF_S) -> AliasTable:
+    weights = np.empty(n_owners)
+    weights[_rank_order(n_owners)] = 1.0 / np.arange(1, n_owners + 1) ** s
+    return AliasTable(weights)
+
+
+def owner_indices(n: int, n_owners: int, rng: np.random.Generator,
+                  ownership: str = "uniform",
+                  zipf_s: float = ZIPF_S,
+                  start: int = 1) -> np.ndarray:
+    """n tulajdonos-index (0..n_owners-1); start a tárgyak globális sorszáma."""
+    if ownership == "uniform":
+        return rng.integers(0, n_owners, size=n)
+    if ownership == "zipf":
+        return zipf_table(n_owners, zipf_s).sample(n, rng)
+    if ownership == "fixed":
+        return _rank_order(n_owners)[np.arange(start - 1, start - 1 + n) % n_owners]
+    raise ValueError(f"Unknown ownership distribution: {ownership}")
+
+
+def owner_index(i: int, n_owners: int,
+                ownership: str = "uniform",
+                zipf_s: float = ZIPF_S,
+                rnd: random.Random = random) -> int:
+    """Egyetlen tulajdonos-index az i. tárgyhoz (rnd: a hívó generátora, alapból a random modul)."""
+    if ownership == "uniform":
+        return rnd.randrange(n_owners)
+    if ownership == "zipf":
+        return zipf_table(n_owners, zipf_s).sample_one(rnd)
+    if ownership == "fixed":
+        return int(_rank_order(n_owners)[i % n_owners])
+    raise ValueError(f"Unknown ownership distribution: {ownership}")
+
+
+# ------------------- Tesztelés -------------------
+if __name__ == "__main__":
+    rng = np.random.default_rng(1)
+    for dist in DISTRIBUTIONS:
+        counts = np.bincount(owner_indices(100_000, 1000, rng, dist), minlength=1000)
+        print(f"{dist:8} max: {counts.max():5}  min: {counts.min():3}")
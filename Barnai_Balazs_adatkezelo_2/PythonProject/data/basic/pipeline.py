@@ -0,0 +1,128 @@
+from collections import namedtuple
+from collections.abc import Callable, Iterator
+from basic import generator
+from basic.ownership import ZIPF_S
+
+
+# Könnyű sor-típusok: ugyanazok a mezőnevek, mint a modelleknél, így a
+# handlerek write_* függvényei (p.id, l.owner_id, ...) változtatás nélkül írják őket
+PersonRow = namedtuple("PersonRow", ["id", "name", "age", "male"])
+BicycleRow = namedtuple("BicycleRow", ["id", "brand", "model", "year", "owner_id"])
+LaptopRow = namedtuple("LaptopRow", ["id", "brand", "model", "year", "ram", "vram", "owner_id"])
+
+# Egyszerre ennyi sort generálunk oszloponként (ennyi van egyszerre a memóriában)
+BATCH_SIZE = 50_000
+
+
+#  SOR GENERÁTOROK
+def people_rows(n: int,
+                batch_size: int = BATCH_SIZE,
+                seed: int = 0,
+                **options) -> Iterator[PersonRow]:
+    """Emberek sorai batch-enként generálva (options: male_ratio, locale, unique, min_age, max_age)."""
+    assert n > 0 and batch_size > 0
+    male_ratio = options.get("male_ratio", 0.5)
+    locale = options.get("locale", "en_US")
+    unique = options.get("unique", False)
+    min_age = options.get("min_age", 0)
+    max_age = options.get("max_age", 100)
+
+    for start, size, s in generator.shard_plan(n, seed, batch_size):
+        cols = generator.generate_people_columns(size, male_ratio, locale, unique, min_age, max_age, s, start)
+        yield from map(PersonRow._make, zip(cols["id"], cols["name"].tolist(),
+                                            cols["age"].tolist(), cols["male"].tolist()))
+
+
+def bicycle_rows(n: int, owner_ids: list[str] | int,
+                 batch_size: int = BATCH_SIZE,
+                 seed: int = 0,
+                 **options) -> Iterator[BicycleRow]:
+    """Kerékpárok sorai batch-enként (options: ownership, zipf_s)."""
+    assert n > 0 and batch_size > 0
+    ownership = options.get("ownership", "uniform")
+    zipf_s = options.get("zipf_s", ZIPF_S)
+
+    for start, size, s in generator.shard_plan(n, seed, batch_size):
+        cols = generator.generate_bicycles_columns(size, owner_ids, s, start, ownership, zipf_s)
+        yield from map(BicycleRow._make, zip(cols["id"], cols["brand"].tolist(), cols["model"],
+                                             cols["year"].tolist(), cols["owner_id"]))
+
+
+def laptop_rows(n: int, owner_ids: list[str] | int,
+                batch_size: int = BATCH_SIZE,
+                seed: int = 0,
+                **options) -> Iterator[LaptopRow]:
+    """Laptopok sorai batch-enként (options: ownership, zipf_s)."""
+    assert n > 0 and batch_size > 0
+    ownership = options.get("ownership", "uniform")
+    zipf_s = options.get("zipf_s", ZIPF_S)
+
+    for start, size, s in generator.shard_plan(n, seed, batch_size):
+        cols = generator.generate_laptops_columns(size, owner_ids, s, start, ownership, zipf_s)
+        yield from map(LaptopRow._make, zip(cols["id"], cols["brand"].tolist(), cols["model"],
+                                            cols["year"].tolist(), cols["ram"].tolist(),
+                                            cols["vram"].tolist(), cols["owner_id"]))
+
+
+#  PIPELINE
+def generate_to_sink(kind: str,
+                     n: int,
+                     sink: Callable,
+                     *sink_args,
+                     owner_ids: list[str] | int | None = None,
+                     batch_size: int = BATCH_SIZE,
+                     seed: int = 0,
+                     options: dict | None = None,
+                     **sink_kwargs) -> None:
+    """Generálás közvetlenül egy handler write_* függvényébe, pl.
+    generate_to_sink("laptops", 10_000_000, csv_list.write_laptops, "C:/hallgato", owner_ids=1_000_000)"""
+    options = options or {}
+    if kind == "people":
+        rows = people_rows(n, batch_size, seed, **options)
+    elif kind == "bicycles":
+        rows = bicycle_rows(n, owner_ids, batch_size, seed, **options)
+    elif kind == "laptops":
+        rows = laptop_rows(n, owner_ids, batch_size, seed, **options)
+    else:
+        raise TypeError(f"Unknown entity kind: {kind}")
+    sink(rows, *sink_args, **sink_kwargs)
+
+
+def generate_dataset(n_people: int,
+                     n_bicycles: int,
+                     n_laptops: int,
+                     write_people: Callable,
+                     write_bicycles: Callable,
+                     write_laptops: Callable,
+                     *sink_args,
+                     batch_size: int = BATCH_SIZE,
+                     seed: int = 0,
+                     people_options: dict | None = None,
+                     item_options: dict | None = None,
+                     **sink_kwargs) -> None:
+    """Teljes adatkészlet (emberek + tárgyak) kiírása egy handlerrel, állandó memóriával.
+    A tárgyak tulajdonosai a generált P-000001.. id-k közül kerülnek ki."""
+    generate_to_sink("people", n_people, write_people, *sink_args,
+                     batch_size=batch_size, seed=seed, options=people_options, **sink_kwargs)
+    generate_to_sink("bicycles", n_bicycles, write_bicycles, *sink_args, owner_ids=n_people,
+                     batch_size=batch_size, seed=seed + 1, options=item_options, **sink_kwargs)
+    generate_to_sink("laptops", n_laptops, write_laptops, *sink_args, owner_ids=n_people,
+                     batch_size=batch_size, seed=seed + 2, options=item_options, **sink_kwargs)
+
+
+# ------------------- Tesztelés -------------------
+if __name__ == "__main__":
+    import csv
+    import sys
+    import time
+
+    def write_csv(rows, file=sys.stdout):
+        writer = csv.writer(file, delimiter=";")
+        for row in rows:
+            writer.writerow(row)
+
+    generate_to_sink("laptops", 5, write_csv, owner_ids=3, seed=1)
+
+    start = time.perf_counter()
+    count = sum(1 for _ in laptop_rows(1_000_000, 100_000))
+    print(f"{count} laptop sor: {time.perf_counter() - start:.2f} s")
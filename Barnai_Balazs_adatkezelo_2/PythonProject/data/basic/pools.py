@@ -0,0 +1,102 @@
+from faker import Faker
+from functools import lru_cache
+import json
+import os
+import numpy as np
+
+
+# Ennyi nevet / szót húzunk előre a Faker-ből egy pool-ba
+POOL_SIZE = 10_000
+
+# Ha be van állítva, a pool-ok JSON fájlként ide is mentődnek, és innen töltődnek be
+_cache_dir: str | None = os.environ.get("ADATKEZELO_POOL_CACHE")
+
+_DRAWERS = {
+    "male": lambda fake: fake.name_male(),
+    "female": lambda fake: fake.name_female(),
+    "word": lambda fake: fake.word().capitalize(),
+}
+
+
+def set_cache_dir(path: str | None) -> None:
+    """Lemezes gyorsítótár könyvtára (None: csak memóriában)."""
+    global _cache_dir
+    _cache_dir = path
+    get_pool.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def get_faker(locale: str = "en_US") -> Faker:
+    """Lokálénként egyetlen Faker példány (a konstruktor lassú)."""
+    return Faker(locale)
+
+
+@lru_cache(maxsize=None)
+def get_pool(kind: str, locale: str = "en_US", size: int = POOL_SIZE, seed: int = 0) -> np.ndarray:
+    """Előre húzott értékek (kind: male / female / word) memoizálva."""
+    if kind not in _DRAWERS:
+        raise ValueError(f"Unknown pool kind: {kind}")
+
+    file_path = None
+    if _cache_dir:
+        file_path = os.path.join(_cache_dir, f"{kind}_{locale}_{size}_{seed}.json")
+        if os.path.exists(file_path):
+            with open(file_path, encoding="utf-8") as file:
+                return np.array(json.load(file), dtype=object)
+
+    # saját, seedelt példány, hogy a pool tartalma futásonként azonos legyen
+    fake = Faker(locale)
+    fake.seed_instance(seed)
+    draw = _DRAWERS[kind]
+    values = [draw(fake) for _ in range(size)]
+
+    if file_path:
+        os.makedirs(_cache_dir, exist_ok=True)
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump(values, file, ensure_ascii=False)
+
+    return np.array(values, dtype=object)
+
+
+def male_names(locale: str = "en_US", size: int = POOL_SIZE) -> np.ndarray:
+    return get_pool("male", locale, size)
+
+
+def female_names(locale: str = "en_US", size: int = POOL_SIZE) -> np.ndarray:
+    return get_pool("female", locale, size)
+
+
+def model_words(locale: str = "en_US", size: int = POOL_SIZE) -> np.ndarray:
+    return get_pool("word", locale, size)
+
+
+@lru_cache(maxsize=None)
+def name_parts(locale: str = "en_US") -> tuple[np.ndarray, np.ndarray, np.ndarray, bool]:
+    """Egyedi férfi / női keresztnevek és vezetéknevek a Faker listáiból,
+    valamint hogy a lokálé vezetéknév-keresztnév sorrendet használ-e."""
+    provider = next(p for p in get_faker(locale).providers if hasattr(p, "last_names"))
+    males = list(dict.fromkeys(getattr(provider, "first_names_male", provider.first_names)))
+    females = list(dict.fromkeys(getattr(provider, "first_names_female", provider.first_names)))
+    # közös keresztnevek csak a férfiaknál maradnak, így a két névtér diszjunkt
+    male_set = set(males)
+    females = [f for f in females if f not in male_set]
+    lasts = list(dict.fromkeys(provider.last_names))
+    formats = getattr(provider, "formats_male", provider.formats)
+    last_first = next(iter(formats)).startswith("{{last_name}}")
+    return (np.array(males, dtype=object), np.array(females, dtype=object),
+            np.array(lasts, dtype=object), last_first)
+
+
+def sample(pool: np.ndarray, n: int, rng: np.random.Generator) -> np.ndarray:
+    """n elem a pool-ból, egyetlen indexeléssel."""
+    return pool[rng.integers(0, len(pool), size=n)]
+
+
+# ------------------- Tesztelés -------------------
+if __name__ == "__main__":
+    rng = np.random.default_rng(1)
+    print(sample(male_names(), 5, rng))
+    print(sample(female_names("hu_HU"), 5, rng))
+    print(sample(model_words(), 5, rng))
+    males, females, lasts, _ = name_parts("hu_HU")
+    print(len(males), len(females), len(lasts))
@@ -0,0 +1,242 @@
+from collections.abc import Iterable
+import numpy as np
+
+from basic.columnar import EntityTable, IdColumn, DictColumn
+
+
+AGGREGATES = ("count", "sum", "mean", "min", "max")
+
+
+#  OSZLOP SEGÉDEK
+# Egy oszlop numpy tömb (int/bool/float), DictColumn (szöveg) vagy IdColumn;
+# mindhárom indexelhető egy index-tömbbel (take), és visszaalakítható listává.
+def _take(column, index: np.ndarray):
+    return column.take(index) if isinstance(column, (IdColumn, DictColumn)) else column[index]
+
+
+def _decode(column) -> list:
+    return column.decode() if isinstance(column, (IdColumn, DictColumn)) else column.tolist()
+
+
+def _keys(column) -> np.ndarray:
+    """Rendezhető / csoportosítható egész kulcsok az oszlophoz."""
+    if isinstance(column, DictColumn):
+        values = column.values
+        rank = np.empty(len(values) + 1, dtype=np.int64)
+        # a kódok érték szerinti rangja; a None (-1 kód) kerül előre
+        rank[np.array(sorted(range(len(values)), key=values.__getitem__), dtype=np.int64) + 1] = \
+            np.arange(1, len(values) + 1)
+        rank[0] = 0
+        return rank[column.codes + 1]
+    if isinstance(column, IdColumn):
+        return column.numbers if column.numbers is not None else np.unique(column.strings, return_inverse=True)[1]
+    return column
+
+
+def _descending(keys: np.ndarray) -> np.ndarray:
+    """Fordított sorrendű kulcs: a lexsort így is stabil marad (az egyenlők sorrendje nem fordul meg)."""
+    if keys.dtype.kind == "f":
+        return -keys
+    return -keys.astype(np.int64)
+
+
+def _mask(column, condition) -> np.ndarray:
+    """Feltétel: skalár (==), (low, high) zárt tartomány (None: nyitott) vagy lista/halmaz (in)."""
+    if isinstance(column, DictColumn):
+        if isinstance(condition, tuple):
+            raise ValueError("Range condition on a text column")
+        if isinstance(condition, (list, set, frozenset)):
+            codes = [c for c in (column.code(v) for v in condition) if c >= 0]
+            return np.isin(column.codes, codes)
+        code = column.code(condition)
+        return column.codes == code if code >= 0 or condition is None else np.zeros(len(column), dtype=bool)
+    values = column.decode() if isinstance(column, IdColumn) else column
+    if isinstance(condition, tuple):
+        low, high = condition
+        mask = np.ones(len(values), dtype=bool)
+        if low is not None:
+            mask &= np.asarray(values) >= low
+        if high is not None:
+            mask &= np.asarray(values) <= high
+        return mask
+    if isinstance(condition, (list, set, frozenset)):
+        return np.isin(np.asarray(values), list(condition))
+    return np.asarray(values) == condition
+
+
+#  LEKÉRDEZÉS
+class Query:
+    """Kis oszlopos lekérdező: where / select / group_by().agg() / order_by / limit,
+    mind numpy műveletekkel. Minden lépés új Query-t ad, az eredeti nem változik.
+
+    Query(laptops).where(brand="Dell", ram=(32, None)).order_by("year", descending=True).limit(10).rows()
+    Query(laptops, fields=("brand", "ram")).group_by("brand").agg(avg_ram=("ram", "mean")).rows()
+
+    Objektumlistánál a fields megadása sokat gyorsít: csak a használt mezők kerülnek oszlopba.
+    Üres listánál az entity_type adja meg az oszlopokat; enélkül üres (0 soros) Query lesz."""
+
+    def __init__(self, source: EntityTable | Iterable | dict,
+                 fields: Iterable[str] | None = None,
+                 entity_type: type | None = None) -> None:
+        fields = tuple(fields) if fields is not None else None
+        if isinstance(source, EntityTable):
+            columns = dict(source.columns)
+        elif isinstance(source, dict):
+            columns = self._encode(source)
+        else:
+            source = source if isinstance(source, list) else list(source)
+            if source or entity_type is not None:
+                columns = dict(EntityTable.from_entities(source, entity_type, fields=fields).columns)
+            else:
+                # típus nélkül nem tudjuk, milyenek az oszlopok: üres (object) tömbök
+                columns = {name: np.empty(0, dtype=object) for name in fields or ()}
+        if fields is not None:
+            columns = {name: columns[name] for name in fields}
+        self.columns: dict = columns
+
+    @staticmethod
+    def _encode(data: dict) -> dict:
+        """name -> lista / tömb; a szöveges oszlopok szótárkódolva."""
+        columns = {}
+        for name, values in data.items():
+            if isinstance(values, (np.ndarray, IdColumn, DictColumn)):
+                columns[name] = values
+            else:
+                values = list(values)
+                is_text = any(isinstance(v, str) for v in values)
+                columns[name] = DictColumn(values) if is_text else np.asarray(values)
+        return columns
+
+    @classmethod
+    def _from(cls, columns: dict) -> "Query":
+        query = cls.__new__(cls)
+        query.columns = columns
+        return query
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def _take(self, index: np.ndarray) -> "Query":
+        return self._from({name: _take(c, index) for name, c in self.columns.items()})
+
+    #  műveletek
+    def where(self, **conditions) -> "Query":
+        mask = np.ones(len(self), dtype=bool)
+        for name, condition in conditions.items():
+            mask &= _mask(self.columns[name], condition)
+        return self._take(np.flatnonzero(mask))
+
+    def select(self, *names: str) -> "Query":
+        return self._from({name: self.columns[name] for name in names})
+
+    def order_by(self, *names: str, descending: bool = False) -> "Query":
+        # lexsort az utolsó kulcs szerint rendez elsődlegesen, és stabil; csökkenő sorrendnél
+        # a kulcsokat fordítjuk meg, nem az eredményt, így az egyenlő sorok sorrendje marad
+        keys = [_keys(self.columns[name]) for name in reversed(names)]
+        if descending:
+            keys = [_descending(k) for k in keys]
+        return self._take(np.lexsort(keys) if keys else np.arange(len(self)))
+
+    def limit(self, n: int) -> "Query":
+        return self._take(np.arange(min(n, len(self))))
+
+    def group_by(self, *keys: str) -> "GroupBy":
+        return GroupBy(self, keys)
+
+    def count(self) -> int:
+        return len(self)
+
+    #  eredmény
+    def to_columns(self) -> dict[str, list]:
+        return {name: _decode(c) for name, c in self.columns.items()}
+
+    def rows(self) -> list[dict]:
+        names = list(self.columns)
+        return [dict(zip(names, row)) for row in zip(*(_decode(self.columns[n]) for n in names))]
+
+    def __repr__(self) -> str:
+        return f"Query({len(self)} sor: {', '.join(self.columns)})"
+
+
+class GroupBy:
+    """Csoportosítás egyetlen rendezéssel: a csoportok összefüggő szeletek,
+    az aggregátumok egy-egy reduceat hívások."""
+
+    def __init__(self, query: Query, keys: tuple[str, ...]) -> None:
+        assert keys
+        self.query = query
+        self.keys = keys
+
+    def _groups(self) -> tuple[np.ndarray, np.ndarray]:
+        """(rendezés, a csoportok kezdőpozíciói a rendezett sorrendben)."""
+        key_arrays = [_keys(self.query.columns[k]) for k in self.keys]
+        order = np.lexsort(key_arrays[::-1])
+        n = len(order)
+        change = np.zeros(n, dtype=bool)
+        if n:
+            change[0] = True
+            for keys in key_arrays:
+                sorted_keys = keys[order]
+                change[1:] |= sorted_keys[1:] != sorted_keys[:-1]
+        return order, np.flatnonzero(change)
+
+    def agg(self, **aggregations: tuple[str, str]) -> Query:
+        """name=(oszlop, "count" | "sum" | "mean" | "min" | "max")"""
+        order, starts = self._groups()
+        columns = {k: _take(self.query.columns[k], order[starts]) for k in self.keys}
+        counts = np.diff(np.append(starts, len(order)))
+
+        for name, (column, func) in aggregations.items():
+            if func not in AGGREGATES:
+                raise ValueError(f"Unknown aggregate: {func}")
+            if func == "count":
+                columns[name] = counts
+                continue
+            source = self.query.columns[column]
+            if isinstance(source, (DictColumn, IdColumn)):
+                if func in ("sum", "mean"):
+                    raise ValueError(f"{func} of a text column: {column}")
+                # a kódok sorrendje nem az értékeké: csoporton belül érték szerint rendezünk
+                # (mint az order_by-nál, a None a legkisebb), és az első / utolsó sort vesszük
+                groups = np.repeat(np.arange(len(starts)), counts)
+                ranked = np.lexsort((_keys(source)[order], groups))
+                picked = ranked[starts if func == "min" else starts + counts - 1]
+                columns[name] = _take(source, order[picked])
+                continue
+            values = np.asarray(source)[order]
+            if not len(values):
+                columns[name] = values
+            elif func in ("sum", "mean") and values.dtype.kind not in "biuf":
+                raise ValueError(f"{func} of a non-numeric column: {column}")
+            elif func == "sum":
+                columns[name] = np.add.reduceat(values, starts)
+            elif func == "mean":
+                columns[name] = np.add.reduceat(values.astype(float), starts) / counts
+            elif func == "min":
+                columns[name] = np.minimum.reduceat(values, starts)
+            else:
+                columns[name] = np.maximum.reduceat(values, starts)
+        return Query._from(columns)
+
+    def count(self) -> Query:
+        return self.agg(count=(self.keys[0], "count"))
+
+
+# ------------------- Tesztelés -------------------
+if __name__ == "__main__":
+    import time
+    from basic import generator
+
+    people = generator.generate_people(10_000, bulk=True, seed=1)
+    laptops = generator.generate_laptops(200_000, people, bulk=True, seed=1)
+
+    start = time.perf_counter()
+    q = Query(laptops, fields=("brand", "year", "ram", "vram"))
+    report = q.group_by("brand").agg(count=("brand", "count"), avg_ram=("ram", "mean"),
+                                     avg_vram=("vram", "mean"), newest=("year", "max"))
+    print(f"Lekérdezés: {time.perf_counter() - start:.3f} s")
+    for row in report.order_by("count", descending=True).rows():
+        print(row)
+
+    print(Query(laptops).where(brand="Dell", ram=(32, None)).select("id", "model", "year", "ram")
+           .order_by("year", "ram", descending=True).limit(3).rows())
@@ -0,0 +1,236 @@
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import MISSING, fields, is_dataclass
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class Registry:
+    """Identity map: (entitás típus, id) -> példány, O(1) kereséssel.
+    Egy id-hoz mindig az elsőként felvett példány tartozik: ha ugyanaz az id újra jön
+    (pl. ismételt beolvasás), az add / add_many a meglévő példányt adja vissza.
+    refresh=True: a meglévő példány mezői közben felveszik az új értékeket (a fájl
+    megváltozott, delta került rá), így a régi hivatkozások is a friss adatot látják.
+
+    maxsize megadásakor típusonként legfeljebb ennyi példányt tart meg (LRU),
+    nagyon nagy adatkészleteknél így a registry nem tart életben mindent."""
+
+    def __init__(self, maxsize: int | None = None) -> None:
+        assert maxsize is None or maxsize > 0
+        self.maxsize = maxsize
+        self._maps: dict[type, dict] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _map(self, entity_type: type) -> dict:
+        m = self._maps.get(entity_type)
+        if m is None:
+            m = self._maps[entity_type] = OrderedDict() if self.maxsize else {}
+        return m
+
+    def _trim(self, m: OrderedDict) -> None:
+        while len(m) > self.maxsize:
+            m.popitem(last=False)
+
+    #  feltöltés
+    def add(self, entity: T, refresh: bool = False) -> T:
+        """Felvétel; ha az id már ismert, a meglévő példányt adja vissza
+        (refresh=True: az új példány mezőértékeivel frissítve)."""
+        m = self._map(type(entity))
+        known = m.setdefault(entity.id, entity)
+        if refresh and known is not entity:
+            _update(known, entity)
+        if self.maxsize:
+            m.move_to_end(known.id)
+            self._trim(m)
+        return known
+
+    def add_many(self, entities: Iterable[T], entity_type: type | None = None, refresh: bool = False) -> list[T]:
+        """Több példány; a visszaadott listában ismert id helyén a meglévő példány áll
+        (refresh=True: frissítve). Azonos típusnál (entity_type) a típus szótárát csak
+        egyszer keressük ki."""
+        if entity_type is None:
+            return [self.add(e, refresh) for e in entities]
+        m = self._map(entity_type)
+        setdefault = m.setdefault
+        if not self.maxsize:
+            entities = entities if isinstance(entities, list) else list(entities)
+            result = [setdefault(e.id, e) for e in entities]
+            if refresh:
+                # csak az ismert id-k fizetnek: új példánynál a kettő ugyanaz
+                for known, entity in zip(result, entities):
+                    if known is not entity:
+                        _update(known, entity)
+            return result
+        result = []
+        for e in entities:
+            known = setdefault(e.id, e)
+            if refresh and known is not e:
+                _update(known, e)
+            m.move_to_end(known.id)
+            result.append(known)
+        self._trim(m)
+        return result
+
+    #  keresés
+    def get(self, entity_type: type[T], entity_id: str, default: T | None = None) -> T | None:
+        m = self._maps.get(entity_type)
+        entity = m.get(entity_id) if m is not None else None
+        if entity is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        if self.maxsize:
+            m.move_to_end(entity_id)
+        return entity
+
+    def get_many(self, entity_type: type[T], entity_ids: Iterable[str]) -> list[T | None]:
+        """A megadott id-k sorrendjében; ami nincs meg, ott None."""
+        m = self._maps.get(entity_type)
+        if m is None:
+            result = [None for _ in entity_ids]
+        elif self.maxsize:
+            return [self.get(entity_type, i) for i in entity_ids]
+        else:
+            result = [m.get(i) for i in entity_ids]
+        missing = result.count(None)
+        self.hits += len(result) - missing
+        self.misses += missing
+        return result
+
+    #  törlés
+    def discard(self, entity: object) -> None:
+        m = self._maps.get(type(entity))
+        if m is not None and m.get(entity.id) is entity:
+            del m[entity.id]
+
+    def clear(self, entity_type: type | None = None) -> None:
+        if entity_type is None:
+            self._maps.clear()
+        else:
+            self._maps.pop(entity_type, None)
+
+    #  statisztika
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "size": {t.__name__: len(m) for t, m in self._maps.items()}}
+
+    def reset_stats(self) -> None:
+        self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return sum(len(m) for m in self._maps.values())
+
+    def __contains__(self, entity: object) -> bool:
+        m = self._maps.get(type(entity))
+        return m is not None and m.get(getattr(entity, "id", None)) is entity
+
+
+#  FRISSÍTÉS
+_DATA_FIELDS: dict[type, tuple[str, ...]] = {}
+
+
+def _data_fields(entity_type: type) -> tuple[str, ...]:
+    # a konstruktorban megadható adatmezők (id, name, ..., owner_id); a kapcsolat-listák
+    # (default_factory) és a belső _owner nem: azok a meglévő példányon maradnak
+    names = _DATA_FIELDS.get(entity_type)
+    if names is None:
+        names = _DATA_FIELDS[entity_type] = tuple(
+            f.name for f in fields(entity_type) if f.init and f.default_factory is MISSING
+        ) if is_dataclass(entity_type) else ()
+    return names
+
+
+def _update(known: object, fresh: object) -> None:
+    # beolvasás, nem módosítás: a változás-követés (changes.py) ne lássa
+    for name in _data_fields(type(known)):
+        object.__setattr__(known, name, getattr(fresh, name))
+
+
+# Közös registry, alapból nincs: bekapcsolva (set_registry(Registry())) ezt töltik a readerek
+# és a generátorok. Minden felvett példányt életben tart, ezért nem alapértelmezett.
+_registry: Registry | None = None
+
+# Registry nélkül a keep_recent() típusokból (Person, a lusta owner-feloldáshoz) a legutóbb
+# beolvasott / generált lista marad meg: egyetlen adathalmaz, a következő register() lecseréli.
+# Az id -> példány szótár csak az első lookup-kor épül fel, így aki nem keres, nem fizet érte.
+_recent: dict[type, list] = {}
+_recent_index: dict[type, tuple[int, dict]] = {}
+
+
+def get_registry() -> Registry | None:
+    return _registry
+
+
+def set_registry(registry: Registry | None) -> None:
+    """Közös registry bekapcsolása / cseréje (pl. Registry(maxsize=...)), None: kikapcsolva."""
+    global _registry
+    _registry = registry
+    forget_recent()
+
+
+def keep_recent(entity_type: type) -> None:
+    """A típus legutóbbi listája registry nélkül is kereshető marad (lookup)."""
+    _recent.setdefault(entity_type, [])
+
+
+def forget_recent() -> None:
+    """A registry nélkül megtartott legutóbbi listák elengedése."""
+    for entity_type in _recent:
+        _recent[entity_type] = []
+    _recent_index.clear()
+
+
+def register(entities: list[T], entity_type: type | None = None) -> list[T]:
+    """A példányok felvétele a közös registry-be (ha be van kapcsolva). A listát adja vissza,
+    így return-ben is használható; már ismert id helyén a registry meglévő példánya áll,
+    a most beolvasott / generált értékekkel frissítve (refresh)."""
+    if not entities:
+        return entities
+    entity_type = entity_type or type(entities[0])
+    if _registry is not None:
+        return _registry.add_many(entities, entity_type, refresh=True)
+    if entity_type in _recent:
+        _recent[entity_type] = entities
+        _recent_index.pop(entity_type, None)
+    return entities
+
+
+def lookup(entity_type: type[T], entity_id: str) -> T | None:
+    """Keresés a közös registry-ben; registry nélkül a típus legutóbb felvett listájában
+    (keep_recent). None, ha nincs ilyen id."""
+    if _registry is not None:
+        return _registry.get(entity_type, entity_id)
+    recent = _recent.get(entity_type)
+    if not recent:
+        return None
+    size, index = _recent_index.get(entity_type, (None, None))
+    # a hívó bővíthette a listát: ilyenkor újraépítjük
+    if size != len(recent):
+        index = {e.id: e for e in recent}
+        _recent_index[entity_type] = (len(recent), index)
+    return index.get(entity_id)
+
+
+# ------------------- Tesztelés -------------------
+if __name__ == "__main__":
+    from basic import generator, registry as shared
+    from basic.model_dataclasses import Person, Laptop
+
+    # scriptként futtatva ez a modul __main__, a generátorok a basic.registry példányát töltik
+    shared.set_registry(shared.Registry())
+    people = generator.generate_people(1000, bulk=True, seed=1)
+    laptops = generator.generate_laptops(5000, people, bulk=True, seed=1)
+    registry = shared.get_registry()
+    print(registry.get(Person, "P-000042"), registry.get(Laptop, "L-999999"))
+    print([l.brand for l in registry.get_many(Laptop, ["L-000001", "L-000002"])])
+    print(registry.stats())
+    again = generator.generate_people(10, bulk=True, seed=2)
+    print("ugyanaz a példány:", again[0] is people[0], "friss név:", people[0].name)
+
+    lru = Registry(maxsize=100)
+    lru.add_many(people, Person)
+    print(len(lru), lru.get(Person, "P-000001"), lru.get(Person, "P-001000").name)
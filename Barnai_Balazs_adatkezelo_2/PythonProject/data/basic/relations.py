@@ -0,0 +1,81 @@
+from collections.abc import Iterable, Iterator
+from operator import attrgetter
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+_ID = attrgetter("id")
+
+
+class RelationList(Generic[T]):
+    """1:N kapcsolat tárolója (Person.bicycles, Person.laptops).
+
+    Listaként viselkedik (sorrendtartó bejárás, len, indexelés, append), de
+    id szerinti dict van alatta, így a tartalmazás-vizsgálat és a beszúrás O(1).
+    Ugyanazt az id-t kétszer nem tárolja: az append idempotens. Indexeléshez az
+    elemek listáját az első kéréskor építjük fel, és minden módosítás eldobja."""
+
+    __slots__ = ("_items", "_values")
+
+    def __init__(self, items: Iterable[T] = ()) -> None:
+        self._items: dict[str, T] = {}
+        self._values: list[T] | None = None
+        for item in items:
+            self._items[item.id] = item
+
+    def append(self, item: T) -> None:
+        self._items[item.id] = item
+        self._values = None
+
+    def extend(self, items: Iterable[T]) -> None:
+        # egyetlen dict.update, elemenkénti Python ciklus nélkül
+        items = items if isinstance(items, list) else list(items)
+        self._items.update(zip(map(_ID, items), items))
+        self._values = None
+
+    def remove(self, item: T) -> None:
+        try:
+            del self._items[item.id]
+        except KeyError:
+            raise ValueError(f"{item.id} is not in relation") from None
+        self._values = None
+
+    def discard(self, item: T) -> None:
+        self._items.pop(item.id, None)
+        self._values = None
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._values = None
+
+    def get(self, item_id: str) -> T | None:
+        return self._items.get(item_id)
+
+    def __contains__(self, item: object) -> bool:
+        # objektummal és puszta id-vel is lehet kérdezni
+        return getattr(item, "id", item) in self._items
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items.values())
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index: int | slice) -> T | list[T]:
+        # a lista csak módosítás után épül újra, egymás utáni indexelés O(1)
+        values = self._values
+        if values is None:
+            values = self._values = list(self._items.values())
+        return values[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, RelationList):
+            return list(self) == list(other)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(list(self._items.values()))
@@ -0,0 +1,211 @@
+from collections import namedtuple
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from functools import lru_cache
+import csv
+from itertools import islice
+from operator import attrgetter
+from basic.model_dataclasses import Person, Bicycle, Laptop, TRUSTED
+
+
+# A fájlba / táblába kerülő mezők típussal, a fájlok oszlopsorrendjében
+SCHEMAS: dict[type, tuple[tuple[str, type], ...]] = {
+    Person: (("id", str), ("name", str), ("age", int), ("male", bool)),
+    Bicycle: (("id", str), ("brand", str), ("model", str), ("year", int), ("owner_id", str)),
+    Laptop: (("id", str), ("brand", str), ("model", str), ("year", int),
+             ("ram", int), ("vram", int), ("owner_id", str)),
+}
+
+FIELDS: dict[type, tuple[str, ...]] = {t: tuple(name for name, _ in s) for t, s in SCHEMAS.items()}
+
+# Szövegből bool: a csv.list eddig is ezeket fogadta el
+TRUE_STRINGS = frozenset(("true", "1", "yes", "t"))
+
+# Formátumonként a beolvasott érték -> mező konverzió ({} helyére kerül az érték)
+#   csv:  minden érték szöveg
+#   json: a JSON típusok már jók, csak a számokat ellenőrizzük
+#   sql:  a NUMBER oszlopok int-té, a MALE 0/1-ből bool-lá
+_DECODE = {
+    "csv": {int: "int({})", bool: "({}.lower() in _TRUE)", str: "{}"},
+    "json": {int: "int({})", bool: "{}", str: "{}"},
+    "sql": {int: "int({})", bool: "bool({})", str: "{}"},
+}
+# CSV írás gyors úton: ennyi sor kerül egy str.join-olt darabba
+WRITE_CHUNK = 20_000
+# Mező -> kiírt érték: az SQL a bool-t 0/1-ként tárolja
+_ENCODE = {
+    "csv": {},
+    "json": {},
+    "sql": {bool: "(1 if {} else 0)"},
+}
+
+
+class RowCodec:
+    """Egy entitástípus sor-átalakítói egy formátumhoz, egyszer legenerálva.
+
+    to_tuple / to_dict:   entitás -> sor (írás)
+    from_row / from_dict: sor -> entitás (olvasás), from_rows / from_dicts: egész lista egy
+    generált list comprehension-nel, így soronként nincs külön függvényhívás."""
+
+    __slots__ = ("entity_type", "fields", "fmt", "to_tuple", "to_dict",
+                 "from_row", "from_rows", "from_dict", "from_dicts",
+                 "_decoders", "_projectors", "_formatters")
+
+    def __init__(self, entity_type: type, fmt: str = "csv") -> None:
+        schema = SCHEMAS[entity_type]
+        self.entity_type = entity_type
+        self.fields = FIELDS[entity_type]
+        self.fmt = fmt
+
+        encode = _ENCODE[fmt]
+        if any(t in encode for _, t in schema):
+            self.to_tuple = _compile(
+                f"lambda e: ({''.join(encode.get(t, '{}').format('e.' + n) + ', ' for n, t in schema)})")
+        else:
+            # minden mező változatlanul: attrgetter, C-ben fut
+            self.to_tuple = attrgetter(*self.fields)
+        self.to_dict = _compile(
+            "lambda e: {" + ", ".join(f"{n!r}: " + encode.get(t, "{}").format("e." + n) for n, t in schema) + "}")
+
+        decode = _DECODE[fmt]
+        by_index = _constructor([decode[t].format(f"r[{i}]") for i, (_, t) in enumerate(schema)])
+        by_key = _constructor([decode[t].format(f"r[{n!r}]") for n, t in schema])
+        self.from_row = _compile(f"lambda r: {by_index}", entity_type)
+        self.from_rows = _compile(f"lambda rows: [{by_index} for r in rows]", entity_type)
+        self.from_dict = _compile(f"lambda r: {by_key}", entity_type)
+        self.from_dicts = _compile(f"lambda rows: [{by_key} for r in rows]", entity_type)
+        # generált függvények gyorsítótárai: (fejléc, oszlopok) / oszlopok / elválasztó szerint
+        self._decoders: dict[tuple, Callable] = {}
+        self._projectors: dict[tuple, Callable] = {}
+        self._formatters: dict[str, Callable] = {}
+
+    def decoder(self, header: Sequence[str], columns: Sequence[str] | None = None) -> Callable[[Iterable], list]:
+        """Sorlista -> lista dekódoló a fejléc szerinti oszlop-pozíciókkal (nem fix r[0]..r[n]).
+
+        columns nélkül entitásokat ad (mint a from_rows); columns megadásakor csak ezeket a
+        mezőket konvertálja, és könnyű rekordokat (record_type namedtuple) ad vissza."""
+        key = (tuple(header), tuple(columns) if columns is not None else None)
+        decode = self._decoders.get(key)
+        if decode is None:
+            decode = self._decoders[key] = self._make_decoder(list(header), columns)
+        return decode
+
+    def _make_decoder(self, header: list[str], columns: Sequence[str] | None) -> Callable:
+        types = dict(SCHEMAS[self.entity_type])
+        names = self.fields if columns is None else tuple(columns)
+        unknown = [n for n in names if n not in types]
+        if unknown:
+            raise ValueError(f"Unknown {self.entity_type.__name__} fields: {unknown}")
+        missing = [n for n in names if n not in header]
+        if missing:
+            raise ValueError(f"Missing columns in header: {missing}")
+        values = [_DECODE[self.fmt][types[n]].format(f"r[{header.index(n)}]") for n in names]
+        if columns is None:
+            return _compile(f"lambda rows: [{_constructor(values)} for r in rows]",
+                            self.entity_type)
+        # tuple.__new__ közvetlenül: a namedtuple Python szintű __new__-ja kimarad
+        return eval(f"lambda rows: [_tnew(_rec, ({''.join(v + ', ' for v in values)})) for r in rows]",
+                    {"_TRUE": TRUE_STRINGS, "_tnew": tuple.__new__,
+                     "_rec": record_type(self.entity_type, names)})
+
+    def projector(self, columns: Sequence[str]) -> Callable[[Iterable], list]:
+        """Entitáslista -> rekordlista (a decoder(columns) rekordjai, kész entitásokból)."""
+        columns = tuple(columns)
+        project = self._projectors.get(columns)
+        if project is None:
+            project = self._projectors[columns] = eval(
+                f"lambda rows: [_tnew(_rec, ({''.join(f'e.{n}, ' for n in columns)})) for e in rows]",
+                {"_tnew": tuple.__new__, "_rec": record_type(self.entity_type, columns)})
+        return project
+
+    def line_formatter(self, delimiter: str = ";") -> Callable[[object], str]:
+        """Entitás -> kész CSV sor (sorvéggel együtt) egyetlen generált f-stringgel.
+        Idézés nélkül: csak olyan adatra jó, amiben nincs elválasztó, idézőjel vagy sortörés."""
+        format_line = self._formatters.get(delimiter)
+        if format_line is None:
+            # bármelyik mező lehet None (nem csak az owner_id): üresen megy ki, mint a csv.writer-nél
+            parts = [f"{{'' if e.{n} is None else e.{n}}}" for n in self.fields]
+            literal = delimiter.replace("{", "{{").replace("}", "}}").join(parts) + "\r\n"
+            format_line = self._formatters[delimiter] = eval(f"lambda e: f{literal!r}", {})
+        return format_line
+
+    def write_csv(self, file, entities: Iterable, delimiter: str = ";", no_quoting: bool = False) -> None:
+        """Entitások kiírása egy (newline="" módon nyitott) fájlba, fejléc nélkül.
+
+        Alapból csv.writer.writerows a to_tuple sorokon. no_quoting=True: a sorokat a
+        line_formatter állítja elő, és darabonként egy str.join-nal írjuk ki. Egy darab csak
+        akkor megy ki így, ha az elválasztók / idézőjelek / sorvégek száma pontosan a vártnak
+        felel meg; különben azt a darabot a csv.writer írja (idézéssel), így a kimenet mindig
+        ugyanaz, mint a csv.writer-é."""
+        writer = csv.writer(file, delimiter=delimiter)
+        if not no_quoting:
+            writer.writerows(map(self.to_tuple, entities))
+            return
+        format_line, to_tuple = self.line_formatter(delimiter), self.to_tuple
+        separators = len(self.fields) - 1
+        entities = iter(entities)
+        while chunk := list(islice(entities, WRITE_CHUNK)):
+            text = "".join(map(format_line, chunk))
+            n = len(chunk)
+            if (text.count(delimiter) == n * separators and text.count("\n") == n
+                    and text.count("\r") == n and '"' not in text):
+                file.write(text)
+            else:
+                writer.writerows(map(to_tuple, chunk))
+
+    def chunks(self, rows: Iterable, size: int, parse: Callable | None = None) -> Iterator[list]:
+        """parse (alapból from_rows) darabonként: legfeljebb size elemű listák,
+        egyszerre csak egy van a memóriában."""
+        assert size > 0
+        parse = parse or self.from_rows
+        rows = iter(rows)
+        while chunk := parse(islice(rows, size)):
+            yield chunk
+
+    def __repr__(self) -> str:
+        return f"RowCodec({self.entity_type.__name__}, {self.fmt!r})"
+
+
+def _constructor(args: list[str]) -> str:
+    # a beolvasott sor már típushelyes, az owner csak id: a megbízható konstruktor
+    # (__post_init__ nélkül, lásd model_dataclasses.TRUSTED) elég
+    return f"_new({', '.join(args)})"
+
+
+def _compile(source: str, entity_type: type | None = None):
+    namespace = {"_TRUE": TRUE_STRINGS}
+    if entity_type is not None:
+        namespace["_new"] = TRUSTED[entity_type]
+    return eval(source, namespace)
+
+
+@lru_cache(maxsize=None)
+def record_type(entity_type: type, columns: tuple[str, ...]) -> type:
+    """Könnyű, csak olvasható rekord a kért mezőkkel (pl. LaptopRecord(brand, ram))."""
+    return namedtuple(f"{entity_type.__name__}Record", columns)
+
+
+@lru_cache(maxsize=None)
+def codec(entity_type: type, fmt: str = "csv") -> RowCodec:
+    """A típus + formátum codec-je (első kéréskor generálva, utána gyorsítótárból)."""
+    if entity_type not in SCHEMAS:
+        raise TypeError(f"Unknown entity type: {entity_type}")
+    if fmt not in _DECODE:
+        raise ValueError(f"Unknown format: {fmt}")
+    return RowCodec(entity_type, fmt)
+
+
+# ------------------- Tesztelés -------------------
+if __name__ == "__main__":
+    laptop = Laptop("L-000001", "Dell", "XPS-1000", 2022, 16, 8, owner_id="P-000001")
+    csv_codec = codec(Laptop)
+    row = csv_codec.to_tuple(laptop)
+    print(row, csv_codec.from_row([str(v) for v in row]) == laptop)
+    print(codec(Person, "sql").to_tuple(Person("P-000001", "Teszt Elek", 30, True)))
+    print(codec(Person, "json").to_dict(Person("P-000001", "Teszt Elek", 30, False)))
+
+    import io
+    bicycles = [Bicycle("B-000001", "Csepel", "Túra", 2020), Bicycle("B-000002", "Gepida", 'A "x"; b', 2021, "P-1")]
+    for no_quoting in (False, True):
+        out = io.StringIO(newline="")
+        codec(Bicycle).write_csv(out, bicycles, no_quoting=no_quoting)
+        print(repr(out.getvalue()))
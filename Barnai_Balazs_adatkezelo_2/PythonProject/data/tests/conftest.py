@@ -0,0 +1,30 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+# a modulok "from basic import ..." formában hivatkoznak egymásra: a data mappa kell a path-ra
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if DATA_DIR not in sys.path:
+    sys.path.insert(0, DATA_DIR)
+
+from basic import registry  # noqa: E402
+from basic.changes import track_changes  # noqa: E402
+
+
+def load_handler(name: str):
+    """A handler fájlnevekben pont van (csv.list.py), sima importtal nem tölthetők be."""
+    path = os.path.join(DATA_DIR, "basic", "handler", f"{name}.py")
+    spec = importlib.util.spec_from_file_location(name.replace(".", "_"), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(autouse=True)
+def _clean_globals():
+    # a registry és a változás-követés globális: tesztek között ne szivárogjon át
+    yield
+    track_changes(None)
+    registry.set_registry(None)
@@ -0,0 +1,85 @@
+from basic.changes import DELETE, UPSERT, ChangeSet, apply_delta, iter_delta, track_changes
+from basic.model_dataclasses import Bicycle, Person
+
+
+def people(*ids):
+    return [Person(i, "N", 20) for i in ids]
+
+
+def ids(entities):
+    return [e.id for e in entities]
+
+
+#  apply_delta / iter_delta
+def test_apply_delta_upsert_delete_and_append():
+    base = people("P-1", "P-2", "P-3")
+    changed = Person("P-2", "Új", 99)
+    records = [(DELETE, "P-1", None), (UPSERT, "P-2", changed), (UPSERT, "P-4", Person("P-4", "N", 1))]
+    result = apply_delta(base, records)
+    assert ids(result) == ["P-2", "P-3", "P-4"]
+    assert result[0] is changed
+
+
+def test_apply_delta_last_record_wins():
+    base = people("P-1")
+    records = [(DELETE, "P-1", None), (UPSERT, "P-1", Person("P-1", "Vissza", 5))]
+    assert [p.name for p in apply_delta(base, records)] == ["Vissza"]
+    assert apply_delta(base, records + [(DELETE, "P-1", None)]) == []
+
+
+def test_apply_delta_empty_inputs():
+    base = people("P-1")
+    assert apply_delta(base, []) is base
+    assert apply_delta([], []) == []
+    assert ids(apply_delta([], [(UPSERT, "P-5", Person("P-5", "N", 1))])) == ["P-5"]
+    assert apply_delta([], [(DELETE, "P-5", None)]) == []
+
+
+def test_iter_delta_matches_apply_delta_across_chunks():
+    base = people(*(f"P-{i}" for i in range(10)))
+    records = [(DELETE, "P-3", None), (DELETE, "P-4", None), (UPSERT, "P-7", Person("P-7", "X", 1)),
+               (UPSERT, "P-99", Person("P-99", "Y", 2))]
+    chunks = [base[i:i + 3] for i in range(0, 10, 3)]
+    streamed = [e for chunk in iter_delta(chunks, records) for e in chunk]
+    assert ids(streamed) == ids(apply_delta(base, records))
+    # delta nélkül a darabok változatlanul mennek tovább
+    assert list(iter_delta(chunks, [])) == chunks
+    assert list(iter_delta([], [])) == []
+
+
+#  ChangeSet / track_changes
+def test_changeset_new_then_deleted_is_dropped():
+    changes = ChangeSet()
+    p = Person("P-1", "N", 20)
+    changes.add(p)
+    changes.modify(p)
+    assert list(changes.records(Person)) == [(UPSERT, p)]
+    changes.delete(p)
+    assert len(changes) == 0
+
+
+def test_track_changes_records_created_modified_deleted():
+    existing = Person("P-1", "N", 20)
+    changes = ChangeSet()
+    track_changes(changes)
+    created = Bicycle("B-1", "X", "a", 2000, "P-1")
+    existing.name = "Más"
+    existing.age = 20  # nem változott
+    changes.delete(Person("P-2", "N", 1))
+    track_changes(None)
+
+    assert changes.upserts(Bicycle) == [created]
+    assert changes.modified[Person] == {"P-1": existing}
+    # a törlés előtt ugyanabban a körben létrehozott entitás nem kerül ki
+    assert changes.deletes(Person) == []
+
+
+def test_track_changes_restores_setattr():
+    original = Person.__dict__.get("__setattr__")
+    track_changes(ChangeSet())
+    assert Person.__dict__.get("__setattr__") is not original
+    track_changes(None)
+    assert Person.__dict__.get("__setattr__") is original
+    p = Person("P-1", "N", 20)
+    p.name = "Más"
+    assert p.name == "Más"
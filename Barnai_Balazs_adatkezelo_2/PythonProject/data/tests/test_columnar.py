@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from basic.columnar import EntityTable, IdColumn
+from basic.model_dataclasses import Laptop, Person
+
+
+def sample():
+    people = [Person(f"P-{i:06d}", f"Név {i}", 20 + i, i % 2 == 0) for i in range(5)]
+    laptops = [Laptop(f"L-{i:06d}", "Dell", "XPS", 2020, 16, 4, owner_id=f"P-{i % 7:06d}") for i in range(6)]
+    return people, laptops
+
+
+def test_eq_on_numeric_ids():
+    people, _ = sample()
+    table = EntityTable.from_entities(people)
+    assert isinstance(table.columns["id"], IdColumn)
+    mask = table.eq("id", people[2].id)
+    assert isinstance(mask, np.ndarray) and mask.tolist() == [False, False, True, False, False]
+    # más formázás / előtag / nem szöveg: nincs találat, nem kivétel
+    for value in ("P-2", "X-000002", "P-00000002", "abc", None, 2):
+        assert not table.eq("id", value).any()
+
+
+def test_eq_on_string_ids():
+    people = [Person(name, "N", 1) for name in ("anna", "béla", "anna")]
+    table = EntityTable.from_entities(people)
+    assert table.eq("id", "anna").tolist() == [True, False, True]
+    assert not table.eq("id", "cecil").any()
+
+
+def test_owner_index_requires_owners():
+    people, laptops = sample()
+    person_table = EntityTable.from_entities(people)
+    with pytest.raises(ValueError, match="owner_id"):
+        person_table.owner_index()
+    assert person_table.owner_row(0) is None
+
+    laptop_table = EntityTable.from_entities(laptops)
+    with pytest.raises(ValueError, match="owners"):
+        laptop_table.owner_index()
+    assert laptop_table.owner_row(0) is None
+
+
+def test_owner_index_with_owners():
+    people, laptops = sample()
+    table = EntityTable.from_entities(laptops, owners=EntityTable.from_entities(people))
+    assert table.owner_index().tolist() == [0, 1, 2, 3, 4, -1]
+    assert table.owner_row(5) is None
+    assert table.owner_row(1).name == "Név 1"
+    entities = table.to_entities(people)
+    assert [l.owner for l in entities] == people + [None]
@@ -0,0 +1,164 @@
+import os
+
+import pytest
+
+from basic.changes import ChangeSet, delta_name
+from basic.linking import link
+from basic.model_dataclasses import Bicycle, Laptop, Person, new_bicycle
+from basic.registry import Registry, lookup, set_registry
+from basic.schema import codec
+from conftest import load_handler
+
+
+@pytest.fixture(params=["csv.list", "csv.dict"])
+def handler(request):
+    return load_handler(request.param)
+
+
+def sample():
+    people = [Person(f"P-{i}", f"Név {i}", 20 + i, i % 2 == 0) for i in range(5)]
+    bicycles = [new_bicycle(f"B-{i}", "Csepel", f"M{i}", 2000 + i, f"P-{i % 6}") for i in range(12)]
+    bicycles[1].model = "sor\r\ntörés; \"idézet\""
+    bicycles[2].owner_id = None
+    bicycles[3].brand = None
+    laptops = [Laptop(f"L-{i}", "Dell", "XPS", 2020, 16, 4, owner_id=f"P-{i}") for i in range(3)]
+    return people, bicycles, laptops
+
+
+def rows(entities):
+    return [codec(type(e)).to_tuple(e) for e in entities]
+
+
+def csv_rows(entities):
+    # CSV-ben a None üres szövegként megy ki és úgy is jön vissza
+    return [tuple("" if v is None else v for v in row) for row in rows(entities)]
+
+
+def write_all(handler, path, people, bicycles, laptops, no_quoting=False):
+    handler.write_people(people, path, no_quoting=no_quoting)
+    handler.write_bicycles(bicycles, path, no_quoting=no_quoting)
+    handler.write_laptops(laptops, path, no_quoting=no_quoting)
+
+
+def write_delta(handler, path, people, bicycles):
+    """B-0 módosul (sortöréssel), B-4 és P-0 törlődik, B-99 új -> a várt bicikli sorok."""
+    changes = ChangeSet()
+    bicycles[0].model = "Új\r\nmodell"
+    changes.modify(bicycles[0])
+    changes.delete(bicycles[4])
+    added = new_bicycle("B-99", "Gepida", "Z", 2024, "P-1")
+    changes.add(added)
+    changes.delete(people[0])
+    assert handler.write_changes(changes, path) == 4
+    assert len(changes) == 0
+    return csv_rows([b for b in bicycles if b.id != "B-4"] + [added])
+
+
+def test_round_trip(handler, tmp_path):
+    people, bicycles, laptops = sample()
+    write_all(handler, str(tmp_path), people, bicycles, laptops)
+    assert rows(handler.read_people(str(tmp_path))) == rows(people)
+    assert rows(handler.read_bicycles(str(tmp_path))) == csv_rows(bicycles)
+    assert rows(handler.read_laptops(str(tmp_path))) == rows(laptops)
+
+
+def test_streaming(handler, tmp_path):
+    people, bicycles, laptops = sample()
+    path = str(tmp_path)
+    write_all(handler, path, people, bicycles, laptops)
+    full = rows(handler.read_bicycles(path))
+    assert [len(c) for c in handler.iter_bicycles(path, chunk_size=5)] == [5, 5, 2]
+    assert [r for chunk in handler.iter_bicycles(path, chunk_size=5) for r in rows(chunk)] == full
+    assert rows(handler.iter_bicycles(path)) == full
+
+
+def test_empty_files(handler, tmp_path):
+    path = str(tmp_path)
+    handler.write_people([], path)
+    assert handler.read_people(path) == []
+    assert list(handler.iter_people(path, chunk_size=10)) == []
+    # teljesen üres fájl (fejléc nélkül)
+    open(os.path.join(path, "people_empty.csv"), "w").close()
+    assert handler.read_people(path, "people_empty.csv") == []
+
+
+def test_delta_round_trip(handler, tmp_path):
+    people, bicycles, laptops = sample()
+    path = str(tmp_path)
+    write_all(handler, path, people, bicycles, laptops)
+    expected = write_delta(handler, path, people, bicycles)
+
+    assert rows(handler.read_bicycles(path)) == expected
+    assert [r for chunk in handler.iter_bicycles(path, chunk_size=4) for r in rows(chunk)] == expected
+    assert [p.id for p in handler.read_people(path)] == ["P-1", "P-2", "P-3", "P-4"]
+
+    # második kör hozzáfűz, a teljes mentés eldobja a deltát
+    changes = ChangeSet()
+    changes.delete(handler.read_bicycles(path)[-1])
+    handler.write_changes(changes, path)
+    assert "B-99" not in [b.id for b in handler.read_bicycles(path)]
+    handler.write_bicycles(bicycles, path)
+    assert not os.path.exists(os.path.join(path, delta_name(handler._FILE_NAMES[Bicycle])))
+
+
+def test_read_parallel_matches_read(handler, tmp_path):
+    people, bicycles, laptops = sample()
+    path = str(tmp_path)
+    write_all(handler, path, people, bicycles, laptops)
+    assert rows(handler.read_parallel(Bicycle, path, workers=1)) == rows(handler.read_bicycles(path))
+    expected = write_delta(handler, path, people, bicycles)
+    assert rows(handler.read_parallel(Bicycle, path, workers=1)) == expected
+    handler.write_laptops([], path)
+    assert handler.read_parallel(Laptop, path, workers=1) == []
+
+
+def test_projection(handler, tmp_path):
+    people, bicycles, laptops = sample()
+    path = str(tmp_path)
+    write_all(handler, path, people, bicycles, laptops)
+    full = csv_rows(bicycles)
+    assert handler.read_bicycles(path, columns=("model", "year")) == [(r[2], r[3]) for r in full]
+    assert [r.year for r in handler.iter_bicycles(path, columns=("year",))] == [r[3] for r in full]
+    assert handler.read_columns(Bicycle, path, ("id", "year")) == {"id": [r[0] for r in full],
+                                                                   "year": [r[3] for r in full]}
+    # a delta id szerint érvényesül a vetített olvasásnál is
+    expected = write_delta(handler, path, people, bicycles)
+    assert handler.read_bicycles(path, columns=("id", "model")) == [(r[0], r[2]) for r in expected]
+    handler.write_people([], path)
+    assert handler.read_columns(Person, path, ("id",)) == {"id": []}
+
+
+def test_fast_writer_is_byte_identical(handler, tmp_path):
+    people, bicycles, laptops = sample()
+    write_all(handler, str(tmp_path / "slow"), people, bicycles, laptops)
+    write_all(handler, str(tmp_path / "fast"), people, bicycles, laptops, no_quoting=True)
+    for name in os.listdir(tmp_path / "slow"):
+        assert (tmp_path / "slow" / name).read_bytes() == (tmp_path / "fast" / name).read_bytes()
+    assert rows(handler.read_bicycles(str(tmp_path / "fast"))) == csv_rows(bicycles)
+
+
+def test_owner_resolves_after_plain_read(handler, tmp_path):
+    # registry nélkül is: a legutóbb beolvasott emberek közül
+    people, bicycles, laptops = sample()
+    path = str(tmp_path)
+    write_all(handler, path, people, bicycles, laptops)
+    people_read = handler.read_people(path)
+    laptops_read = handler.read_laptops(path)
+    assert isinstance(laptops_read[0].owner, Person)
+    assert laptops_read[0].owner is people_read[0]
+    assert handler.read_bicycles(path)[5].owner is None  # P-5 nincs
+
+
+def test_owner_resolves_through_registry(handler, tmp_path):
+    set_registry(Registry())
+    people, bicycles, laptops = sample()
+    path = str(tmp_path)
+    write_all(handler, path, people, bicycles, laptops)
+    people_read = handler.read_people(path)
+    bicycles_read = handler.read_bicycles(path)
+    assert lookup(Person, "P-1") is people_read[1]
+    assert bicycles_read[1].owner is people_read[1]
+
+    result = link(people_read, bicycles_read, handler.read_laptops(path))
+    assert (result["bicycles"], result["laptops"], result["orphan_laptops"]) == (9, 3, 0)
+    assert bicycles_read[5].owner is None
@@ -0,0 +1,95 @@
+import csv
+import io
+
+import pytest
+
+from basic import csv_parallel
+from basic.csv_parallel import read_parallel, split_ranges
+from basic.model_dataclasses import Laptop, Person, new_laptop
+from basic.schema import codec
+
+
+def tricky_laptops(n=200):
+    laptops = [new_laptop(f"L-{i:04d}", "Dell", f"M{i}", 2000 + i % 20, 8, 2, f"P-{i % 7}") for i in range(n)]
+    # idézőjeles mezők sortöréssel, elválasztóval és idézőjellel, sűrűn, hogy minden vágáshoz essen
+    for i in range(0, n, 3):
+        laptops[i].model = f'sor\r\ntörés "{i}"\n;x'
+    laptops[5].owner_id = None
+    return laptops
+
+
+def write_file(path, laptops, header=None):
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file, delimiter=";")
+        writer.writerow(header or codec(Laptop).fields)
+        writer.writerows(map(codec(Laptop).to_tuple, laptops))
+    return str(path)
+
+
+def serial(path):
+    with open(path, newline="", encoding="utf-8") as file:
+        rows = csv.reader(file, delimiter=";")
+        return codec(Laptop).decoder(next(rows))(rows)
+
+
+def rows_of(laptops):
+    return [codec(Laptop).to_tuple(e) for e in laptops]
+
+
+@pytest.mark.parametrize("parts", [1, 2, 3, 7, 50, 400])
+def test_split_ranges_cut_on_row_boundaries(tmp_path, parts):
+    path = write_file(tmp_path / "l.csv", tricky_laptops())
+    ranges = split_ranges(path, parts)
+    with open(path, "rb") as file:
+        data = file.read()
+    assert ranges[0][0] == data.index(b"\r\n") + 2
+    assert ranges[-1][1] == len(data)
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    # minden darab önállóan is ugyanazokat a sorokat adja
+    pieces = [list(csv.reader(io.StringIO(data[a:b].decode("utf-8"), newline=""), delimiter=";"))
+              for a, b in ranges]
+    assert [r for piece in pieces for r in piece] == \
+           list(csv.reader(io.StringIO(data.decode("utf-8"), newline=""), delimiter=";"))[1:]
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_read_parallel_matches_serial(tmp_path, monkeypatch, workers):
+    monkeypatch.setattr(csv_parallel, "MIN_RANGE_BYTES", 256)
+    path = write_file(tmp_path / "l.csv", tricky_laptops())
+    result = read_parallel(Laptop, path, workers=workers, encoding="utf-8")
+    assert rows_of(result) == rows_of(serial(path))
+
+
+def test_read_parallel_columns(tmp_path, monkeypatch):
+    monkeypatch.setattr(csv_parallel, "MIN_RANGE_BYTES", 256)
+    laptops = tricky_laptops()
+    path = write_file(tmp_path / "l.csv", laptops)
+    columns = read_parallel(Laptop, path, workers=3, encoding="utf-8", columns=True)
+    assert columns["model"] == [e.model for e in laptops]
+    assert columns["ram"] == [8] * len(laptops)
+    assert columns["owner_id"][5] == ""
+
+
+def test_read_parallel_header_order(tmp_path):
+    # a mezők helye a fejlécből jön
+    header = ["owner_id", "vram", "ram", "year", "model", "brand", "id"]
+    laptops = tricky_laptops(10)
+    with open(tmp_path / "l.csv", "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file, delimiter=";")
+        writer.writerow(header)
+        writer.writerows([[getattr(e, n) for n in header] for e in laptops])
+    result = read_parallel(Laptop, str(tmp_path / "l.csv"), workers=1, encoding="utf-8")
+    assert [e.model for e in result] == [e.model for e in laptops]
+
+
+def test_read_parallel_empty_and_header_only(tmp_path):
+    path = write_file(tmp_path / "l.csv", [])
+    assert read_parallel(Laptop, path, workers=2, encoding="utf-8") == []
+    assert read_parallel(Laptop, path, workers=2, encoding="utf-8", columns=True) == \
+           {name: [] for name in codec(Laptop).fields}
+
+
+def test_read_parallel_missing_columns(tmp_path):
+    path = write_file(tmp_path / "p.csv", [], header=["id", "name"])
+    with pytest.raises(ValueError, match="Missing columns"):
+        read_parallel(Person, path, encoding="utf-8")
@@ -0,0 +1,18 @@
+from basic import generator, pipeline
+
+
+def test_shard_plan_covers_n():
+    plan = generator.shard_plan(10, seed=3, shard_size=4)
+    assert [(start, size) for start, size, _ in plan] == [(1, 4), (5, 4), (9, 2)]
+    assert plan == generator.shard_plan(10, seed=3, shard_size=4)
+    assert [s for *_, s in plan] != [s for *_, s in generator.shard_plan(10, seed=4, shard_size=4)]
+    assert generator.shard_plan(0, seed=3, shard_size=4) == []
+
+
+def test_pipeline_rows_match_streaming_generator():
+    people = list(generator.iter_people(25, seed=5, chunk_size=10))
+    rows = list(pipeline.people_rows(25, batch_size=10, seed=5))
+    assert [tuple(r) for r in rows] == [(p.id, p.name, p.age, p.male) for p in people]
+    ids = [p.id for p in people]
+    laptops = list(generator.iter_laptops(30, ids, seed=5, chunk_size=7))
+    assert [r.owner_id for r in pipeline.laptop_rows(30, ids, batch_size=7, seed=5)] == [l.owner_id for l in laptops]
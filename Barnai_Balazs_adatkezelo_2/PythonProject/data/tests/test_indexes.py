@@ -0,0 +1,76 @@
+import pytest
+
+from basic.indexes import IndexedCollection
+from basic.linking import link
+from basic.model_dataclasses import Laptop, Person
+
+
+def sample():
+    people = [Person(f"P-{i}", f"Név {i}", 30) for i in range(3)]
+    laptops = [Laptop(f"L-{i}", "Dell" if i % 2 else "HP", "X", 2020 + i % 3, 8 * (1 + i % 4), 4,
+                      owner_id=f"P-{i % 3}") for i in range(12)]
+    return people, laptops
+
+
+def scan(laptops, **conditions):
+    def match(l, name, c):
+        v = getattr(l, name)
+        if isinstance(c, tuple):
+            return (c[0] is None or v >= c[0]) and (c[1] is None or v <= c[1])
+        return v == c
+    return {l.id for l in laptops if all(match(l, n, c) for n, c in conditions.items())}
+
+
+@pytest.mark.parametrize("conditions", [
+    {"brand": "Dell"},
+    {"brand": "Dell", "year": 2021},
+    {"ram": (16, None), "year": (None, 2021)},
+    {"owner_id": "P-1", "ram": 32},
+    {"model": "X", "vram": 4},
+    {"brand": "Acer"},
+])
+def test_query_matches_scan(conditions):
+    _, laptops = sample()
+    collection = IndexedCollection(Laptop, laptops)
+    assert {l.id for l in collection.query(**conditions)} == scan(laptops, **conditions)
+    assert collection.count(**conditions) == len(scan(laptops, **conditions))
+
+
+def test_update_and_remove():
+    _, laptops = sample()
+    collection = IndexedCollection(Laptop, laptops)
+    collection.update(laptops[0], ram=64, brand="Acer")
+    assert collection.query(ram=64) == [laptops[0]] and collection.query(brand="Acer") == [laptops[0]]
+    collection.remove(laptops[0])
+    assert collection.query(ram=64) == [] and laptops[0] not in collection
+    with pytest.raises(ValueError):
+        collection.query(brand=("A", "Z"))
+
+
+def test_direct_field_change_is_not_returned():
+    # index megkerülésével változtatott mező: a régi vödörből nem jöhet vissza
+    people, laptops = sample()
+    collection = IndexedCollection(Laptop, laptops)
+    laptops[1].ram = 128
+    laptops[3].brand = "Acer"
+    assert laptops[1] not in collection.query(ram=16)
+    assert laptops[3] not in collection.query(brand="Dell")
+    assert collection.count(brand="Dell") == len(scan(laptops, brand="Dell"))
+    assert {l.id for l in collection.query(brand="Dell", ram=(None, 32))} == scan(laptops, brand="Dell", ram=(None, 32))
+
+    # linking.link az owner_id-t is átírja
+    laptops[2].owner_id = "P-0"
+    link(people, [], laptops)
+    assert laptops[2] not in collection.query(owner_id="P-2")
+    collection.update(laptops[1], ram=laptops[1].ram)
+    assert laptops[1] in collection.query(ram=128)
+
+
+def test_reown():
+    people, laptops = sample()
+    link(people, [], laptops)
+    collection = IndexedCollection(Laptop, laptops)
+    collection.reown(laptops[0], people[2])
+    assert laptops[0] in people[2].laptops and laptops[0] not in people[0].laptops
+    assert laptops[0] in collection.query(owner_id="P-2")
+    assert laptops[0] not in collection.query(owner_id="P-0")
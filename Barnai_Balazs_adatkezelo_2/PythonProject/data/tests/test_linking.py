@@ -0,0 +1,104 @@
+import pytest
+
+from basic import linking
+from basic.linking import link, link_items
+from basic.model_dataclasses import Bicycle, Laptop, Person
+from basic.registry import Registry, register, set_registry
+
+
+def make_people():
+    return [Person("P-1", "Anna", 30), Person("P-2", "Béla", 40, False), Person("P-3", "Cili", 25)]
+
+
+def make_bicycles():
+    # owner_id szerint rendezve (merge-hez), árvával (P-9) és owner_id nélkülivel
+    return [Bicycle("B-0", "X", "a", 2000),
+            Bicycle("B-1", "X", "b", 2001, "P-1"),
+            Bicycle("B-2", "X", "c", 2002, "P-1"),
+            Bicycle("B-3", "X", "d", 2003, "P-3"),
+            Bicycle("B-4", "X", "e", 2004, "P-9")]
+
+
+def relations(people, attr="bicycles"):
+    return {p.id: [b.id for b in getattr(p, attr)] for p in people}
+
+
+@pytest.mark.parametrize("method", ["hash", "merge", "parallel"])
+def test_methods_give_same_links(method):
+    people, bicycles = make_people(), make_bicycles()
+    assert link_items(people, bicycles, Bicycle, method, workers=1) == (3, 1)
+    assert relations(people) == {"P-1": ["B-1", "B-2"], "P-2": [], "P-3": ["B-3"]}
+    assert bicycles[1].owner is people[0]
+    assert bicycles[0].owner is None
+    assert bicycles[4].owner is None
+
+
+@pytest.mark.parametrize("method", ["hash", "merge", "parallel"])
+def test_empty_input(method):
+    people = make_people()
+    assert link_items(people, [], Bicycle, method, workers=1) == (0, 0)
+    assert link_items([], make_bicycles(), Bicycle, method, workers=1) == (0, 4)
+
+
+@pytest.mark.parametrize("method", ["hash", "merge", "parallel"])
+def test_relink_is_idempotent(method):
+    people, bicycles = make_people(), make_bicycles()
+    link(people, bicycles, method=method, workers=1)
+    link(people, bicycles, method=method, workers=1)
+    assert relations(people) == {"P-1": ["B-1", "B-2"], "P-2": [], "P-3": ["B-3"]}
+
+
+@pytest.mark.parametrize("method", ["hash", "merge", "parallel"])
+def test_orphans_do_not_resolve_through_registry(method):
+    set_registry(Registry())
+    people, bicycles = make_people(), make_bicycles()
+    link(people, bicycles, method=method, workers=1)
+    # a tulajdonos később a registry-be kerül: a kapcsolás "nincs tulajdonos"-t mondott
+    register([Person("P-9", "Késő", 50)])
+    assert bicycles[4].owner is None
+
+
+@pytest.mark.parametrize("method", ["hash", "merge", "parallel"])
+def test_no_stale_owner_after_owner_id_cleared(method):
+    people, bicycles = make_people(), make_bicycles()
+    link(people, bicycles, method=method, workers=1)
+    bicycles[1].owner_id = None
+    link(people, sorted(bicycles, key=lambda b: b.owner_id or ""), method=method, workers=1)
+    assert bicycles[1].owner is None
+    assert relations(people)["P-1"] == ["B-2"]
+
+
+def test_owner_id_change_drops_cached_owner():
+    people, bicycles = make_people(), make_bicycles()
+    link(people, bicycles)
+    bicycles[1].owner_id = "P-2"
+    # a make_people emberei sehol nincsenek felvéve: az új id nem oldható fel, a régi tulajdonos sem jön vissza
+    assert bicycles[1].owner is None
+    bicycles[1].owner = people[2]
+    assert bicycles[1].owner_id == "P-3"
+
+
+def test_merge_rejects_unsorted_input_without_changes():
+    people, bicycles = make_people(), make_bicycles()
+    link(people, bicycles, method="hash")
+    before = relations(people)
+    with pytest.raises(ValueError):
+        link(people, list(reversed(bicycles)), method="merge")
+    with pytest.raises(ValueError):
+        link(list(reversed(people)), bicycles, method="merge")
+    assert relations(people) == before
+    assert bicycles[3].owner is people[2]
+
+
+def test_parallel_chunks(monkeypatch):
+    monkeypatch.setattr(linking, "CHUNK_SIZE", 2)
+    people = make_people()
+    laptops = [Laptop(f"L-{i}", "Y", "m", 2020, 8, 2, owner_id=f"P-{i % 4}") for i in range(10)]
+    assert link_items(people, laptops, Laptop, "parallel", workers=1) == (7, 3)
+    assert relations(people, "laptops") == {"P-1": ["L-1", "L-5", "L-9"], "P-2": ["L-2", "L-6"],
+                                            "P-3": ["L-3", "L-7"]}
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        link_items(make_people(), [], Bicycle, "sort")
@@ -0,0 +1,68 @@
+from basic.linking import OwnerIndex
+from basic.model_dataclasses import Bicycle, Person
+
+
+def make_people():
+    return [Person("P-1", "Anna", 30), Person("P-2", "Béla", 40, False), Person("P-3", "Cili", 25)]
+
+
+def make_bicycles():
+    # egy owner_id nélküli és egy ismeretlen tulajdonosú (P-9) tárgy is van
+    return [Bicycle("B-0", "X", "a", 2000),
+            Bicycle("B-1", "X", "b", 2001, "P-1"),
+            Bicycle("B-2", "X", "c", 2002, "P-1"),
+            Bicycle("B-3", "X", "d", 2003, "P-3"),
+            Bicycle("B-4", "X", "e", 2004, "P-9")]
+
+
+def relations(people, attr="bicycles"):
+    return {p.id: [b.id for b in getattr(p, attr)] for p in people}
+
+
+def test_owner_index_attach_move_and_wait():
+    people, bicycles = make_people(), make_bicycles()
+    index = OwnerIndex(people[:2])
+    assert index.attach(bicycles) == {"linked": 2, "moved": 0, "orphans": 2}
+    assert index.orphans == 2
+
+    bicycles[1].owner_id = "P-2"
+    assert index.attach([bicycles[1]]) == {"linked": 1, "moved": 1, "orphans": 0}
+    assert relations(people[:2]) == {"P-1": ["B-2"], "P-2": ["B-1"]}
+
+    # a később érkező tulajdonos megkapja a rá váró tárgyakat
+    assert index.add_people([people[2]]) == 1
+    assert bicycles[3].owner is people[2]
+    assert index.orphans == 1
+
+
+def test_owner_index_detach_and_remove_people():
+    people, bicycles = make_people(), make_bicycles()
+    index = OwnerIndex(people)
+    index.attach(bicycles)
+    assert index.detach([bicycles[2]]) == 1
+    assert bicycles[2].owner is None
+    assert bicycles[2].owner_id == "P-1"
+
+    assert index.remove_people([people[0]]) == 1
+    assert "P-1" not in index
+    assert bicycles[1].owner is None
+    assert index.add_people([people[0]]) == 1
+    assert bicycles[1].owner is people[0]
+
+
+def test_owner_index_attach_is_idempotent():
+    people, bicycles = make_people(), make_bicycles()
+    index = OwnerIndex(people)
+    index.attach(bicycles)
+    assert index.attach(bicycles) == {"linked": 3, "moved": 0, "orphans": 1}
+    assert relations(people) == {"P-1": ["B-1", "B-2"], "P-2": [], "P-3": ["B-3"]}
+    assert index.orphans == 1
+    assert bicycles[0].owner is None
+
+
+def test_owner_index_empty():
+    index = OwnerIndex()
+    assert len(index) == 0
+    assert index.attach([]) == {"linked": 0, "moved": 0, "orphans": 0}
+    assert index.detach([]) == 0
+    assert index.add_people([]) == 0
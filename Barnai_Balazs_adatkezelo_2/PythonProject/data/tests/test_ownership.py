@@ -0,0 +1,49 @@
+import random
+
+import numpy as np
+import pytest
+
+from basic import generator
+from basic.ownership import DISTRIBUTIONS, AliasTable, owner_index, owner_indices
+
+
+def owners(items):
+    return [item.owner_id for item in items]
+
+
+@pytest.mark.parametrize("ownership", DISTRIBUTIONS)
+@pytest.mark.parametrize("bulk", [False, True])
+def test_seed_makes_ownership_deterministic(ownership, bulk):
+    people = generator.generate_people(50, bulk=True, seed=1)
+    for generate in (generator.generate_bicycles, generator.generate_laptops):
+        # a globális random állapota nem számíthat
+        random.seed(1)
+        first = owners(generate(200, people, bulk=bulk, seed=3, ownership=ownership))
+        random.seed(2)
+        second = owners(generate(200, people, bulk=bulk, seed=3, ownership=ownership))
+        assert first == second
+        if ownership != "fixed":
+            assert owners(generate(200, people, bulk=bulk, seed=4, ownership=ownership)) != first
+
+
+def test_owner_index_uses_given_generator():
+    a = [owner_index(i, 100, "zipf", rnd=random.Random(7)) for i in range(20)]
+    b = [owner_index(i, 100, "zipf", rnd=random.Random(7)) for i in range(20)]
+    assert a == b
+    assert all(0 <= i < 100 for i in a)
+
+
+def test_alias_table_distribution():
+    table = AliasTable([1, 0, 3])
+    samples = table.sample(40_000, np.random.default_rng(1))
+    counts = np.bincount(samples, minlength=3) / len(samples)
+    assert counts[1] == 0
+    assert abs(counts[2] - 0.75) < 0.02
+    assert {table.sample_one(random.Random(i)) for i in range(200)} == {0, 2}
+
+
+def test_fixed_is_balanced_and_unknown_rejected():
+    counts = np.bincount(owner_indices(1000, 10, np.random.default_rng(0), "fixed"), minlength=10)
+    assert counts.min() == counts.max() == 100
+    with pytest.raises(ValueError):
+        owner_index(0, 10, "pareto")
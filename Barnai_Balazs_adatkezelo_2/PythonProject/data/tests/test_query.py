@@ -0,0 +1,53 @@
+import pytest
+
+from basic.model_dataclasses import Laptop
+from basic.query import Query
+
+
+def sample():
+    # a model értékei szándékosan nem ábécérendben jelennek meg (a kódok sorrendje más)
+    specs = [("Dell", "Zeta", 2021, 16), ("HP", "Beta", 2020, 8), ("Dell", "Alpha", 2022, 32),
+             ("HP", "Omega", 2022, 16), ("Dell", "Mid", 2020, 8)]
+    return [Laptop(f"L-{i:06d}", brand, model, year, ram, 4) for i, (brand, model, year, ram) in enumerate(specs)]
+
+
+def test_where_order_limit():
+    q = Query(sample())
+    rows = q.where(brand="Dell", ram=(16, None)).order_by("year", descending=True).select("id", "year").rows()
+    assert rows == [{"id": "L-000002", "year": 2022}, {"id": "L-000000", "year": 2021}]
+    assert q.where(model=["Beta", "Mid", "nincs"]).count() == 2
+    assert q.order_by("model").limit(2).to_columns()["model"] == ["Alpha", "Beta"]
+
+
+def test_numeric_aggregates():
+    rows = Query(sample()).group_by("brand").agg(n=("id", "count"), total=("ram", "sum"), avg=("ram", "mean"),
+                                                 first=("year", "min"), last=("year", "max")).rows()
+    assert rows == [{"brand": "Dell", "n": 3, "total": 56, "avg": 56 / 3, "first": 2020, "last": 2022},
+                    {"brand": "HP", "n": 2, "total": 24, "avg": 12.0, "first": 2020, "last": 2022}]
+
+
+def test_text_min_max_compare_values():
+    laptops = sample()
+    rows = Query(laptops).group_by("brand").agg(lo=("model", "min"), hi=("model", "max"),
+                                                lo_id=("id", "min"), hi_id=("id", "max")).rows()
+    assert [(r["lo"], r["hi"]) for r in rows] == [("Alpha", "Zeta"), ("Beta", "Omega")]
+    assert [(r["lo_id"], r["hi_id"]) for r in rows] == [("L-000000", "L-000004"), ("L-000001", "L-000003")]
+    # dict forrásból (szótárkódolt oszlop) ugyanígy
+    data = {"g": [1, 1, 2], "name": ["b", "a", "c"]}
+    assert Query(data).group_by("g").agg(m=("name", "max"), n=("name", "min")).rows() == \
+           [{"g": 1, "m": "b", "n": "a"}, {"g": 2, "m": "c", "n": "c"}]
+
+
+@pytest.mark.parametrize("func", ["sum", "mean"])
+def test_sum_mean_reject_text(func):
+    with pytest.raises(ValueError, match=func):
+        Query(sample()).group_by("brand").agg(x=("model", func))
+    with pytest.raises(ValueError, match=func):
+        Query(sample()).group_by("brand").agg(x=("id", func))
+
+
+def test_empty_and_unknown():
+    empty = Query([], entity_type=Laptop).group_by("brand")
+    assert empty.agg(n=("id", "count"), lo=("model", "min"), avg=("ram", "mean")).rows() == []
+    with pytest.raises(ValueError):
+        Query(sample()).group_by("brand").agg(x=("ram", "median"))
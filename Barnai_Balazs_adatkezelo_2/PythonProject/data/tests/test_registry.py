@@ -0,0 +1,100 @@
+from basic.changes import ChangeSet, track_changes
+from basic.model_dataclasses import Laptop, Person, new_laptop, new_person
+from basic.registry import Registry, get_registry, lookup, register, set_registry
+from conftest import load_handler
+
+
+def test_off_by_default():
+    laptops = [new_laptop("L-1", "Dell", "XPS", 2020, 8, 2, "P-1")]
+    assert get_registry() is None
+    assert register(laptops) is laptops
+    assert lookup(Laptop, "L-1") is None
+
+
+def test_add_keeps_first_instance():
+    registry = Registry()
+    first, second = Person("P-1", "Anna", 30), Person("P-1", "Más", 31)
+    assert registry.add(first) is first
+    assert registry.add(second) is first
+    assert first.name == "Anna"
+    assert registry.add_many([second, Person("P-2", "B", 1)], Person)[0] is first
+
+
+def test_refresh_updates_known_instance_in_place():
+    registry = Registry()
+    laptop = new_laptop("L-1", "Dell", "XPS", 2020, 8, 2, "P-1")
+    registry.add(laptop)
+    fresh = new_laptop("L-1", "Dell", "XPS", 2021, 16, 2, "P-2")
+    [same] = registry.add_many([fresh], Laptop, refresh=True)
+    assert same is laptop
+    assert (laptop.year, laptop.ram, laptop.owner_id) == (2021, 16, "P-2")
+    assert registry.add(new_laptop("L-1", "HP", "X", 2022, 4, 1), refresh=True) is laptop
+    assert laptop.brand == "HP" and laptop.owner_id is None
+
+
+def test_refresh_keeps_relations_and_is_not_a_change():
+    registry = Registry()
+    person = Person("P-1", "Anna", 30)
+    person.add_laptop(new_laptop("L-1", "Dell", "XPS", 2020, 8, 2, "P-1"))
+    registry.add(person)
+    changes = ChangeSet()
+    track_changes(changes)
+    registry.add(new_person("P-1", "Anna B.", 31, True), refresh=True)
+    track_changes(None)
+    assert (person.name, person.age) == ("Anna B.", 31)
+    assert [l.id for l in person.laptops] == ["L-1"]
+    assert len(changes) == 0
+
+
+def test_lru_refresh():
+    registry = Registry(maxsize=2)
+    a = registry.add(Person("P-1", "A", 1))
+    registry.add_many([Person("P-2", "B", 2), Person("P-1", "A2", 3)], Person, refresh=True)
+    assert registry.get(Person, "P-1") is a and a.name == "A2"
+    registry.add(Person("P-3", "C", 3))
+    assert registry.get(Person, "P-2") is None
+    assert len(registry) == 2
+
+
+def test_reread_after_file_change_returns_fresh_values(tmp_path):
+    handler = load_handler("csv.list")
+    set_registry(Registry())
+    path = str(tmp_path)
+    handler.write_people([Person("P-1", "Anna", 30), Person("P-2", "Béla", 40)], path)
+    first = handler.read_people(path)
+
+    handler.write_people([Person("P-1", "Anna", 31), Person("P-2", "Béla", 40)], path)
+    again = handler.read_people(path)
+    assert again[0] is first[0]
+    assert first[0].age == 31
+
+    changes = ChangeSet()
+    changes.modify(Person("P-2", "Béla Új", 41))
+    handler.write_changes(changes, path)
+    assert handler.read_people(path)[1] is first[1]
+    assert (first[1].name, first[1].age) == ("Béla Új", 41)
+
+
+def test_recent_people_without_registry():
+    people = register([Person("P-1", "A", 1), Person("P-2", "B", 2)])
+    assert lookup(Person, "P-2") is people[1]
+    people.append(Person("P-3", "C", 3))
+    assert lookup(Person, "P-3") is people[2]
+    # a következő beolvasás lecseréli, nem gyűlik
+    newer = register([Person("P-1", "Új", 1)])
+    assert lookup(Person, "P-1") is newer[0]
+    assert lookup(Person, "P-2") is None
+    # csak a keep_recent típusok: a laptopok nem maradnak meg
+    register([new_laptop("L-1", "Dell", "XPS", 2020, 8, 2, "P-1")])
+    assert lookup(Laptop, "L-1") is None
+
+
+def test_laptop_owner_after_read(tmp_path):
+    handler = load_handler("csv.dict")
+    path = str(tmp_path)
+    handler.write_people([Person("P-1", "Anna", 30)], path)
+    handler.write_laptops([new_laptop("L-1", "Dell", "XPS", 2020, 8, 2, "P-1")], path)
+    people = handler.read_people(path)
+    laptop = handler.read_laptops(path)[0]
+    assert isinstance(laptop.owner, Person)
+    assert laptop.owner is people[0]
@@ -0,0 +1,52 @@
+import pickle
+
+import pytest
+
+from basic.model_dataclasses import Laptop
+from basic.relations import RelationList
+
+
+def laptops(n):
+    return [Laptop(f"L-{i}", "Dell", "XPS", 2020, 16, 4) for i in range(n)]
+
+
+def test_list_behaviour():
+    items = laptops(4)
+    relation = RelationList(items[:2])
+    relation.append(items[0])  # idempotens
+    relation.extend(iter(items[2:]))
+    assert relation == items and len(relation) == 4
+    assert items[1] in relation and "L-3" in relation and "L-9" not in relation
+    assert relation.get("L-2") is items[2]
+    with pytest.raises(ValueError):
+        relation.remove(laptops(10)[9])
+
+
+def test_indexing_follows_mutations():
+    items = laptops(5)
+    relation = RelationList(items[:3])
+    assert relation[0] is items[0] and relation[-1] is items[2] and relation[1:] == items[1:3]
+    relation.append(items[3])
+    assert relation[-1] is items[3]
+    relation.extend([items[4]])
+    assert relation[4] is items[4]
+    relation.remove(items[0])
+    assert relation[0] is items[1]
+    relation.discard(items[1])
+    assert relation[0] is items[2]
+    # azonos id-jú új példány a régi helyére kerül
+    twin = Laptop("L-3", "HP", "Z", 2021, 8, 2)
+    relation.append(twin)
+    assert relation[1] is twin
+    relation.clear()
+    with pytest.raises(IndexError):
+        relation[0]
+
+
+def test_pickle_round_trip():
+    relation = RelationList(laptops(3))
+    relation[0]
+    copy = pickle.loads(pickle.dumps(relation))
+    assert copy == relation
+    copy.append(laptops(4)[3])
+    assert copy[3].id == "L-3"
@@ -0,0 +1,142 @@
+import csv
+import io
+
+import pytest
+
+from basic.model_dataclasses import Bicycle, Laptop, Person, new_bicycle
+from basic.schema import FIELDS, WRITE_CHUNK, codec
+
+SAMPLES = {
+    Person: [Person("P-1", "Anna", 30), Person("P-2", "Béla", 41, False)],
+    Bicycle: [Bicycle("B-1", "Csepel", "Túra", 2001, "P-1"), Bicycle("B-2", "Gepida", "X", 2010)],
+    Laptop: [Laptop("L-1", "Dell", "XPS", 2022, 16, 8, owner_id="P-2")],
+}
+
+
+@pytest.mark.parametrize("entity_type", [Person, Bicycle, Laptop])
+def test_row_round_trip(entity_type):
+    row_codec = codec(entity_type)
+    for e in SAMPLES[entity_type]:
+        # CSV-ben minden szöveg, a None üres mező (és üres szövegként jön vissza)
+        expected = tuple("" if v is None else v for v in row_codec.to_tuple(e))
+        row = [str(v) for v in expected]
+        assert row_codec.to_tuple(row_codec.from_row(row)) == expected
+        assert row_codec.to_tuple(row_codec.from_dict(dict(zip(FIELDS[entity_type], row)))) == expected
+        assert [row_codec.to_tuple(x) for x in row_codec.from_rows([row, row])] == [expected, expected]
+
+
+def test_formats():
+    laptop = SAMPLES[Laptop][0]
+    assert codec(Person, "sql").to_tuple(SAMPLES[Person][1]) == ("P-2", "Béla", 41, 0)
+    assert codec(Person, "sql").from_row(("P-2", "Béla", 41, 0)).male is False
+    assert codec(Laptop, "json").to_dict(laptop) == {"id": "L-1", "brand": "Dell", "model": "XPS", "year": 2022,
+                                                     "ram": 16, "vram": 8, "owner_id": "P-2"}
+    assert codec(Laptop, "json").from_dict(codec(Laptop, "json").to_dict(laptop)).owner_id == "P-2"
+
+
+def test_bool_parsing():
+    parse = codec(Person).from_row
+    assert [parse(["P", "N", "1", v]).male for v in ("True", "true", "1", "False", "0", "")] == \
+           [True, True, True, False, False, False]
+
+
+def test_chunks():
+    rows = [["P-%d" % i, "N", "1", "true"] for i in range(7)]
+    assert [len(c) for c in codec(Person).chunks(rows, 3)] == [3, 3, 1]
+    assert list(codec(Person).chunks([], 10)) == []
+
+
+def test_codec_is_cached():
+    assert codec(Laptop) is codec(Laptop)
+    assert codec(Laptop) is not codec(Laptop, "sql")
+
+
+def test_unknown_type_and_format():
+    with pytest.raises(TypeError):
+        codec(str)
+    with pytest.raises(ValueError):
+        codec(Person, "xml")
+
+
+#  FEJLÉC SZERINTI DEKÓDOLÁS, VETÍTÉS
+def test_decoder_uses_header_positions():
+    header = ["owner_id", "year", "model", "brand", "id"]
+    [b] = codec(Bicycle).decoder(header)([["P-1", "2001", "Túra", "Csepel", "B-1"]])
+    assert (b.id, b.brand, b.model, b.year, b.owner_id) == ("B-1", "Csepel", "Túra", 2001, "P-1")
+
+    [r] = codec(Bicycle).decoder(header, ("year", "id"))([["P-1", "2001", "Túra", "Csepel", "B-1"]])
+    assert r == (2001, "B-1") and r.year == 2001
+
+
+def test_decoder_errors():
+    with pytest.raises(ValueError, match="Missing columns"):
+        codec(Bicycle).decoder(["id", "brand"])
+    with pytest.raises(ValueError, match="Unknown"):
+        codec(Bicycle).decoder(["id"], ("colour",))
+
+
+def test_projector_matches_decoder_records():
+    project = codec(Laptop).projector(("brand", "ram"))
+    assert project(SAMPLES[Laptop]) == [("Dell", 16)]
+    header = codec(Laptop).fields
+    row = [str(v) for v in codec(Laptop).to_tuple(SAMPLES[Laptop][0])]
+    assert codec(Laptop).decoder(header, ("brand", "ram"))([row]) == project(SAMPLES[Laptop])
+
+
+def test_generated_functions_are_cached():
+    row_codec = codec(Laptop)
+    header = list(row_codec.fields)
+    assert row_codec.decoder(header) is row_codec.decoder(tuple(header))
+    assert row_codec.decoder(header, ("ram",)) is not row_codec.decoder(header)
+    assert row_codec.projector(["ram"]) is row_codec.projector(("ram",))
+    assert row_codec.line_formatter(";") is row_codec.line_formatter(";")
+    assert row_codec.line_formatter(",") is not row_codec.line_formatter(";")
+    assert row_codec.line_formatter(",")(SAMPLES[Laptop][0]) == "L-1,Dell,XPS,2022,16,8,P-2\r\n"
+
+
+#  CSV ÍRÁS (no_quoting gyors út)
+def as_csv(entity_type, entities, no_quoting=False, delimiter=";"):
+    file = io.StringIO(newline="")
+    codec(entity_type).write_csv(file, entities, delimiter, no_quoting)
+    return file.getvalue()
+
+
+def reference_csv(entity_type, entities, delimiter=";"):
+    file = io.StringIO(newline="")
+    csv.writer(file, delimiter=delimiter).writerows(map(codec(entity_type).to_tuple, entities))
+    return file.getvalue()
+
+
+@pytest.mark.parametrize("entity_type", [Person, Bicycle, Laptop])
+def test_fast_path_equals_csv_writer(entity_type):
+    entities = SAMPLES[entity_type]
+    assert as_csv(entity_type, entities, no_quoting=True) == reference_csv(entity_type, entities)
+    assert as_csv(entity_type, entities, no_quoting=True, delimiter=",") == \
+           reference_csv(entity_type, entities, delimiter=",")
+
+
+def test_none_fields_are_written_empty():
+    # nem csak az owner_id lehet None
+    bikes = [new_bicycle("B-1", None, "Túra", 2001, None), new_bicycle("B-2", "Csepel", None, 2002, "P-1")]
+    text = as_csv(Bicycle, bikes, no_quoting=True)
+    assert "None" not in text
+    assert text == reference_csv(Bicycle, bikes) == "B-1;;Túra;2001;\r\nB-2;Csepel;;2002;P-1\r\n"
+
+
+def test_fast_path_falls_back_to_quoting():
+    bikes = [new_bicycle("B-1", "a;b", 'say "hi"', 2001, "P-1"), new_bicycle("B-2", "sor\r\ntörés", "x", 2002)]
+    text = as_csv(Bicycle, bikes, no_quoting=True)
+    assert text == reference_csv(Bicycle, bikes)
+    back = codec(Bicycle).from_rows(csv.reader(io.StringIO(text, newline=""), delimiter=";"))
+    assert [(b.brand, b.model) for b in back] == [("a;b", 'say "hi"'), ("sor\r\ntörés", "x")]
+
+
+def test_fast_path_only_quotes_bad_chunk():
+    bikes = [new_bicycle(f"B-{i}", "X", "m", 2000, "P-1") for i in range(WRITE_CHUNK + 5)]
+    bikes[-1].model = "a;b"
+    assert as_csv(Bicycle, bikes, no_quoting=True) == reference_csv(Bicycle, bikes)
+
+
+def test_write_empty_input():
+    assert as_csv(Person, [], no_quoting=True) == as_csv(Person, []) == ""
+    assert as_csv(Person, iter(()), no_quoting=True) == ""